@@ -4,19 +4,33 @@ Monte Carlo Simulator for $100k Geopolitical Investment Research (Feb 28 2026)
 
 Runs 3 scenario sets per master instructions:
 (A) Base historical
-(B) Current-escalation weighted (25% quick de-escalation, 45% mild, 30% severe)
+(B) Current-escalation regime mixture (25% quick de-escalation, 45% mild, 30% severe)
 (C) Sensitivity (higher severe probability / correlation shift)
 
 Output: mean, median, P(profit), 5% VaR, worst 1%, Sharpe-like per sector + portfolio.
 """
 
 import argparse
+import copy
+import sys
 import numpy as np
 import pandas as pd
 from pathlib import Path
-import matplotlib.pyplot as plt
 
-np.random.seed(42)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root → mc_engine
+from mc_engine import (
+    BOOTSTRAP_BLOCK_DAYS, Bump, CostModel, DEFAULT_COST_BPS, DEFAULT_DF, DEFAULT_HORIZON_MONTHS,
+    DEFAULT_REPLICATES, DEFAULT_STOP_LOSS, MONTHS_PER_YEAR, PriceStore, RebalanceRule, SAMPLERS,
+    SHOCKS, ScenarioReweighter, ShockModel, StreamingStats, TRADING_DAYS, Tolerances,
+    binned_histogram, block_bootstrap, bootstrap_metrics, bumped_params, check_correlation,
+    correlated_shocks, correlation_sweep, cumulative_values, daily_increments, dirichlet_weights,
+    draw_normals, draw_regimes, evaluate_weights, gaussian_bounds, group_means, iter_chunks,
+    mean_estimate, mixture_moments, mixture_returns, nearest_correlation, path_metrics, plot_counts,
+    portfolio_metrics, rebalanced_values, render_charts, run_adaptive, run_sharded_paths,
+    run_sharded_streams, sample_mixture, sensitivity_table, simplex_grid, stress_correlations,
+    summarize_path_metrics, summarize_rebalancing, term_structure, trading_days,
+)
+
 n_sim = 10000
 horizon = 0.5  # 6 months
 
@@ -32,56 +46,746 @@ corr_base = np.array([
 
 portfolio_weights = np.array([0.40, 0.25, 0.20, 0.15])
 
+# --rebalance: rules compared, cash buffer and costs (fixed cost as a fraction of the $100k)
+REBALANCE_RULES = (
+    RebalanceRule('buy_and_hold'),
+    RebalanceRule('monthly', every=21),
+    RebalanceRule('quarterly', every=63),
+    RebalanceRule('band_5pct', band=0.05),
+)
+CASH_WEIGHT = 0.02
+CASH_RATE = 0.04
+FIXED_COST = 1e-4   # $10 per rebalance
 
-def run_scenario(means_annual, vols_annual, corr, label, seed=42):
-    """Run single scenario; return portfolio stats + per-sector returns."""
-    np.random.seed(seed)
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+ETF_PRICES = DATA_DIR / "latest_prices_feb28_2026.csv"  # sector → ETF tickers for --historical
+PRICE_DIR = DATA_DIR / "prices"  # --historical default price store: one <TICKER>.csv per ticker
+
+
+def _sector_stat_dict(mean, median, p_profit, var_5, worst_1, std):
+    sr = mean / std * np.sqrt(2) if std > 0 else 0  # 6-mo Sharpe-like
+    return {
+        'mean': mean, 'median': median, 'p_profit': p_profit,
+        'var_5': var_5, 'worst_1': worst_1, 'sharpe_like': sr,
+    }
+
+
+def _port_stat_dict(mean, median, p_profit, var_5, worst_1, std, n_paths, err=None):
+    """Portfolio stats; err maps quantile → error bound (omitted = exact percentile)."""
+    err = err or {}
+    port_sr = mean / std * np.sqrt(2) if std > 0 else 0
+    return {
+        'Paths': n_paths,
+        'Mean Return': mean,
+        'Median Return': median,
+        'Median Return ±': err.get(0.50, 0.0),
+        'Prob Profit': p_profit,
+        '5% VaR': var_5,
+        '5% VaR ±': err.get(0.05, 0.0),
+        'Worst 1%': worst_1,
+        'Worst 1% ±': err.get(0.01, 0.0),
+        'Sharpe-like': port_sr,
+    }
+
+
+def _regime_rows(name, share, mean, p_profit, var_5):
+    """Per-regime portfolio rows appended to the port stats of a mixture scenario."""
+    return {
+        f'Regime Share ({name})': share,
+        f'Mean Return ({name})': mean,
+        f'Prob Profit ({name})': p_profit,
+        f'5% VaR ({name})': var_5,
+    }
+
+
+# Bootstrap metric (mc_engine.BOOTSTRAP_METRICS) → summary row
+CI_ROWS = {
+    'mean': 'Mean Return',
+    'median': 'Median Return',
+    'p_profit': 'Prob Profit',
+    'var': '5% VaR',
+    'worst_1pct': 'Worst 1%',
+    'sharpe': 'Sharpe-like',
+}
+
+
+def _bootstrap_rows(port, n_boot, seed):
+    """95% Poisson-bootstrap CI rows for the portfolio stats (NaN for streamed runs without paths)."""
+    ci = (bootstrap_metrics(port, n_boot, rng=np.random.default_rng(seed), sharpe_scale=np.sqrt(2))
+          if isinstance(port, np.ndarray) else {})
+    rows = {}
+    for key, name in CI_ROWS.items():
+        rows[f'{name} CI Low'], rows[f'{name} CI High'] = ci.get(key, (np.nan, np.nan))
+    return rows
+
+
+def _scenario_moments(means_annual, vols_annual, corr):
+    """Horizon-scaled means, vols and covariance."""
+    check_correlation(corr)
     means = means_annual * horizon
     vols = vols_annual * np.sqrt(horizon)
     cov = np.diag(vols) @ corr @ np.diag(vols)
-    returns = np.random.multivariate_normal(means, cov, n_sim)
+    return means, vols, cov
+
+
+def _draw_params(means_annual, vols_annual, corr, regimes=None):
+    """
+    (means, vols, cov, regime names, mix) for a scenario. regimes is a list of
+    (name, probability, means_annual, vols_annual, corr); when given, mix holds
+    the horizon-scaled (probs, means, covs) and means/vols/cov are the exact
+    mixture moments (used for control means and histogram ranges).
+    """
+    if not regimes:
+        return (*_scenario_moments(means_annual, vols_annual, corr), (), None)
+    names, probs, reg_means, reg_covs = [], [], [], []
+    for name, p, reg_means_annual, reg_vols_annual, reg_corr in regimes:
+        m, _, c = _scenario_moments(reg_means_annual, reg_vols_annual, reg_corr)
+        names.append(name)
+        probs.append(p)
+        reg_means.append(m)
+        reg_covs.append(c)
+    mix = (np.array(probs), reg_means, reg_covs)
+    means, cov = mixture_moments(*mix)
+    return means, np.sqrt(np.diag(cov)), cov, tuple(names), mix
+
+
+def _draw(rng, m, means, cov, mix=None, shock=ShockModel()):
+    """m sector-return paths and their regime labels (None outside mixtures); rng=None → global stream."""
+    if mix is not None:
+        return sample_mixture(m, *mix, rng=rng, shock=shock)
+    if not shock.is_gaussian:
+        Z = rng.standard_normal((m, len(means))) if rng is not None else \
+            np.random.standard_normal((m, len(means)))
+        return means + shock.correlate(Z, np.linalg.cholesky(cov), rng), None
+    if rng is None:
+        return np.random.multivariate_normal(means, cov, m), None
+    return rng.multivariate_normal(means, cov, m), None
+
+
+def _split_labels(samples):
+    """Undo the regime-label column appended by _sample_sectors / adaptive sampling."""
+    if samples.shape[1] == len(sectors):
+        return samples, None
+    return samples[:, :-1], samples[:, -1].astype(np.intp)
+
+
+def run_scenario(means_annual, vols_annual, corr, label, seed=42, regimes=None,
+                 chunk_size=None, sampler='mc', shock=ShockModel()):
+    """
+    Run single scenario; return portfolio stats + per-sector returns.
+
+    regimes (list of (name, probability, means_annual, vols_annual, corr))
+    simulates a true regime mixture instead of the single normal given by
+    means_annual / vols_annual / corr: one categorical draw labels every path,
+    then each regime's correlated returns are generated in one grouped batch
+    (mc_engine.mixture). Port stats then also carry per-regime rows
+    ('Regime Share (name)', 'Mean Return (name)', 'Prob Profit (name)',
+    '5% VaR (name)') next to the mixture statistics.
+
+    With chunk_size set, draws are streamed chunk_size paths at a time into
+    running accumulators; the portfolio returns slot then holds the portfolio
+    StreamingStats (histogram source for charts) and the sector array is None.
+
+    sampler != 'mc' (antithetic / sobol / control, see mc_engine.samplers)
+    maps the sampler's standard normals through the Cholesky factor of the
+    covariance and adds 'VR Factor' rows to the portfolio stats.
+
+    shock (mc_engine.ShockModel) replaces the multivariate normal with a
+    fat-tailed Student-t / copula model of the same covariance.
+    """
+    np.random.seed(seed)
+    means, vols, cov, names, mix = _draw_params(means_annual, vols_annual, corr, regimes)
+
+    if sampler != 'mc':
+        if chunk_size is not None:
+            raise ValueError(f"sampler={sampler!r} does not support chunk_size")
+        Z = draw_normals(n_sim, len(sectors), sampler)
+        if mix is None:
+            returns, labels = means + shock.correlate(Z, np.linalg.cholesky(cov)), None
+        else:
+            probs, reg_means, reg_covs = mix
+            labels = draw_regimes(n_sim, probs)
+            returns = mixture_returns(Z, labels, reg_means, [np.linalg.cholesky(c) for c in reg_covs],
+                                      shock)
+        return _stats_from_returns(returns, sampler, control_mean=means, labels=labels, regimes=names)
+
+    if chunk_size is not None:
+        sec_acc, port_acc, regime_acc = _new_streams(means, vols, cov, n_regimes=len(names))
+        for m in iter_chunks(n_sim, chunk_size):
+            _update_streams(sec_acc, port_acc, *_draw(None, m, means, cov, mix, shock), regime_acc)
+        return _stats_from_streams(sec_acc, port_acc, regime_acc, names)
+
+    returns, labels = _draw(None, n_sim, means, cov, mix, shock)
+    return _stats_from_returns(returns, labels=labels, regimes=names)
+
+
+def run_scenario_adaptive(means_annual, vols_annual, corr, label, seed=42, regimes=None,
+                          tol=Tolerances(), max_paths=2_000_000, shock=ShockModel()):
+    """
+    run_scenario that draws n_sim-path batches until the portfolio CI
+    half-widths (mean, VaR, Sharpe) meet tol or max_paths is reached.
+    port_stats['Paths'] records the paths actually used.
+    """
+    np.random.seed(seed)
+    means, _, cov, names, mix = _draw_params(means_annual, vols_annual, corr, regimes)
+
+    def sample(m):
+        returns, labels = _draw(None, m, means, cov, mix, shock)
+        return returns if labels is None else np.column_stack([returns, labels])
+
+    samples, info = run_adaptive(sample, tol, n_sim, max_paths,
+                                 project=lambda r: r[:, :len(sectors)] @ portfolio_weights)
+    hw = info['half_widths']
+    print(f"[{label}] adaptive: {info['n_paths']:,} paths "
+          f"({'converged' if info['converged'] else 'budget hit'}; ±mean {hw['mean']:.4f}, "
+          f"±VaR {hw['var']:.4f}, ±Sharpe {hw['sharpe']:.4f})")
+    returns, labels = _split_labels(samples)
+    return _stats_from_returns(returns, labels=labels, regimes=names)
+
+
+def _stats_from_returns(returns, sampler='mc', control_mean=None, labels=None, regimes=()):
     port_returns = returns @ portfolio_weights
 
     # Per-sector stats
     sector_stats = {}
     for i, sec in enumerate(sectors):
         r = returns[:, i]
-        sr = np.mean(r) / np.std(r) * np.sqrt(2) if np.std(r) > 0 else 0  # 6-mo Sharpe-like
-        sector_stats[sec] = {
-            'mean': np.mean(r), 'median': np.median(r), 'p_profit': (r > 0).mean(),
-            'var_5': np.percentile(r, 5), 'worst_1': np.percentile(r, 1), 'sharpe_like': sr,
-        }
+        sector_stats[sec] = _sector_stat_dict(
+            np.mean(r), np.median(r), (r > 0).mean(),
+            np.percentile(r, 5), np.percentile(r, 1), np.std(r),
+        )
 
-    port_sr = np.mean(port_returns) / np.std(port_returns) * np.sqrt(2) if np.std(port_returns) > 0 else 0
-    port_stats = {
-        'Mean Return': port_returns.mean(),
-        'Median Return': np.median(port_returns),
-        'Prob Profit': (port_returns > 0).mean(),
-        '5% VaR': np.percentile(port_returns, 5),
-        'Worst 1%': np.percentile(port_returns, 1),
-        'Sharpe-like': port_sr,
-    }
+    mean, vrf = mean_estimate(port_returns, sampler, returns, control_mean)
+    p_profit, vrf_p = mean_estimate(port_returns > 0, sampler, returns, control_mean)
+    port_stats = _port_stat_dict(
+        mean, np.median(port_returns), min(1.0, max(0.0, p_profit)),
+        np.percentile(port_returns, 5), np.percentile(port_returns, 1), np.std(port_returns),
+        port_returns.size,
+    )
+    if sampler != 'mc':
+        port_stats['VR Factor (mean)'] = vrf
+        port_stats['VR Factor (P profit)'] = vrf_p
+    for k, name in enumerate(regimes):
+        r = port_returns[labels == k]
+        if r.size:
+            port_stats.update(_regime_rows(name, r.size / port_returns.size, np.mean(r),
+                                           (r > 0).mean(), np.percentile(r, 5)))
+        else:
+            port_stats.update(_regime_rows(name, 0.0, np.nan, np.nan, np.nan))
     return port_stats, sector_stats, port_returns, returns
 
 
+def _new_streams(means, vols, cov, sketch_seed=0, n_regimes=0):
+    """One StreamingStats per sector, one for the portfolio and one per regime (portfolio)."""
+    port_sd = float(np.sqrt(portfolio_weights @ cov @ portfolio_weights))
+    sec_acc = [StreamingStats(*gaussian_bounds(means[i], vols[i]), sketch_seed=sketch_seed)
+               for i in range(len(sectors))]
+    port_bounds = gaussian_bounds(means @ portfolio_weights, port_sd)
+    port_acc = StreamingStats(*port_bounds, sketch_seed=sketch_seed)
+    regime_acc = [StreamingStats(*port_bounds, sketch_seed=sketch_seed) for _ in range(n_regimes)]
+    return sec_acc, port_acc, regime_acc
+
+
+def _update_streams(sec_acc, port_acc, returns, labels=None, regime_acc=()):
+    for i, acc in enumerate(sec_acc):
+        acc.update(returns[:, i])
+    port_returns = returns @ portfolio_weights
+    port_acc.update(port_returns)
+    for k, acc in enumerate(regime_acc):
+        acc.update(port_returns[labels == k])
+
+
+def _stats_from_streams(sec_acc, port_acc, regime_acc=(), regimes=()):
+    """
+    Streaming counterpart of _stats_from_returns: constant memory regardless of n_sim.
+    Quantiles come from KLL sketches; portfolio '±' entries give their error bound.
+    """
+    def summarize(acc, to_dict):
+        return to_dict(acc.mean, acc.quantile(0.50), acc.p_profit,
+                       acc.quantile(0.05), acc.quantile(0.01), acc.std)
+
+    sector_stats = {sec: summarize(acc, _sector_stat_dict) for sec, acc in zip(sectors, sec_acc)}
+    port_stats = _port_stat_dict(
+        port_acc.mean, port_acc.quantile(0.50), port_acc.p_profit,
+        port_acc.quantile(0.05), port_acc.quantile(0.01), port_acc.std, port_acc.n,
+        err={q: port_acc.quantile_error(q) for q in (0.50, 0.05, 0.01)},
+    )
+    for name, acc in zip(regimes, regime_acc):
+        if acc.n:
+            port_stats.update(_regime_rows(name, acc.n / port_acc.n, acc.mean,
+                                           acc.p_profit, acc.quantile(0.05)))
+        else:
+            port_stats.update(_regime_rows(name, 0.0, np.nan, np.nan, np.nan))
+    return port_stats, sector_stats, port_acc, None
+
+
+# Process-pool workers (top-level so they pickle under spawn on Windows)
+
+def _sample_sectors(rng, m, means, cov, mix=None, shock=ShockModel()):
+    returns, labels = _draw(rng, m, means, cov, mix, shock)
+    return returns if labels is None else np.column_stack([returns, labels])
+
+
+def _stream_sectors(rng, m, chunk_size, means, vols, cov, mix=None, shock=ShockModel()):
+    n_regimes = 0 if mix is None else len(mix[0])
+    sec_acc, port_acc, regime_acc = _new_streams(means, vols, cov, int(rng.integers(2**32)), n_regimes)
+    for c in iter_chunks(m, chunk_size):
+        _update_streams(sec_acc, port_acc, *_draw(rng, c, means, cov, mix, shock), regime_acc)
+    return [*sec_acc, port_acc, *regime_acc]
+
+
+def run_scenarios(specs, chunk_size=None, workers=1, sampler='mc', adaptive=None,
+                  max_paths=2_000_000, shock=ShockModel()):
+    """
+    Run several scenarios; specs are (means_annual, vols_annual, corr, label, seed, regimes)
+    with regimes None for a single normal (see run_scenario).
+
+    workers > 1 puts every scenario's path shards into one process pool; each
+    shard draws from a Generator spawned off SeedSequence(seed), so results are
+    reproducible per (seed, workers). workers == 1 runs run_scenario serially.
+    adaptive (Tolerances) runs run_scenario_adaptive instead, serially.
+    """
+    if adaptive is not None:
+        return [run_scenario_adaptive(*spec, tol=adaptive, max_paths=max_paths, shock=shock)
+                for spec in specs]
+    if workers <= 1:
+        return [run_scenario(*spec, chunk_size=chunk_size, sampler=sampler, shock=shock) for spec in specs]
+    if sampler != 'mc':
+        raise ValueError(f"sampler={sampler!r} requires workers=1")
+
+    jobs, names = {}, {}
+    for means_annual, vols_annual, corr, label, seed, regimes in specs:
+        means, vols, cov, names[label], mix = _draw_params(means_annual, vols_annual, corr, regimes)
+        args = (means, cov, mix, shock) if chunk_size is None else (chunk_size, means, vols, cov, mix, shock)
+        jobs[label] = (n_sim, seed, args)
+
+    d = len(sectors)
+    if chunk_size is None:
+        # Mixture shards append their regime labels as an extra column
+        widths = {label: d + bool(regime_names) for label, regime_names in names.items()}
+        paths = run_sharded_paths(_sample_sectors, jobs, workers, width=widths)
+        results = []
+        for spec in specs:
+            returns, labels = _split_labels(paths[spec[3]])
+            results.append(_stats_from_returns(returns, labels=labels, regimes=names[spec[3]]))
+        return results
+    accs = run_sharded_streams(_stream_sectors, jobs, workers)
+    return [_stats_from_streams(accs[spec[3]][:d], accs[spec[3]][d], accs[spec[3]][d + 1:], names[spec[3]])
+            for spec in specs]
+
+
+def sweep_weights(specs, weights, shock=ShockModel()):
+    """
+    Evaluate candidate allocations (rows of weights) against one n_sim-path
+    simulation per scenario spec; one DataFrame row per (scenario, candidate).
+    """
+    frames = []
+    for means_annual, vols_annual, corr, label, seed, regimes in specs:
+        means, _, cov, _, mix = _draw_params(means_annual, vols_annual, corr, regimes)
+        returns, _ = _draw(np.random.default_rng(seed), n_sim, means, cov, mix, shock)
+        df = evaluate_weights(returns, weights, sharpe_scale=np.sqrt(2), labels=sectors)
+        df.insert(0, 'candidate', np.arange(len(df)))
+        df.insert(0, 'scenario', label)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _step_increments(rng, n_steps, steps_per_year, means_annual, vols_annual, corr, regimes=None,
+                     dtype=np.float32, shock=ShockModel()):
+    """(n_steps, n_sim, d) arithmetic sector increments; each path keeps its regime for the whole path."""
+    parts = regimes or [(None, 1.0, means_annual, vols_annual, corr)]
+    drifts = [m / steps_per_year for _, _, m, _, _ in parts]
+    chols = [np.linalg.cholesky(np.diag(v) @ c @ np.diag(v) / steps_per_year) for _, _, _, v, c in parts]
+    labels = draw_regimes(n_sim, [p for _, p, *_ in parts], rng) if regimes else None
+    return daily_increments(n_sim, n_steps, drifts, chols, labels, shock, rng, dtype)
+
+
+def _step_values(rng, n_steps, steps_per_year, means_annual, vols_annual, corr, regimes=None,
+                 dtype=np.float32, shock=ShockModel()):
+    """
+    (n_steps + 1, n_sim) buy-and-hold portfolio values from arithmetic
+    increments with the annual means / covariances scaled by 1/steps_per_year;
+    mixture scenarios fix each path's regime for the whole path.
+    """
+    increments = _step_increments(rng, n_steps, steps_per_year, means_annual, vols_annual, corr, regimes,
+                                  dtype, shock)
+    return cumulative_values(increments, portfolio_weights, log=False)
+
+
+def run_scenario_daily(means_annual, vols_annual, corr, label, seed=42, regimes=None,
+                       stop_loss=DEFAULT_STOP_LOSS, shock=ShockModel()):
+    """
+    Trading-day paths of the buy-and-hold portfolio over the horizon:
+    drawdown, time-under-water and stop-loss statistics (mc_engine.paths).
+    The terminal return matches the one-step draw in mean and covariance.
+    """
+    n_days = trading_days(horizon)
+    values = _step_values(np.random.default_rng(seed), n_days, TRADING_DAYS, means_annual, vols_annual,
+                          corr, regimes, shock=shock)
+    return {
+        'Paths': n_sim,
+        'Trading Days': n_days,
+        'Stop Loss': stop_loss,
+        'Mean Return': float(values[-1].mean() - 1),
+        **{k.replace('_', ' ').title(): v
+           for k, v in summarize_path_metrics(path_metrics(values, stop_loss)).items()},
+    }
+
+
+def run_scenario_rebalanced(means_annual, vols_annual, corr, label, seed=42, regimes=None, rules=REBALANCE_RULES,
+                            costs=CostModel(fixed=FIXED_COST), cash_weight=CASH_WEIGHT, cash_rate=CASH_RATE,
+                            shock=ShockModel()):
+    """
+    Horizon portfolio stats net of trading costs and cash drag under each
+    rebalancing rule (mc_engine.rebalance), every rule replaying the same
+    trading-day paths. Each day's arithmetic increment is applied as that
+    day's simple return, so rebalanced books compound. Returns
+    {rule name: port stats + 'Mean Rebalances' / 'Mean Turnover' / 'Mean Costs'}.
+    """
+    increments = _step_increments(np.random.default_rng(seed), trading_days(horizon), TRADING_DAYS,
+                                  means_annual, vols_annual, corr, regimes, shock=shock)
+    out = {}
+    for rule in rules:
+        values, stats = rebalanced_values(increments, portfolio_weights, rule, costs, cash_weight, cash_rate,
+                                          log=False)
+        r = values[-1] - 1
+        out[rule.name] = {
+            **_port_stat_dict(np.mean(r), np.median(r), (r > 0).mean(), np.percentile(r, 5),
+                              np.percentile(r, 1), np.std(r), r.size),
+            **{k.replace('_', ' ').title(): v for k, v in summarize_rebalancing(stats).items()},
+        }
+    return out
+
+
+def term_structure_table(specs, months=DEFAULT_HORIZON_MONTHS, shock=ShockModel()):
+    """
+    Risk-metric term structure: one monthly-step simulation per scenario spec
+    out to max(months), every horizon read off the same paths
+    (mc_engine.term_structure). Long format, one row per (scenario, horizon);
+    Sharpe-like is annualized as in the 6-month summary (× √(12 / months)).
+    """
+    rows = []
+    for means_annual, vols_annual, corr, label, seed, regimes in specs:
+        values = _step_values(np.random.default_rng(seed), max(months), MONTHS_PER_YEAR, means_annual,
+                              vols_annual, corr, regimes, np.float64, shock)
+        for row in term_structure(values, months):
+            h = row.pop('step')
+            sr = row['mean'] / row['std'] * np.sqrt(MONTHS_PER_YEAR / h) if row['std'] > 0 else 0
+            rows.append({'scenario': label, 'horizon_months': h, **row, 'sharpe_like': sr})
+    return pd.DataFrame(rows).rename(columns={'var': 'var_5', 'cvar': 'cvar_5'})
+
+
+def run_sensitivity(means_annual, vols_annual, corr, label, seed=42, regimes=None,
+                    h_mean=0.01, h_vol=0.01, h_corr=0.05, shock=ShockModel()):
+    """
+    Tornado table of central-difference sensitivities of the portfolio
+    metrics to every annual mean, vol and correlation entry, all repriced
+    against one set of normals and regime labels (common random numbers,
+    mc_engine.sensitivity). Mixture scenarios apply each bump to every
+    regime. Rows are sorted by the swing in 5% VaR.
+    """
+    rng = np.random.default_rng(seed)
+    d = len(sectors)
+    base = {'means': means_annual, 'vols': vols_annual, 'corr': corr}
+    bumps = ([Bump(f'mean[{sec}]', 'means', (i,), h_mean) for i, sec in enumerate(sectors)]
+             + [Bump(f'vol[{sec}]', 'vols', (i,), h_vol) for i, sec in enumerate(sectors)]
+             + [Bump(f'corr[{sectors[i]}, {sectors[j]}]', 'corr', (i, j), h_corr, symmetric=True)
+                for i in range(d) for j in range(i + 1, d)])
+    shift = {k: v - base[k] for k, v in bumped_params(base, bumps).items()}   # (1 + 2B, ...) offsets
+
+    parts = regimes or [(None, 1.0, means_annual, vols_annual, corr)]
+    labels = draw_regimes(n_sim, [p for _, p, *_ in parts], rng) if regimes else np.zeros(n_sim, np.intp)
+    Z = rng.standard_normal((n_sim, d))
+    returns = np.empty((len(shift['means']), n_sim, d))
+    for k, (_, _, m, v, c) in enumerate(parts):
+        idx = np.flatnonzero(labels == k)
+        means = (m + shift['means']) * horizon
+        vols = (v + shift['vols']) * np.sqrt(horizon)
+        chols = np.linalg.cholesky(vols[:, :, None] * (c + shift['corr']) * vols[:, None, :])
+        if shock.is_gaussian:
+            returns[:, idx] = means[:, None, :] + Z[idx] @ chols.transpose(0, 2, 1)
+        else:
+            # Each set replays the same extra shock draws from a copy of rng
+            for q, L in enumerate(chols):
+                returns[q, idx] = means[q] + shock.correlate(Z[idx], L, copy.deepcopy(rng))
+
+    m = portfolio_metrics(returns @ portfolio_weights, sharpe_scale=np.sqrt(2))
+    metrics = {'mean': m['mean'], 'var_5': m['var'], 'cvar_5': m['cvar'], 'sharpe_like': m['sharpe']}
+    df = sensitivity_table(metrics, bumps, base, sort_by='var_5')
+    df.insert(0, 'scenario', label)
+    return df
+
+
+def reweight_regimes(means_annual, vols_annual, corr, label, seed=42, regimes=None,
+                     probabilities=None, shock=ShockModel()):
+    """
+    Portfolio metrics of a mixture scenario for every row of regime
+    probabilities, from one n_sim-path simulation split by regime label
+    (mc_engine.ScenarioReweighter). The first row is the spec's own regime
+    probabilities.
+    """
+    if not regimes:
+        raise ValueError(f"Scenario {label} has no regimes to reweight")
+    means, _, cov, names, mix = _draw_params(means_annual, vols_annual, corr, regimes)
+    returns, labels = _draw(np.random.default_rng(seed), n_sim, means, cov, mix, shock)
+    port = returns @ portfolio_weights
+    reweighter = ScenarioReweighter([port[labels == k] for k in range(len(names))],
+                                    [f'p_{name}' for name in names])
+    rows = mix[0] if probabilities is None else np.vstack([mix[0], probabilities])
+    df = reweighter.evaluate(rows).rename(columns={'var': 'var_5', 'cvar': 'cvar_5'})
+    df.insert(0, 'scenario', label)
+    return df
+
+
+def run_correlation_stress(means_annual, vols_annual, corr, label, seed=42, regimes=None,
+                           n_stress=1000, shift=(0.0, 0.0), noise=0.10, shock=ShockModel()):
+    """
+    Portfolio metrics under n_stress perturbed copies of the scenario's
+    correlation matrix (common shift ~ U(shift) plus N(0, noise²) per entry),
+    each repaired to the nearest correlation matrix, batch-factorized and
+    priced against one set of normals (mc_engine.stress). Mixture scenarios
+    apply the same perturbation to every regime's matrix (mean_corr,
+    min_eig_raw and repair_dist then describe the first regime's). Row 0 is
+    unstressed.
+    """
+    rng = np.random.default_rng(seed)
+    d = len(sectors)
+    parts = regimes or [(None, 1.0, means_annual, vols_annual, corr)]
+    labels = draw_regimes(n_sim, [p for _, p, *_ in parts], rng) if regimes else np.zeros(n_sim, np.intp)
+    Z = rng.standard_normal((n_sim, d))
+    perturb_state = copy.deepcopy(rng)   # every regime gets identical perturbation draws
+    groups = []
+    for k, (_, _, m, v, c) in enumerate(parts):
+        raw = np.concatenate([c[None], stress_correlations(c, n_stress, copy.deepcopy(perturb_state),
+                                                           shift, noise)])
+        groups.append((np.flatnonzero(labels == k), m * horizon, v * np.sqrt(horizon), raw,
+                       np.linalg.cholesky(nearest_correlation(raw))))
+
+    def portfolio(start, stop):
+        returns = np.empty((stop - start, n_sim, d))
+        for idx, means, vols, _, chols in groups:
+            returns[:, idx] = means + correlated_shocks(Z[idx], chols[start:stop], shock, rng) * vols
+        return returns @ portfolio_weights
+
+    m = correlation_sweep(portfolio, n_stress + 1, Z.size, sharpe_scale=np.sqrt(2))
+    raw, chols = groups[0][3], groups[0][4]
+    corr_fixed = chols @ chols.transpose(0, 2, 1)
+    iu = np.triu_indices(d, 1)
+    return pd.DataFrame({
+        'scenario': label,
+        'stress': np.arange(n_stress + 1),
+        'mean_corr': corr_fixed[:, iu[0], iu[1]].mean(axis=1),
+        'min_eig_raw': np.linalg.eigvalsh(raw)[:, 0],
+        'repair_dist': np.linalg.norm(corr_fixed - raw, axis=(1, 2)),
+        'mean': m['mean'],
+        'var_5': m['var'],
+        'cvar_5': m['cvar'],
+        'sharpe_like': m['sharpe'],
+    })
+
+
+def sector_etfs():
+    """ETF tickers of every sector (ETF_PRICES) and each one's `sectors` index."""
+    etfs = pd.read_csv(ETF_PRICES).drop_duplicates('ticker')
+    etfs = etfs[etfs['sector'].isin(sectors)]
+    return list(etfs['ticker']), etfs['sector'].map(sectors.index).to_numpy()
+
+
+def run_scenario_historical(means_annual, vols_annual, corr, label, seed=42, regimes=None,
+                            returns=None, groups=None, block_days=BOOTSTRAP_BLOCK_DAYS):
+    """
+    run_scenario with a moving-block bootstrap of actual daily ETF returns
+    (mc_engine.historical) in place of the normal draw: the demeaned history
+    supplies the shocks, each ETF drifts at its sector's scenario mean (a
+    regime mixture at its probability-weighted means_annual) and sector
+    returns are equal-weight ETF means. Volatility and correlation come from
+    the history, so vols_annual / corr are unused.
+    """
+    rng = np.random.default_rng(seed)
+    shocks = returns - returns.mean(axis=0)
+    x = block_bootstrap(shocks, n_sim, trading_days(horizon), block_days, rng)
+    x -= 0.5 * shocks.var(axis=0) * TRADING_DAYS * horizon   # zero-mean simple returns
+    etf_returns = np.expm1(x, out=x) + means_annual[groups] * horizon
+    return _stats_from_returns(group_means(etf_returns, groups, len(sectors)))
+
+
+def _panel_chart(path, hists):
+    """Combined 3-panel portfolio histogram from pre-binned (counts, edges)."""
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, 3, figsize=(14, 4))
+    for ax, hist, title in zip(axes, hists, ['A: Base', 'B: Escalation', 'C: Sensitivity']):
+        plot_counts(ax, *hist, scale=100, edgecolor='black', alpha=0.7)
+        ax.axvline(0, color='red', linestyle='--')
+        ax.set_title(f'Portfolio Return 6mo — {title}')
+        ax.set_xlabel('Return (%)')
+    plt.tight_layout()
+    plt.savefig(path, dpi=150)
+    plt.close()
+    return path
+
+
+def _scenario_chart(path, hist, port_mean, scen_name):
+    """Report-quality per-scenario histogram from pre-binned (counts, edges)."""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    plot_counts(plt.gca(), *hist, scale=100, alpha=0.75, color='navy', edgecolor='black')
+    plt.axvline(port_mean * 100, color='red', linewidth=2, linestyle='--',
+                label=f'Mean: {port_mean * 100:.1f}%')
+    plt.title(f'{scen_name.replace("_", " ")} — Portfolio 6-Month Return Distribution')
+    plt.xlabel('Return (%)')
+    plt.ylabel('Frequency')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.savefig(path, dpi=300, bbox_inches='tight')
+    plt.close()
+    return path
+
+
+def _allocation_pie(path):
+    """Recommended allocation pie chart."""
+    import matplotlib.pyplot as plt
+
+    labels = ['Defense 40%', 'Energy 25%', 'Gold 20%', 'Utilities 15%']
+    sizes = portfolio_weights * 100
+    colors = ['#2e86ab', '#e94f37', '#ffc93c', '#6b9080']
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+    ax.set_title('Recommended $100k Allocation (40/25/20/15)')
+    plt.savefig(path, dpi=300, bbox_inches='tight')
+    plt.close()
+    return path
+
+
+def save_charts(out_dir, ports, scenario_stats, workers=None):
+    """
+    3-panel and per-scenario portfolio histograms plus the allocation pie
+    (PNGs in out_dir). ports are raw returns or StreamingStats; only their
+    binned counts reach the chart processes.
+    """
+    names = ['A_Base', 'B_Escalation', 'C_Sensitivity']
+    tasks = [(_panel_chart, (out_dir / "mc_portfolio_histograms.png", [binned_histogram(p, 80) for p in ports]))]
+    tasks += [(_scenario_chart, (out_dir / f'mc_histogram_{name.lower()}.png', binned_histogram(port, 60),
+                                 stats['Mean Return'], name))
+              for port, stats, name in zip(ports, scenario_stats, names)]
+    tasks.append((_allocation_pie, (out_dir / "mc_allocation_pie.png",)))
+    render_charts(tasks, workers)
+    print(f"Histograms saved: {out_dir / 'mc_portfolio_histograms.png'}")
+    print(f"Per-scenario histograms saved: mc_histogram_a_base.png, mc_histogram_b_escalation.png, mc_histogram_c_sensitivity.png")
+    print(f"Allocation pie chart saved: {out_dir / 'mc_allocation_pie.png'}")
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--output', type=Path, default=None)
     parser.add_argument('--paths', type=int, default=10000)
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='stream paths in chunks of this size (bounded memory; for 100M+ paths)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='process-pool workers (>1: SeedSequence-spawned streams per shard)')
+    parser.add_argument('--sampler', choices=SAMPLERS, default='mc',
+                        help='variance-reduction sampling mode (full-path serial runs only)')
+    parser.add_argument('--shocks', choices=SHOCKS, default='gaussian',
+                        help="shock distribution: fat-tailed t / copula models keep each sector's vol")
+    parser.add_argument('--df', type=float, default=DEFAULT_DF,
+                        help='Student-t degrees of freedom for the fat-tailed --shocks (> 2)')
+    parser.add_argument('--clayton-theta', type=float, default=None,
+                        help='Clayton copula θ (default: matched to the mean pairwise correlation)')
+    parser.add_argument('--shock-cap', type=float, default=None, metavar='SIGMAS',
+                        help='clip standardized shocks at ±SIGMAS (default: no clip; clipping '
+                             'trims the extreme draws behind Worst 1%% / CVaR)')
+    parser.add_argument('--sweep', type=int, default=0, metavar='N',
+                        help='also evaluate N random long-only allocations (plus portfolio_weights) '
+                             '→ mc_weight_sweep.csv')
+    parser.add_argument('--daily', action='store_true',
+                        help='also simulate trading-day paths for drawdown / stop-loss metrics '
+                             '→ mc_path_metrics.csv')
+    parser.add_argument('--stop-loss', type=float, default=DEFAULT_STOP_LOSS,
+                        help='portfolio stop-loss level for --daily, e.g. 0.20 = 20%% below start')
+    parser.add_argument('--rebalance', action='store_true',
+                        help='also simulate trading-day paths under buy-and-hold, monthly, quarterly and '
+                             '5%% drift-band rebalancing net of costs → mc_summary_rebalanced.csv')
+    parser.add_argument('--cost-bps', type=float, default=DEFAULT_COST_BPS,
+                        help='proportional trading cost for --rebalance, basis points of traded value')
+    parser.add_argument('--fixed-cost', type=float, default=FIXED_COST,
+                        help='fixed cost per rebalance for --rebalance, fraction of the starting value')
+    parser.add_argument('--cash-weight', type=float, default=CASH_WEIGHT,
+                        help='share of the book held in cash for --rebalance')
+    parser.add_argument('--cash-rate', type=float, default=CASH_RATE,
+                        help='annual yield on the cash held for --rebalance')
+    parser.add_argument('--term-structure', action='store_true',
+                        help='risk metrics at 1/3/6/12/18/24 months from one monthly-step simulation '
+                             'per scenario → mc_term_structure.csv')
+    parser.add_argument('--sensitivity', action='store_true',
+                        help='common-random-numbers bump-and-reprice tornado table for every mean, '
+                             'vol and correlation → mc_sensitivity.csv')
+    parser.add_argument('--reweight', nargs='?', type=float, const=0.05, default=None, metavar='STEP',
+                        help='Scenario B metrics for every regime-probability vector on a simplex grid '
+                             '(default step when given: 0.05) from the same paths → mc_regime_reweighting.csv')
+    parser.add_argument('--corr-stress', type=int, default=0, metavar='N',
+                        help='price the portfolio under N stressed, nearest-PSD-repaired correlation '
+                             'matrices per scenario → mc_corr_stress.csv')
+    parser.add_argument('--stress-shift', type=float, nargs=2, default=(0.0, 0.0), metavar=('LO', 'HI'),
+                        help='uniform range of the common correlation shift for --corr-stress')
+    parser.add_argument('--stress-noise', type=float, default=0.10,
+                        help='std of the per-entry correlation noise for --corr-stress')
+    parser.add_argument('--bootstrap', type=int, default=DEFAULT_REPLICATES, metavar='N',
+                        help='Poisson-bootstrap replicates for the 95%% CI rows of mc_summary.csv (0 disables them)')
+    parser.add_argument('--no-plots', action='store_true',
+                        help='skip the PNG charts (matplotlib is then never imported)')
+    parser.add_argument('--plot-workers', type=int, default=None, metavar='N',
+                        help='processes rendering the charts (default: one per chart up to the CPU count)')
+    parser.add_argument('--blend-b', action='store_true',
+                        help='simulate Scenario B as one normal with blended parameters '
+                             'instead of the quick/mild/severe regime mixture')
+    parser.add_argument('--historical', action='store_true',
+                        help='also run every scenario as a block bootstrap of daily sector-ETF returns '
+                             '→ mc_summary_historical.csv')
+    parser.add_argument('--price-store', type=Path, default=PRICE_DIR, metavar='DIR',
+                        help='price store for --historical (one <TICKER>.csv of date, close per ticker)')
+    parser.add_argument('--import-prices', type=Path, default=None, metavar='CSV',
+                        help='add a long-format price file (date, ticker, close) to the price store first')
+    parser.add_argument('--fetch-prices', action='store_true',
+                        help='download missing sector-ETF closes into the price store (needs yfinance)')
+    parser.add_argument('--block-days', type=int, default=BOOTSTRAP_BLOCK_DAYS,
+                        help='trading days per resampled block for --historical')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='simulate in batches of --paths until CI half-widths meet the tolerances')
+    parser.add_argument('--tol-mean', type=float, default=Tolerances.mean)
+    parser.add_argument('--tol-var', type=float, default=Tolerances.var)
+    parser.add_argument('--tol-sharpe', type=float, default=Tolerances.sharpe)
+    parser.add_argument('--max-paths', type=int, default=2_000_000)
     args = parser.parse_args()
+    if args.adaptive and (args.sampler != 'mc' or args.workers > 1 or args.chunk_size is not None):
+        parser.error("--adaptive cannot be combined with --sampler/--workers/--chunk-size")
+    if args.sampler != 'mc' and (args.workers > 1 or args.chunk_size is not None):
+        parser.error("--sampler other than 'mc' requires --workers 1 and no --chunk-size")
     global n_sim
     n_sim = args.paths
+    np.random.seed(42)
+    if args.shock_cap is not None and args.shock_cap <= 0:
+        parser.error("--shock-cap must be positive")
+    shock = ShockModel(args.shocks, args.df, args.clayton_theta, args.shock_cap)
 
     # --- Scenario A: Base historical (pre-2026 typical) ---
     means_a = np.array([0.18, 0.12, 0.08, 0.09])
     vols_a = np.array([0.20, 0.28, 0.16, 0.12])
-    stats_a, sectors_a, port_a, rets_a = run_scenario(means_a, vols_a, corr_base, 'A', seed=42)
 
     # --- Scenario B: Escalation weighted (25% quick / 45% mild / 30% severe) ---
-    # Weighted blend of parameters; 2026-adjusted premiums
+    # Weighted blend of parameters; 2026-adjusted premiums (simulated only with --blend-b)
     means_b = np.array([0.28, 0.32, 0.35, 0.09])  # defense 28%, energy 32%, gold 35%, util 9%
     vols_b = np.array([0.22, 0.35, 0.18, 0.12])
-    stats_b, sectors_b, port_b, rets_b = run_scenario(means_b, vols_b, corr_base, 'B', seed=43)
+
+    # Regime mixture actually simulated for B; probability-weighted means reproduce means_b
+    corr_severe = corr_base.copy()
+    corr_severe[0, 1] = corr_severe[1, 0] = 0.60  # defense-energy move together under escalation
+    regimes_b = [
+        ('quick', 0.25, np.array([0.16, 0.11, 0.14, 0.09]), np.array([0.20, 0.28, 0.16, 0.12]), corr_base),
+        ('mild', 0.45, np.array([0.26, 0.29, 0.33, 0.09]), np.array([0.21, 0.32, 0.17, 0.12]), corr_base),
+        ('severe', 0.30, np.array([0.41, 0.54, 0.555, 0.09]), np.array([0.28, 0.45, 0.22, 0.13]),
+         corr_severe),
+    ]
 
     # --- Scenario C: Sensitivity (higher severe / correlation stress) ---
     means_c = np.array([0.32, 0.40, 0.40, 0.08])  # worse escalation
@@ -89,7 +793,21 @@ def main():
     corr_c = corr_base.copy()
     corr_c[0, 1] = corr_c[1, 0] = 0.60  # defense-energy correlation up
     corr_c[0, 2] = corr_c[2, 0] = -0.25  # gold flight to safety
-    stats_c, sectors_c, port_c, rets_c = run_scenario(means_c, vols_c, corr_c, 'C', seed=44)
+
+    specs = [
+        (means_a, vols_a, corr_base, 'A', 42, None),
+        (means_b, vols_b, corr_base, 'B', 43, None if args.blend_b else regimes_b),
+        (means_c, vols_c, corr_c, 'C', 44, None),
+    ]
+    results = run_scenarios(specs, chunk_size=args.chunk_size, workers=args.workers, sampler=args.sampler,
+        adaptive=Tolerances(args.tol_mean, args.tol_var, args.tol_sharpe) if args.adaptive else None,
+        max_paths=args.max_paths, shock=shock)
+    (stats_a, sectors_a, port_a, rets_a), (stats_b, sectors_b, port_b, rets_b), \
+        (stats_c, sectors_c, port_c, rets_c) = results
+    if args.bootstrap:
+        for stats, port, spec in ((stats_a, port_a, specs[0]), (stats_b, port_b, specs[1]),
+                                  (stats_c, port_c, specs[2])):
+            stats.update(_bootstrap_rows(port, args.bootstrap, spec[4]))
 
     # Print all results
     print("\n========== SCENARIO A: Base Historical ==========")
@@ -114,52 +832,97 @@ def main():
         'Scenario B': stats_b,
         'Scenario C': stats_c,
     })
+    if shock.cap is not None:
+        summary.loc['Shock Cap'] = shock.cap   # tail rows are conditional on the clip
     summary.to_csv(out_dir / "mc_summary.csv")
     print(f"\nSummary saved: {out_dir / 'mc_summary.csv'}")
 
-    # Combined 3-panel histograms
-    fig, axes = plt.subplots(1, 3, figsize=(14, 4))
-    for ax, port, title in zip(axes, [port_a, port_b, port_c], ['A: Base', 'B: Escalation', 'C: Sensitivity']):
-        ax.hist(port * 100, bins=80, edgecolor='black', alpha=0.7)
-        ax.axvline(0, color='red', linestyle='--')
-        ax.set_title(f'Portfolio Return 6mo — {title}')
-        ax.set_xlabel('Return (%)')
-    plt.tight_layout()
-    plt.savefig(out_dir / "mc_portfolio_histograms.png", dpi=150)
-    plt.close()
-    print(f"Histograms saved: {out_dir / 'mc_portfolio_histograms.png'}")
+    if args.historical:
+        store = PriceStore(args.price_store)
+        if args.import_prices:
+            print(f"\n[Prices] Imported {len(store.import_csv(args.import_prices))} tickers into {store.root}")
+        tickers, groups = sector_etfs()
+        if args.fetch_prices:
+            missing = [tk for tk in tickers if tk not in store.tickers]
+            if missing:
+                print(f"\n[Prices] Fetched {len(store.fetch(missing))} tickers into {store.root}")
+        try:
+            _, returns = store.log_returns(tickers)
+        except FileNotFoundError as exc:
+            parser.error(f"--historical: {exc}; load them with --import-prices CSV or --fetch-prices")
+        print(f"\n[Historical] Block bootstrap of {len(returns):,} days × {', '.join(tickers)} | "
+              f"{args.block_days}-day blocks | {n_sim:,} paths per scenario")
+        hist = {f'Scenario {spec[3]}': run_scenario_historical(*spec, returns=returns, groups=groups,
+                                                               block_days=args.block_days)[0]
+                for spec in specs}
+        pd.DataFrame(hist).to_csv(out_dir / "mc_summary_historical.csv")
+        print(f"Historical summary saved: {out_dir / 'mc_summary_historical.csv'}")
+        for (name, h), p in zip(hist.items(), (stats_a, stats_b, stats_c)):
+            print(f"  {name}: mean {p['Mean Return']:.2%} → {h['Mean Return']:.2%} | "
+                  f"5% VaR {p['5% VaR']:.2%} → {h['5% VaR']:.2%}")
 
-    # Enhanced per-scenario histograms (report-quality)
-    for port_returns, scen_name in [
-        (port_a, 'A_Base'),
-        (port_b, 'B_Escalation'),
-        (port_c, 'C_Sensitivity'),
-    ]:
-        port_mean = np.mean(port_returns)
-        plt.figure(figsize=(10, 6))
-        plt.hist(port_returns * 100, bins=60, alpha=0.75, color='navy', edgecolor='black')
-        plt.axvline(port_mean * 100, color='red', linewidth=2, linestyle='--',
-                    label=f'Mean: {port_mean * 100:.1f}%')
-        plt.title(f'{scen_name.replace("_", " ")} — Portfolio 6-Month Return Distribution')
-        plt.xlabel('Return (%)')
-        plt.ylabel('Frequency')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.savefig(out_dir / f'mc_histogram_{scen_name.lower()}.png', dpi=300, bbox_inches='tight')
-        plt.close()
-    print(f"Per-scenario histograms saved: mc_histogram_a_base.png, mc_histogram_b_escalation.png, mc_histogram_c_sensitivity.png")
+    if args.sweep:
+        candidates = np.vstack([portfolio_weights,
+                                dirichlet_weights(args.sweep, len(sectors), np.random.default_rng(42))])
+        sweep_weights(specs, candidates, shock).to_csv(out_dir / "mc_weight_sweep.csv", index=False)
+        print(f"Weight sweep saved: {out_dir / 'mc_weight_sweep.csv'} ({len(candidates):,} candidates)")
 
-    # Allocation pie chart
-    labels = ['Defense 40%', 'Energy 25%', 'Gold 20%', 'Utilities 15%']
-    sizes = portfolio_weights * 100
-    colors = ['#2e86ab', '#e94f37', '#ffc93c', '#6b9080']
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-    ax.set_title('Recommended $100k Allocation (40/25/20/15)')
-    plt.savefig(out_dir / "mc_allocation_pie.png", dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"Allocation pie chart saved: {out_dir / 'mc_allocation_pie.png'}")
+    if args.reweight:
+        mixtures = [spec for spec in specs if spec[5]]
+        if mixtures:
+            rw = pd.concat([reweight_regimes(*spec, probabilities=simplex_grid(len(spec[5]), args.reweight),
+                                             shock=shock) for spec in mixtures], ignore_index=True)
+            rw.to_csv(out_dir / "mc_regime_reweighting.csv", index=False)
+            print(f"Regime reweighting saved: {out_dir / 'mc_regime_reweighting.csv'} ({len(rw):,} vectors)")
+        else:
+            print("Regime reweighting skipped: no regime-mixture scenario (--blend-b)")
+
+    if args.corr_stress:
+        stress = pd.concat([run_correlation_stress(*spec, n_stress=args.corr_stress,
+                                                   shift=tuple(args.stress_shift), noise=args.stress_noise,
+                                                   shock=shock) for spec in specs], ignore_index=True)
+        stress.to_csv(out_dir / "mc_corr_stress.csv", index=False)
+        print(f"Correlation stress saved: {out_dir / 'mc_corr_stress.csv'}")
+        for label, g in stress.groupby('scenario', sort=False):
+            q5, q50, q95 = np.percentile(g['var_5'].iloc[1:], [5, 50, 95])
+            print(f"  Scenario {label}: 5% VaR base {g['var_5'].iloc[0]:.2%} | stressed p5/p50/p95 "
+                  f"{q5:.2%} / {q50:.2%} / {q95:.2%} | repaired {(g['min_eig_raw'] < 0).mean():.0%}")
+
+    if args.rebalance:
+        costs = CostModel(args.cost_bps / 1e4, args.fixed_cost)
+        reb = pd.DataFrame({f'Scenario {spec[3]} ({name})': stats
+                            for spec in specs
+                            for name, stats in run_scenario_rebalanced(*spec, costs=costs,
+                                                                       cash_weight=args.cash_weight,
+                                                                       cash_rate=args.cash_rate,
+                                                                       shock=shock).items()})
+        reb.to_csv(out_dir / "mc_summary_rebalanced.csv")
+        print(f"Rebalanced summary saved: {out_dir / 'mc_summary_rebalanced.csv'}")
+        print(reb.loc[['Mean Return', '5% VaR', 'Mean Turnover', 'Mean Costs']].T)
+
+    if args.daily:
+        daily = pd.DataFrame({f'Scenario {spec[3]}': run_scenario_daily(*spec, stop_loss=args.stop_loss,
+                                                                       shock=shock)
+                              for spec in specs})
+        daily.to_csv(out_dir / "mc_path_metrics.csv")
+        print(f"Path metrics saved: {out_dir / 'mc_path_metrics.csv'}")
+        print(daily)
+
+    if args.term_structure:
+        ts = term_structure_table(specs, shock=shock)
+        ts.to_csv(out_dir / "mc_term_structure.csv", index=False)
+        print(f"Term structure saved: {out_dir / 'mc_term_structure.csv'}")
+        print(ts.pivot(index='horizon_months', columns='scenario', values='mean'))
+
+    if args.sensitivity:
+        sens = pd.concat([run_sensitivity(*spec, shock=shock) for spec in specs], ignore_index=True)
+        sens.to_csv(out_dir / "mc_sensitivity.csv", index=False)
+        print(f"Sensitivities saved: {out_dir / 'mc_sensitivity.csv'}")
+        print(sens[sens['scenario'] == 'C'].head(8)[['parameter', 'base_value', 'bump', 'var_5_down',
+                                                      'var_5_up', 'd_var_5', 'd_sharpe_like']].to_string(index=False))
 
+    if not args.no_plots:
+        save_charts(out_dir, (port_a, port_b, port_c), (stats_a, stats_b, stats_c), args.plot_workers)
 
 if __name__ == "__main__":
     main()
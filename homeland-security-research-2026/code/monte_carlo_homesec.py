@@ -6,18 +6,36 @@ Agent: Claude Code | Date: 2026-03-01
 Output: reports/mc_summary_homesec.csv + histogram PNGs + allocation pie
 """
 
+import argparse
+import copy
+import dataclasses
+import functools
+import sys
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 from pathlib import Path
 
-np.random.seed(42)  # Reproducible
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root → mc_engine
+from mc_engine import (
+    BOOTSTRAP_BLOCK_DAYS, Bump, CostModel, DEFAULT_CAP, DEFAULT_COST_BPS, DEFAULT_DF,
+    DEFAULT_FACTORS, DEFAULT_HORIZON_MONTHS, DEFAULT_PORT, DEFAULT_REPLICATES, DEFAULT_STOP_LOSS,
+    JumpClass, MONTHS_PER_YEAR, PathCache, PathSets, PriceStore, RebalanceRule, RiskService,
+    SAMPLERS, SHOCKS, ScenarioReweighter, ShockModel, StreamingStats, TRADING_DAYS, Tolerances,
+    binned_histogram, block_bootstrap, bootstrap_metrics, bumped_params, check_correlation,
+    compound_poisson, correlated_shocks, correlation_sweep, cumulative_values, daily_increments,
+    dirichlet_weights, draw_normals, effective_sample_size, evaluate_weights, expected_shortfall,
+    factor_log_returns, fit_factor_model, group_means, iter_chunks, mean_estimate,
+    nearest_correlation, optimize_cvar, path_metrics, plot_counts, portfolio_metrics,
+    price_log_returns, rebalanced_values, render_charts, reverse_stress, run_adaptive,
+    run_sharded_paths, run_sharded_streams, sensitivity_table, serve, shift_weights,
+    shifted_normals, simplex_grid, spawn_generators, stress_correlations, summarize_path_metrics,
+    summarize_rebalancing, term_structure, trading_days, weighted_moments, weighted_quantile,
+)
 
 ROOT = Path(__file__).parent.parent
 REPORTS_DIR = ROOT / "reports"
-REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 DATA_DIR = ROOT / "data"
+MU_CSV = DATA_DIR / "company_fundamentals" / "historical_event_returns.csv"
 
 # ---------------------------------------------------------------------------
 # Scenario Framework
@@ -60,6 +78,13 @@ SECTOR_LABELS = {
     "Fed_Comms_Cyber": "Fed Comms & Cyber\n(LHX + CRWD blend)",
 }
 WEIGHTS = np.array([0.35, 0.25, 0.20, 0.20])  # Must sum to 1.0
+# Recommendation tickers per sector: the --factor-model grouping when the price file has no sector column
+SECTOR_TICKERS = {
+    "HomeSec_Tech":    ["AXON", "MSI", "ITA"],
+    "Intel_Analytics": ["PLTR", "BAH", "LDOS"],
+    "FirstResponder":  ["MSA", "PSN"],
+    "Fed_Comms_Cyber": ["LHX", "CRWD", "PANW"],
+}
 
 # ---------------------------------------------------------------------------
 # Return Parameters (mu annualized) — loaded from historical_event_returns.csv
@@ -182,7 +207,49 @@ def load_historical_mu(csv_path: Path) -> dict:
     return mu_out
 
 
-MU = load_historical_mu(DATA_DIR / "company_fundamentals" / "historical_event_returns.csv")
+@functools.lru_cache(maxsize=None)
+def get_mu() -> dict:
+    """Calibrated μ per scenario key and sector (load_historical_mu(MU_CSV) on first use, then cached)."""
+    return load_historical_mu(MU_CSV)
+
+
+def __getattr__(name: str):
+    # Module attribute MU stays available to importers, calibrated on first access
+    if name == "MU":
+        return get_mu()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ---------------------------------------------------------------------------
+# Incident arrivals (--jumps)
+# Source: draft_threat_assessment.md — 28% aggregate probability of any domestic
+# activation in the 90-day window; A/B/C probabilities split arrivals by severity.
+# Jump sizes: 30-day event-window returns of the analog event per severity class
+# ---------------------------------------------------------------------------
+
+ACTIVATION_PROB_90D = 0.28
+INCIDENT_RATE = -np.log(1 - ACTIVATION_PROB_90D) / 0.25  # Poisson arrivals per year (≈1.31)
+INCIDENT_EVENTS = {"A": "post_soleimani_2020", "B": "boston_marathon_2013", "C": "9_11_2001"}
+JUMP_WINDOW = "window_30d"
+JUMP_BASE_MU = 0.0  # drift between incidents: all excess return comes from the jumps
+
+
+def load_jump_classes(csv_path: Path = MU_CSV, window: str = JUMP_WINDOW,
+                      rate: float = INCIDENT_RATE) -> list[JumpClass]:
+    """
+    One JumpClass per scenario (rate × scenario probability arrivals per
+    year). Per-sector log-jump mean from the SECTOR_TICKERS returns of the
+    class's analog event, or the event-wide mean where a sector has no data;
+    std is the cross-ticker dispersion of that event.
+    """
+    df = pd.read_csv(csv_path)
+    classes = []
+    for name, s in SCENARIOS.items():
+        event = df[df["event"] == INCIDENT_EVENTS[s["key"]]].set_index("ticker")[window].dropna()
+        log_jump = np.log1p(event / 100.0)
+        mean = np.array([log_jump.reindex(SECTOR_TICKERS[sec]).mean() for sec in SECTORS])
+        mean = np.where(np.isnan(mean), log_jump.mean(), mean)
+        classes.append(JumpClass(name, rate * s["probability"], mean, np.full(len(SECTORS), log_jump.std())))
+    return classes
 
 # ---------------------------------------------------------------------------
 # Volatility (σ annualized)
@@ -198,6 +265,13 @@ SIGMA_BASE = {
 }
 
 CRISIS_VOL_SCALAR = 1.20  # 20% upward vol adjustment for Scenario C crisis regime
+CRISIS_CORR_SHIFT = (0.10, 0.20)  # documented crisis-period correlation rise (--corr-stress)
+
+# --reverse-stress: loss to reach and prior s.d. of the log-vol and common correlation shifts
+# (μ shifts get the horizon sampling s.d. σ/√t, correlated like the returns)
+REVERSE_THRESHOLD = -0.15
+REVERSE_VOL_SD = 0.25
+REVERSE_CORR_SD = 0.10
 
 # ---------------------------------------------------------------------------
 # Correlation Matrix (Normal Regime)
@@ -213,6 +287,22 @@ CORR_MATRIX = np.array([
 ])
 
 N_SIM = 10_000
+MAX_ADAPTIVE_PATHS = 2_000_000  # path budget per scenario for the adaptive controller
+IS_TAIL_Q = 0.01  # importance sampling centres the shifted draws on this loss quantile
+CACHE_DIR = ROOT / ".mc_cache"  # --cache default: content-addressed sector-return .npy files
+REBALANCE_RULES = (
+    RebalanceRule("buy_and_hold"),
+    RebalanceRule("monthly", every=21),
+    RebalanceRule("quarterly", every=63),
+    RebalanceRule("band_5pct", band=0.05),
+)
+CASH_WEIGHT = 0.02  # settlement / redemption buffer held in cash by --rebalance
+CASH_RATE = 0.04    # annual yield on that cash
+FIXED_COST = 1e-4   # per rebalance, fraction of the starting value ($10 per $100k)
+PRICE_DIR = DATA_DIR / "prices"  # --historical default price store: one <TICKER>.csv per ticker
+SERVE_MONTHS = 24  # --serve: monthly steps held per scenario (longest queryable horizon)
+HIST_BINS = 80   # per-scenario histogram bars
+PANEL_BINS = 60  # bars per panel of the three-panel overview
 STYLE = {
     "A": {"color": "#2196F3", "label": "Scenario A — Minor Incident"},
     "B": {"color": "#FF9800", "label": "Scenario B — Coordinated Attack"},
@@ -226,59 +316,775 @@ STYLE = {
 
 def build_cholesky(corr: np.ndarray, sigma: np.ndarray) -> np.ndarray:
     """Covariance matrix → Cholesky decomposition."""
+    check_correlation(corr, "CORR_MATRIX")
     cov = np.diag(sigma) @ corr @ np.diag(sigma)
     return np.linalg.cholesky(cov)
 
 
-def run_mc(scenario_key: str, n_sim: int = N_SIM) -> dict:
-    """
-    Run Monte Carlo simulation for a single scenario.
-
-    Returns dict with: mean, median, std, p_profit, var_5pct, worst_1pct, sharpe,
-                       returns array (for histogram)
-    """
+def scenario_params(scenario_key: str) -> tuple[dict, np.ndarray, np.ndarray, float]:
+    """Scenario dict, mu vector, sigma vector (crisis-scaled for C) and horizon t."""
     s = SCENARIOS[scenario_key]
     key = s["key"]
-    t = s["t_years"]
-    mu_vec = np.array([MU[key][sec] for sec in SECTORS])
+    mu_vec = np.array([get_mu()[key][sec] for sec in SECTORS])
     sigma_vec = np.array([SIGMA_BASE[sec] for sec in SECTORS])
 
     # Apply crisis vol scalar for Scenario C
     if key == "C":
         sigma_vec = sigma_vec * CRISIS_VOL_SCALAR
+    return s, mu_vec, sigma_vec, s["t_years"]
+
+
+def analytic_portfolio_moments(mu_vec: np.ndarray, sigma_vec: np.ndarray, t: float,
+                               weights: np.ndarray = WEIGHTS) -> tuple[float, float]:
+    """
+    Exact mean / std of the weighted simple return under correlated GBM.
+
+    E[R_i] = exp(μ_i t) − 1 ; Cov(R_i, R_j) = exp((μ_i + μ_j) t) · (exp(ρ_ij σ_i σ_j t) − 1)
+    """
+    growth = np.exp(mu_vec * t)
+    cov = np.outer(growth, growth) * (np.exp(np.outer(sigma_vec, sigma_vec) * CORR_MATRIX * t) - 1)
+    mean = float(weights @ (growth - 1))
+    std = float(np.sqrt(weights @ cov @ weights))
+    return mean, std
 
-    # Cholesky decomposition
-    L = build_cholesky(CORR_MATRIX, sigma_vec)
 
-    # Generate correlated standard normals: shape (n_sim, n_sectors)
-    Z = np.random.standard_normal((n_sim, len(SECTORS)))
-    corr_Z = Z @ L.T  # Correlated shocks
+def _sector_returns(Z: np.ndarray, L: np.ndarray, mu_vec: np.ndarray,
+                    sigma_vec: np.ndarray, t: float, shock: ShockModel = ShockModel(),
+                    rng: np.random.Generator | None = None) -> np.ndarray:
+    """
+    Standard normals (n, n_sectors) → simple sector returns over horizon t.
+    shock swaps the Gaussian shocks for a fat-tailed model (mc_engine.shocks)
+    with the same covariance and mean growth e^{μt}; its extra draws come
+    from rng (None → global).
+    """
+    corr_Z = shock.correlate(Z, L, rng)  # Correlated shocks
 
     # GBM log-return per sector per path
     # ln(S_t/S_0) ~ N((μ - σ²/2)t, σ²t)
     drift = (mu_vec - 0.5 * sigma_vec**2) * t
+    if not shock.is_gaussian:
+        # Fat-tailed shocks: convexity term from the shock's mgf keeps E[S_t/S_0] = e^{μt}
+        drift = mu_vec * t - shock.log_mgf(sigma_vec * np.sqrt(t))
     diffusion = corr_Z * np.sqrt(t)
     sector_log_returns = drift + diffusion          # shape (n_sim, n_sectors)
-    sector_returns = np.exp(sector_log_returns) - 1  # Simple return
+    return np.exp(sector_log_returns) - 1           # Simple return
+
+
+def loss_direction(L: np.ndarray, mu_vec: np.ndarray, sigma_vec: np.ndarray,
+                   t: float) -> np.ndarray:
+    """
+    Unit vector in standard-normal shock space along which the portfolio
+    loses fastest (negative gradient of the weighted return at Z = 0).
+    """
+    drift = (mu_vec - 0.5 * sigma_vec**2) * t
+    grad = np.sqrt(t) * L.T @ (WEIGHTS * np.exp(drift))
+    return -grad / np.linalg.norm(grad)
+
+
+def run_mc(scenario_key: str, n_sim: int = N_SIM, chunk_size: int | None = None,
+           workers: int = 1, seed: int | np.random.SeedSequence = 42,
+           sampler: str = "mc", importance: bool = False,
+           cache: PathCache | None = None, shock: ShockModel = ShockModel()) -> dict:
+    """
+    Run Monte Carlo simulation for a single scenario.
+
+    With chunk_size set, paths are generated chunk_size at a time and folded
+    into streaming accumulators (bounded memory; "returns" is then None and
+    charts use the accumulated histogram in "stats"). Quantiles then come from
+    a KLL sketch and the *_err keys carry their 99% error bound (0 when exact).
+
+    workers > 1 shards the paths over a process pool with SeedSequence-spawned
+    generators (reproducible per seed + workers); workers == 1 keeps the
+    legacy global np.random stream.
+
+    sampler selects the shock generator (mc / antithetic / sobol / control,
+    see mc_engine.samplers); non-"mc" samplers need the full-path serial mode.
+    "control" regression-adjusts mean and P(profit) against the sector GBM
+    returns, whose mean exp(μt) − 1 is known analytically (the portfolio is
+    linear in them, so the mean becomes exact: vrf = inf). "vrf" and
+    "vrf_p_profit" are variance reduction factors versus plain MC.
+
+    importance=True draws half the shocks shifted by θ = Φ⁻¹(1 − IS_TAIL_Q)
+    along the loss direction (defensive mixture, mc_engine.tail) and
+    reweights by likelihood ratios, so far more paths land in the tail; all
+    metrics are then weighted and "ess" reports the Kish effective sample
+    size (n for unweighted runs).
+
+    shock selects the shock distribution (gaussian / student_t /
+    gauss_copula_t / t_copula / clayton, see mc_engine.shocks); the
+    fat-tailed models keep each sector's σ. sampler="control" needs Gaussian
+    shocks (its control mean exp(μt) − 1 assumes lognormal returns).
+
+    cache (full-path serial runs without importance sampling) loads the
+    sector returns from a content-addressed .npy file when (μ, σ, corr, t,
+    n_sim, sampler, RNG state) match an earlier run, and restores the global
+    stream to where the draw would have left it, so results are identical.
+
+    Returns dict with: mean, median, std, p_profit, var_5pct, worst_1pct, sharpe,
+                       median_err, var_5pct_err, worst_1pct_err, sampler, vrf, vrf_p_profit,
+                       cvar_5pct, cvar_1pct, ess, returns array (for histogram)
+    """
+    if sampler != "mc" and (workers > 1 or chunk_size is not None):
+        raise ValueError(f"sampler={sampler!r} requires workers=1 and no chunk_size")
+    if importance and (sampler != "mc" or workers > 1 or chunk_size is not None):
+        raise ValueError("importance sampling requires sampler='mc', workers=1 and no chunk_size")
+    if sampler == "control" and not shock.is_gaussian:
+        raise ValueError(f"sampler='control' requires Gaussian shocks, got {shock.kind!r}")
+    if workers > 1:
+        return _run_parallel({scenario_key: seed}, n_sim, chunk_size, workers, shock)[0]
+
+    s, mu_vec, sigma_vec, t = scenario_params(scenario_key)
+
+    # Cholesky decomposition
+    L = build_cholesky(CORR_MATRIX, sigma_vec)
+
+    if chunk_size is not None:
+        stats = _new_stats(mu_vec, sigma_vec, t)
+        for m in iter_chunks(n_sim, chunk_size):
+            Z = np.random.standard_normal((m, len(SECTORS)))
+            stats.update(_sector_returns(Z, L, mu_vec, sigma_vec, t, shock) @ WEIGHTS)
+        return _summarize_stats(scenario_key, n_sim, stats)
+
+    if importance:
+        from scipy.stats import norm
+        theta = norm.ppf(1 - IS_TAIL_Q) * loss_direction(L, mu_vec, sigma_vec, t)
+        Z = shifted_normals(n_sim, theta)
+        portfolio_returns = _sector_returns(Z, L, mu_vec, sigma_vec, t, shock) @ WEIGHTS
+        return _summarize_returns(scenario_key, n_sim, portfolio_returns,
+                                  weights=shift_weights(Z, theta))
+
+    def simulate() -> np.ndarray:
+        # Generate correlated standard normals: shape (n_sim, n_sectors)
+        Z = draw_normals(n_sim, len(SECTORS), sampler)
+        return _sector_returns(Z, L, mu_vec, sigma_vec, t, shock)
+
+    sector_returns = _cached(cache, (mu_vec, sigma_vec, t, n_sim, sampler), simulate, shock=shock)
 
     # Portfolio return (weighted)
     portfolio_returns = sector_returns @ WEIGHTS     # shape (n_sim,)
+    if sampler == "control":
+        return _summarize_returns(scenario_key, n_sim, portfolio_returns, sampler,
+                                  controls=sector_returns, control_mean=np.exp(mu_vec * t) - 1)
+    return _summarize_returns(scenario_key, n_sim, portfolio_returns, sampler)
 
-    # Risk metrics
-    mean_r = np.mean(portfolio_returns)
-    median_r = np.median(portfolio_returns)
-    std_r = np.std(portfolio_returns)
-    p_profit = np.mean(portfolio_returns > 0)
-    var_5pct = np.percentile(portfolio_returns, 5)   # 5% VaR (loss threshold)
-    worst_1pct = np.percentile(portfolio_returns, 1)
-    sharpe = mean_r / std_r if std_r > 0 else 0.0
 
+def run_mc_adaptive(scenario_key: str, tol: Tolerances = Tolerances(), batch: int = N_SIM,
+                    max_paths: int = MAX_ADAPTIVE_PATHS, shock: ShockModel = ShockModel()) -> dict:
+    """
+    run_mc that keeps drawing batches (legacy global stream) until the CI
+    half-widths of mean, VaR and Sharpe meet `tol` or max_paths is reached.
+
+    Adds "converged" and "ci_half_widths"; "n_sim" is the path count used.
+    """
+    _, mu_vec, sigma_vec, t = scenario_params(scenario_key)
+    L = build_cholesky(CORR_MATRIX, sigma_vec)
+
+    def sample(m: int) -> np.ndarray:
+        Z = np.random.standard_normal((m, len(SECTORS)))
+        return _sector_returns(Z, L, mu_vec, sigma_vec, t, shock) @ WEIGHTS
+
+    portfolio_returns, info = run_adaptive(sample, tol, batch, max_paths)
+    result = _summarize_returns(scenario_key, info["n_paths"], portfolio_returns)
+    result["converged"] = info["converged"]
+    result["ci_half_widths"] = info["half_widths"]
+    return result
+
+
+def simulate_sector_returns(scenario_key: str, n_sim: int = N_SIM,
+                            rng: np.random.Generator | None = None,
+                            cache: PathCache | None = None,
+                            shock: ShockModel = ShockModel()) -> np.ndarray:
+    """(n_sim, n_sectors) simple sector returns for one scenario (rng=None → global stream)."""
+    _, mu_vec, sigma_vec, t = scenario_params(scenario_key)
+
+    def simulate() -> np.ndarray:
+        L = build_cholesky(CORR_MATRIX, sigma_vec)
+        Z = draw_normals(n_sim, len(SECTORS), rng=rng)
+        return _sector_returns(Z, L, mu_vec, sigma_vec, t, shock, rng)
+
+    return _cached(cache, (mu_vec, sigma_vec, t, n_sim, "mc"), simulate, rng, shock)
+
+
+def _cached(cache: PathCache | None, params: tuple, simulate, rng=None,
+            shock: ShockModel = ShockModel()) -> np.ndarray:
+    """simulate() through the path cache; the key adds CORR_MATRIX, the shock model and the RNG state."""
+    if cache is None:
+        return simulate()
+    return cache.get_or_simulate((*params, CORR_MATRIX, repr(shock)), simulate, rng)
+
+
+def sweep_weights(weights: np.ndarray, n_sim: int = N_SIM, seed: int = 42,
+                  cache: PathCache | None = None, shock: ShockModel = ShockModel()) -> pd.DataFrame:
+    """
+    Evaluate many candidate allocations against one simulation per scenario.
+
+    weights: (n_candidates, n_sectors). Returns a long DataFrame with one row
+    per (scenario, candidate): weights, mean, median, std, p_profit,
+    var_5pct, sharpe, plus the candidate's probability-weighted mean across
+    scenarios in "weighted_mean".
+    """
+    weights = np.atleast_2d(weights)
+    frames = []
+    for name, rng in zip(SCENARIOS, spawn_generators(seed, len(SCENARIOS))):
+        df = evaluate_weights(simulate_sector_returns(name, n_sim, rng, cache, shock), weights,
+                              labels=SECTORS)
+        df.insert(0, "candidate", np.arange(len(weights)))
+        df.insert(0, "scenario", name)
+        df.insert(1, "probability", SCENARIOS[name]["probability"])
+        frames.append(df.rename(columns={"var": "var_5pct"}))
+    out = pd.concat(frames, ignore_index=True)
+    out["weighted_mean"] = (out["probability"] * out["mean"]).groupby(out["candidate"]).transform("sum")
+    return out
+
+
+def optimize_allocation(n_sim: int = N_SIM, cvar_limit: float | None = None, beta: float = 0.95,
+                        lower: float = 0.05, upper: float = 0.50, var_limit: float | None = None,
+                        seed: int = 42, cache: PathCache | None = None,
+                        shock: ShockModel = ShockModel()):
+    """
+    CVaR-constrained allocation over the probability-weighted A/B/C path sets.
+
+    Maximizes Σ_s probability_s · E_s[return] subject to β-CVaR of loss ≤
+    cvar_limit (optionally β-VaR ≤ var_limit) and lower ≤ w ≤ upper.
+    cvar_limit=None caps CVaR at that of the current WEIGHTS. Returns mc_engine.OptimizationResult.
+    """
+    paths = [simulate_sector_returns(name, n_sim, rng, cache, shock)
+             for name, rng in zip(SCENARIOS, spawn_generators(seed, len(SCENARIOS)))]
+    probs = [s["probability"] for s in SCENARIOS.values()]
+    return optimize_cvar(paths, probs, cvar_limit, beta, lower, upper, var_limit, benchmark=WEIGHTS)
+
+
+def reweight_scenarios(probabilities: np.ndarray, n_sim: int = N_SIM, seed: int = 42,
+                       cache: PathCache | None = None, shock: ShockModel = ShockModel()) -> pd.DataFrame:
+    """
+    Mixture risk metrics of the WEIGHTS portfolio for every row of
+    probabilities (n_vectors, 3 scenarios A/B/C) from one simulation per
+    scenario (mc_engine.ScenarioReweighter, weighted quantiles over the
+    same paths). The first row is the SCENARIOS probabilities.
+    """
+    paths = [simulate_sector_returns(name, n_sim, rng, cache, shock) @ WEIGHTS
+             for name, rng in zip(SCENARIOS, spawn_generators(seed, len(SCENARIOS)))]
+    current = [s["probability"] for s in SCENARIOS.values()]
+    reweighter = ScenarioReweighter(paths, [f"p_{s['key']}" for s in SCENARIOS.values()])
+    df = reweighter.evaluate(np.vstack([current, probabilities]))
+    df.insert(0, "is_current", np.arange(len(df)) == 0)
+    return df.rename(columns={"mean": "weighted_mean", "var": "var_5pct", "cvar": "cvar_5pct"})
+
+
+def save_optimal_weights_csv(opt, save_path: Path) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "sector":             SECTORS,
+        "current_weight":     WEIGHTS,
+        "recommended_weight": np.round(opt.weights, 4),
+    })
+    df["expected_return"] = round(opt.expected_return, 4)
+    df["cvar"] = round(opt.cvar, 4)
+    df["var"] = round(opt.var, 4)
+    df["cvar_limit"] = round(opt.cvar_limit, 4)
+    df["beta"] = opt.beta
+    df.to_csv(save_path, index=False)
+    print(f"  Saved → {save_path.name}")
+    return df
+
+
+def _daily_log_returns(scenario_key: str, n_sim: int, rng: np.random.Generator | None = None,
+                       dtype=np.float32, shock: ShockModel = ShockModel()) -> np.ndarray:
+    """(n_days, n_sim, 4) trading-day sector log-returns over the scenario horizon."""
+    _, mu_vec, sigma_vec, t = scenario_params(scenario_key)
+    dt = 1 / TRADING_DAYS
+    L = build_cholesky(CORR_MATRIX, sigma_vec) * np.sqrt(dt)
+    drift = (mu_vec - 0.5 * sigma_vec**2) * dt
+    if not shock.is_gaussian:
+        drift = mu_vec * dt - shock.log_mgf(sigma_vec * np.sqrt(dt))
+    return daily_increments(n_sim, trading_days(t), drift, L, shock=shock, rng=rng, dtype=dtype)
+
+
+def run_daily_paths(scenario_key: str, n_sim: int = N_SIM, stop_loss: float = DEFAULT_STOP_LOSS,
+                    rng: np.random.Generator | None = None, dtype=np.float32,
+                    shock: ShockModel = ShockModel()) -> dict:
+    """
+    Trading-day GBM paths of the buy-and-hold WEIGHTS portfolio over the
+    scenario horizon: drawdown, time-under-water and stop-loss statistics
+    (mc_engine.paths). Daily steps use the same μ, σ and shock model as
+    the one-step horizon draw, so terminal values agree in distribution.
+    """
+    increments = _daily_log_returns(scenario_key, n_sim, rng, dtype, shock)
+    n_days = len(increments)
+    values = cumulative_values(increments, WEIGHTS)
+    del increments   # overwritten in place by the cumulative sum
+    return {
+        "scenario":      scenario_key,
+        "n_paths":       n_sim,
+        "n_days":        n_days,
+        "stop_loss":     stop_loss,
+        "mean_return":   float(values[-1].mean() - 1),
+        **summarize_path_metrics(path_metrics(values, stop_loss)),
+    }
+
+
+def run_rebalancing(scenario_key: str, n_sim: int = N_SIM, rules=REBALANCE_RULES,
+                    costs: CostModel = CostModel(fixed=FIXED_COST), cash_weight: float = CASH_WEIGHT,
+                    cash_rate: float = CASH_RATE, rng: np.random.Generator | None = None,
+                    shock: ShockModel = ShockModel()) -> list[dict]:
+    """
+    Horizon returns of the WEIGHTS portfolio net of trading costs and cash
+    drag under each rebalancing rule (mc_engine.rebalance), all rules
+    replaying the same trading-day paths. One run_mc-style result dict per
+    rule, with 'rebalance' and the mean rebalances / turnover / costs added.
+    """
+    increments = _daily_log_returns(scenario_key, n_sim, rng, np.float32, shock)
+    results = []
+    for rule in rules:
+        values, stats = rebalanced_values(increments, WEIGHTS, rule, costs, cash_weight, cash_rate)
+        result = _summarize_returns(scenario_key, n_sim, values[-1] - 1)
+        result.update(rebalance=rule.name, **summarize_rebalancing(stats))
+        results.append(result)
+    return results
+
+
+def calibration_fingerprint(n_sim: int = N_SIM, seed: int = 42, shock: ShockModel = ShockModel()) -> str:
+    """Key of everything the --serve path sets depend on; MU_CSV enters by size and mtime."""
+    mu_file = [MU_CSV.stat().st_size, MU_CSV.stat().st_mtime_ns] if MU_CSV.exists() else None
+    return PathCache.key(mu_file, SIGMA_BASE, CORR_MATRIX, CRISIS_VOL_SCALAR, SERVE_MONTHS, n_sim, seed,
+                         repr(shock))
+
+
+def build_path_sets(n_sim: int = N_SIM, seed: int = 42, cache: PathCache | None = None,
+                    shock: ShockModel = ShockModel()) -> PathSets:
+    """
+    Monthly-step GBM sector growth out to SERVE_MONTHS for every scenario,
+    recalibrated from MU_CSV, for the --serve risk service
+    (mc_engine.service). At a scenario's own horizon the portfolio return
+    has the same distribution as the one-step run_mc draw.
+    """
+    get_mu.cache_clear()
+    dt = 1 / MONTHS_PER_YEAR
+    growth = []
+    for name, rng in zip(SCENARIOS, spawn_generators(seed, len(SCENARIOS))):
+        _, mu_vec, sigma_vec, _ = scenario_params(name)
+
+        def simulate() -> np.ndarray:
+            L = build_cholesky(CORR_MATRIX, sigma_vec) * np.sqrt(dt)
+            drift = (mu_vec - 0.5 * sigma_vec**2) * dt
+            if not shock.is_gaussian:
+                drift = mu_vec * dt - shock.log_mgf(sigma_vec * np.sqrt(dt))
+            x = daily_increments(n_sim, SERVE_MONTHS, drift, L, shock=shock, rng=rng)
+            return np.exp(np.cumsum(x, axis=0, out=x), out=x)
+
+        growth.append(_cached(cache, (mu_vec, sigma_vec, SERVE_MONTHS, n_sim, "monthly"), simulate, rng, shock))
+    return PathSets(
+        scenarios=tuple(SCENARIOS),
+        probabilities=np.array([s["probability"] for s in SCENARIOS.values()]),
+        horizons=np.array([s["duration_months"] for s in SCENARIOS.values()]),
+        sectors=tuple(SECTORS),
+        weights=WEIGHTS,
+        growth=tuple(growth),
+    )
+
+
+def run_term_structure(n_sim: int = N_SIM, months=DEFAULT_HORIZON_MONTHS, seed: int = 42,
+                       shock: ShockModel = ShockModel()) -> pd.DataFrame:
+    """
+    Risk-metric term structure: one monthly-step GBM simulation per scenario
+    out to max(months), with every horizon read off the same paths
+    (mc_engine.term_structure). Long format, one row per (scenario, horizon);
+    is_scenario_horizon flags the horizon the scenario itself is run at.
+    """
+    n_steps = max(months)
+    dt = 1 / MONTHS_PER_YEAR
+    rows = []
+    for name, rng in zip(SCENARIOS, spawn_generators(seed, len(SCENARIOS))):
+        s, mu_vec, sigma_vec, _ = scenario_params(name)
+        L = build_cholesky(CORR_MATRIX, sigma_vec) * np.sqrt(dt)
+        drift = (mu_vec - 0.5 * sigma_vec**2) * dt
+        if not shock.is_gaussian:
+            drift = mu_vec * dt - shock.log_mgf(sigma_vec * np.sqrt(dt))
+        increments = daily_increments(n_sim, n_steps, drift, L, shock=shock, rng=rng, dtype=np.float64)
+        values = cumulative_values(increments, WEIGHTS)
+        for row in term_structure(values, months):
+            h = row.pop("step")
+            rows.append({
+                "scenario":            name,
+                "probability":         s["probability"],
+                "horizon_months":      h,
+                "is_scenario_horizon": h == s["duration_months"],
+                **row,
+                "sharpe":              row["mean"] / row["std"] if row["std"] > 0 else 0.0,
+            })
+    return pd.DataFrame(rows).rename(columns={"var": "var_5pct", "cvar": "cvar_5pct"})
+
+
+def run_sensitivity(scenario_key: str, n_sim: int = N_SIM, rng: np.random.Generator | None = None,
+                    h_mu: float = 0.01, h_sigma: float = 0.01, h_crisis: float = 0.05,
+                    h_corr: float = 0.05, shock: ShockModel = ShockModel()) -> pd.DataFrame:
+    """
+    Tornado table of central-difference sensitivities of the portfolio
+    metrics to every MU / SIGMA_BASE / CORR_MATRIX entry (plus
+    CRISIS_VOL_SCALAR for Scenario C), all repriced against one set of
+    standard normals (common random numbers, mc_engine.sensitivity).
+    Rows are sorted by the swing in 5% VaR.
+    """
+    s, mu_vec, _, t = scenario_params(scenario_key)
+    crisis = s["key"] == "C"
+    base = {
+        "mu":     mu_vec,
+        "sigma":  np.array([SIGMA_BASE[sec] for sec in SECTORS]),
+        "crisis": np.array([CRISIS_VOL_SCALAR]),
+        "corr":   CORR_MATRIX,
+    }
+    n = len(SECTORS)
+    bumps = ([Bump(f"MU[{s['key']}][{sec}]", "mu", (i,), h_mu) for i, sec in enumerate(SECTORS)]
+             + [Bump(f"SIGMA_BASE[{sec}]", "sigma", (i,), h_sigma) for i, sec in enumerate(SECTORS)]
+             + ([Bump("CRISIS_VOL_SCALAR", "crisis", (0,), h_crisis)] if crisis else [])
+             + [Bump(f"CORR[{SECTORS[i]}, {SECTORS[j]}]", "corr", (i, j), h_corr, symmetric=True)
+                for i in range(n) for j in range(i + 1, n)])
+    p = bumped_params(base, bumps)
+    mu = p["mu"][:, None, :]
+    sigma = p["sigma"] * (p["crisis"] if crisis else 1.0)
+    cov = sigma[:, :, None] * p["corr"] * sigma[:, None, :]
+    try:
+        chols = np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        raise ValueError("a correlation bump leaves CORR_MATRIX indefinite; use a smaller h_corr") from None
+
+    rng = rng or np.random.default_rng()   # one generator: its copies replay the same extra draws
+    Z = rng.standard_normal((n_sim, n))
+    if shock.is_gaussian:
+        corr_Z = Z @ chols.transpose(0, 2, 1)                   # (1 + 2B, n_sim, n_sectors)
+        drift = (mu - 0.5 * sigma[:, None, :]**2) * t
+    else:
+        # Each set replays the same extra shock draws from a copy of rng
+        corr_Z = np.stack([shock.correlate(Z, L, copy.deepcopy(rng)) for L in chols])
+        drift = mu * t - shock.log_mgf(sigma * np.sqrt(t))[:, None, :]
+    port = (np.exp(drift + corr_Z * np.sqrt(t)) - 1) @ WEIGHTS   # (1 + 2B, n_sim)
+
+    m = portfolio_metrics(port)
+    metrics = {"mean": m["mean"], "var_5pct": m["var"], "cvar_5pct": m["cvar"], "sharpe": m["sharpe"]}
+    df = sensitivity_table(metrics, bumps, base, sort_by="var_5pct")
+    df.insert(0, "scenario", scenario_key)
+    return df
+
+
+def run_correlation_stress(scenario_key: str, n_stress: int = 1000, n_sim: int = N_SIM,
+                           rng: np.random.Generator | None = None,
+                           shift: tuple[float, float] = CRISIS_CORR_SHIFT, noise: float = 0.05,
+                           shock: ShockModel = ShockModel()) -> pd.DataFrame:
+    """
+    Portfolio metrics under n_stress perturbed CORR_MATRIX copies (common
+    shift ~ U(shift) plus N(0, noise²) per entry), each repaired to the
+    nearest correlation matrix, batch-factorized and priced against one set
+    of standard normals (mc_engine.stress). Row 0 is the unstressed matrix;
+    min_eig_raw < 0 marks the stressed matrices that needed repair.
+    """
+    rng = rng or np.random.default_rng()
+    _, mu_vec, sigma_vec, t = scenario_params(scenario_key)
+    raw = np.concatenate([CORR_MATRIX[None], stress_correlations(CORR_MATRIX, n_stress, rng, shift, noise)])
+    corr = nearest_correlation(raw)
+    chols = np.linalg.cholesky(corr)
+    Z = rng.standard_normal((n_sim, len(SECTORS)))
+    drift = (mu_vec - 0.5 * sigma_vec**2) * t
+    if not shock.is_gaussian:
+        drift = mu_vec * t - shock.log_mgf(sigma_vec * np.sqrt(t))
+
+    def portfolio(start: int, stop: int) -> np.ndarray:
+        shocks = correlated_shocks(Z, chols[start:stop], shock, rng)
+        return (np.exp(drift + shocks * sigma_vec * np.sqrt(t)) - 1) @ WEIGHTS
+
+    m = correlation_sweep(portfolio, len(corr), Z.size)
+    iu = np.triu_indices(len(SECTORS), 1)
+    return pd.DataFrame({
+        "scenario":      scenario_key,
+        "stress":        np.arange(len(corr)),
+        "mean_corr":     corr[:, iu[0], iu[1]].mean(axis=1),
+        "min_eig_raw":   np.linalg.eigvalsh(raw)[:, 0],
+        "repair_dist":   np.linalg.norm(corr - raw, axis=(1, 2)),
+        "mean":          m["mean"],
+        "var_5pct":      m["var"],
+        "cvar_5pct":     m["cvar"],
+        "sharpe":        m["sharpe"],
+    })
+
+
+def run_reverse_stress(scenario_key: str, threshold: float = REVERSE_THRESHOLD, metric: str = "mean",
+                       n_sim: int = N_SIM, rng: np.random.Generator | None = None,
+                       shock: ShockModel = ShockModel()) -> dict:
+    """
+    Most plausible shift of MU, SIGMA_BASE and CORR_MATRIX that takes the
+    portfolio metric ("mean", "var" = 5% VaR or "cvar") down to threshold
+    (mc_engine.reverse). The shift is 4 μ moves, 4 log-σ moves and one
+    common move of every off-diagonal correlation (repaired to the nearest
+    correlation matrix); plausibility is its Mahalanobis distance under
+    independent blocks with s.d. σ/√t (correlated by CORR_MATRIX),
+    REVERSE_VOL_SD and REVERSE_CORR_SD. Every candidate is priced against
+    one set of standard normals; metric_check re-prices the design point on
+    a fresh sample.
+    """
+    rng = rng or np.random.default_rng()
+    s, mu_vec, sigma_vec, t = scenario_params(scenario_key)
+    n = len(SECTORS)
+    scale = np.zeros((2 * n + 1, 2 * n + 1))
+    scale[:n, :n] = build_cholesky(CORR_MATRIX, sigma_vec / np.sqrt(t))
+    scale[n:2 * n, n:2 * n] = REVERSE_VOL_SD * np.eye(n)
+    scale[-1, -1] = REVERSE_CORR_SD
+    off_diag = 1 - np.eye(n)
+
+    def params(theta: np.ndarray):
+        mu = mu_vec + theta[:, :n]
+        sigma = sigma_vec * np.exp(theta[:, n:2 * n])
+        raw = np.clip(CORR_MATRIX + theta[:, -1, None, None] * off_diag, -0.999, 0.999)
+        corr = nearest_correlation(np.where(off_diag, raw, 1.0))   # clip the correlations, not the diagonal
+        return mu, sigma, corr
+
+    def pricer(Z: np.ndarray, shock_rng: np.random.Generator | None):
+        def metric_fn(theta: np.ndarray) -> np.ndarray:
+            mu, sigma, corr = params(theta)
+            shocks = correlated_shocks(Z, np.linalg.cholesky(corr), shock, shock_rng)
+            drift = mu * t - (0.5 * sigma**2 * t if shock.is_gaussian else shock.log_mgf(sigma * np.sqrt(t)))
+            port = (np.exp(drift[:, None, :] + shocks * (sigma * np.sqrt(t))[:, None, :]) - 1) @ WEIGHTS
+            return portfolio_metrics(port)[metric]
+        return metric_fn
+
+    search = pricer(rng.standard_normal((n_sim, n)), copy.deepcopy(rng))
+    res = reverse_stress(search, scale, threshold)
+    check = pricer(rng.standard_normal((n_sim, n)), copy.deepcopy(rng))(res.shift[None])[0]
+    mu, sigma, corr = (p[0] for p in params(res.shift[None]))
+    iu = np.triu_indices(n, 1)
+    return {
+        "scenario":      scenario_key,
+        "probability":   s["probability"],
+        "metric":        metric,
+        "threshold":     threshold,
+        "base_metric":   res.base_metric,
+        "metric_at_shift": res.metric,
+        "metric_check":  float(check),
+        "distance":      res.distance,
+        "iterations":    res.iterations,
+        "converged":     res.converged,
+        **{f"mu_{sec}": mu[i] for i, sec in enumerate(SECTORS)},
+        **{f"sigma_{sec}": sigma[i] for i, sec in enumerate(SECTORS)},
+        **{f"return_{sec}": np.expm1(mu[i] * t) for i, sec in enumerate(SECTORS)},
+        "corr_shift":    res.shift[-1],
+        "mean_corr":     corr[iu].mean(),
+    }
+
+
+def run_jump_diffusion(n_sim: int = N_SIM, months=(6, 12, 24), seed: int = 42,
+                       rate: float = INCIDENT_RATE, shock: ShockModel = ShockModel()) -> pd.DataFrame:
+    """
+    Portfolio returns with incidents arriving inside the horizon: GBM at
+    JUMP_BASE_MU / SIGMA_BASE / CORR_MATRIX times the compound-Poisson jumps
+    of every severity class (mc_engine.jumps), one simulation per horizon.
+    Rows per horizon and outcome: all paths, paths without an incident, and
+    paths by their most severe incident.
+    """
+    classes = load_jump_classes(rate=rate)
+    mu_vec = np.full(len(SECTORS), JUMP_BASE_MU)
+    sigma_vec = np.array([SIGMA_BASE[sec] for sec in SECTORS])
+    L = build_cholesky(CORR_MATRIX, sigma_vec)
+    corr_chol = np.linalg.cholesky(CORR_MATRIX)
+    rows = []
+    for m, rng in zip(months, spawn_generators(seed, len(months))):
+        t = m / MONTHS_PER_YEAR
+        Z = rng.standard_normal((n_sim, len(SECTORS)))
+        sector = 1 + _sector_returns(Z, L, mu_vec, sigma_vec, t, shock, rng)
+        jumps, counts = compound_poisson(n_sim, t, classes, corr_chol, rng)
+        port = (sector * np.exp(jumps) - 1) @ WEIGHTS
+        hit = counts > 0
+        worst = np.where(hit.any(axis=1), len(classes) - 1 - hit[:, ::-1].argmax(axis=1), -1)
+        outcomes = [("all", np.ones(n_sim, dtype=bool)), ("no_incident", worst < 0)]
+        outcomes += [(c.name, worst == i) for i, c in enumerate(classes)]
+        for outcome, mask in outcomes:
+            row = {"horizon_months": m, "outcome": outcome, "share": mask.mean(),
+                   "mean_incidents": counts[mask].sum(axis=1).mean() if mask.any() else np.nan}
+            if mask.any():
+                met = portfolio_metrics(port[mask][None])
+                row.update(mean=met["mean"][0], median=float(np.median(port[mask])), std=met["std"][0],
+                           p_profit=met["p_profit"][0], var_5pct=met["var"][0], cvar_5pct=met["cvar"][0])
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def historical_returns(store: PriceStore) -> tuple[np.ndarray, np.ndarray]:
+    """Daily log-returns (T, n) float32 of every SECTOR_TICKERS name in store and each one's SECTORS index."""
+    tickers = [tk for sec in SECTORS for tk in SECTOR_TICKERS[sec]]
+    groups = np.array([i for i, sec in enumerate(SECTORS) for _ in SECTOR_TICKERS[sec]])
+    _, returns = store.log_returns(tickers)
+    return returns, groups
+
+
+def run_historical(scenario_key: str, returns: np.ndarray, groups: np.ndarray, n_sim: int = N_SIM,
+                   rng: np.random.Generator | None = None,
+                   block_days: int = BOOTSTRAP_BLOCK_DAYS) -> dict:
+    """
+    Scenario summary from a moving-block bootstrap of actual daily ticker
+    returns (mc_engine.historical) instead of GBM. The demeaned history
+    supplies the shocks (scaled by CRISIS_VOL_SCALAR for Scenario C) and
+    each ticker drifts at its sector's scenario μ; sector returns are
+    equal-weight ticker means. Same result dict as run_mc.
+    """
+    s, mu_vec, _, t = scenario_params(scenario_key)
+    shocks = returns - returns.mean(axis=0)
+    if s["key"] == "C":
+        shocks *= CRISIS_VOL_SCALAR
+    x = block_bootstrap(shocks, n_sim, trading_days(t), block_days, rng)
+    x += (mu_vec[groups] - 0.5 * shocks.var(axis=0) * TRADING_DAYS) * t
+    sectors = group_means(np.expm1(x, out=x), groups, len(SECTORS))
+    result = _summarize_returns(scenario_key, n_sim, sectors @ WEIGHTS)
+    result["sampler"] = "historical"
+    return result
+
+
+def run_factor_model(prices: pd.DataFrame, n_factors: int = DEFAULT_FACTORS, n_sim: int = N_SIM,
+                     seed: int = 42) -> pd.DataFrame:
+    """
+    Per-ticker scenario simulation from a PCA factor model (mc_engine.factor)
+    calibrated on prices (long format: date, ticker, close and an optional
+    sector column; SECTOR_TICKERS otherwise). The history only sets the
+    covariance: each ticker drifts at its sector's scenario μ, and Scenario C
+    scales every volatility by CRISIS_VOL_SCALAR. Sector returns are
+    equal-weight ticker means and the portfolio applies WEIGHTS. One row per
+    scenario and ticker / sector / portfolio.
+    """
+    sector_of = (prices.drop_duplicates("ticker").set_index("ticker")["sector"] if "sector" in prices
+                 else pd.Series({tk: sec for sec, tks in SECTOR_TICKERS.items() for tk in tks}))
+    log_returns = price_log_returns(prices[prices["ticker"].map(sector_of).isin(SECTORS)])
+    groups = np.array([SECTORS.index(sector_of[tk]) for tk in log_returns.columns])
+    missing = [sec for i, sec in enumerate(SECTORS) if i not in groups]
+    if missing:
+        raise ValueError(f"price history has no tickers for sector(s) {missing}")
+    model = fit_factor_model(log_returns, n_factors)
+
+    names = [*model.tickers, *SECTORS, "portfolio"]
+    frames = []
+    for name, rng in zip(SCENARIOS, spawn_generators(seed, len(SCENARIOS))):
+        s, mu_vec, _, t = scenario_params(name)
+        m = model.scaled(CRISIS_VOL_SCALAR) if s["key"] == "C" else model
+        x = factor_log_returns(m, n_sim, t, rng)
+        x += (mu_vec[groups] - 0.5 * m.vols**2) * t      # GBM drift, E[S_t/S_0] = e^{μt}
+        tickers = np.expm1(x, out=x)
+        sectors = group_means(tickers, groups, len(SECTORS))
+        metrics = portfolio_metrics(np.column_stack([tickers, sectors, sectors @ WEIGHTS]).T)
+        frames.append(pd.DataFrame({
+            "scenario":  name,
+            "level":     ["ticker"] * len(groups) + ["sector"] * len(SECTORS) + ["portfolio"],
+            "name":      names,
+            "sector":    [SECTORS[g] for g in groups] + SECTORS + [""],
+            "ann_vol":   np.concatenate([m.vols, np.full(len(SECTORS) + 1, np.nan)]),
+            "mean":      metrics["mean"],
+            "std":       metrics["std"],
+            "p_profit":  metrics["p_profit"],
+            "var_5pct":  metrics["var"],
+            "cvar_5pct": metrics["cvar"],
+            "sharpe":    metrics["sharpe"],
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def save_path_metrics_csv(rows: list[dict], save_path: Path) -> pd.DataFrame:
+    df = pd.DataFrame(rows).round(4)
+    df.to_csv(save_path, index=False)
+    print(f"  Saved → {save_path.name}")
+    return df
+
+
+def _new_stats(mu_vec: np.ndarray, sigma_vec: np.ndarray, t: float, **kwargs) -> StreamingStats:
+    """Streaming accumulator with histogram range from the analytic moments (±12σ, floored at −100%)."""
+    mean_a, std_a = analytic_portfolio_moments(mu_vec, sigma_vec, t)
+    return StreamingStats(max(-1.0, mean_a - 12 * std_a), mean_a + 12 * std_a, **kwargs)
+
+
+def _summarize_returns(scenario_key: str, n_sim: int, portfolio_returns: np.ndarray,
+                       sampler: str = "mc", controls: np.ndarray | None = None,
+                       control_mean: np.ndarray | None = None,
+                       weights: np.ndarray | None = None) -> dict:
+    """Risk metrics from the full portfolio-return array (exact / likelihood-weighted percentiles)."""
+    if weights is not None:
+        mean_r, std_r = weighted_moments(portfolio_returns, weights)
+        p_profit = float(np.average(portfolio_returns > 0, weights=weights))
+        vrf = vrf_p = 1.0
+    else:
+        mean_r, vrf = mean_estimate(portfolio_returns, sampler, controls, control_mean)
+        p_profit, vrf_p = mean_estimate(portfolio_returns > 0, sampler, controls, control_mean)
+        std_r = np.std(portfolio_returns)
+    median_r, var_5pct, worst_1pct = weighted_quantile(
+        portfolio_returns, np.array([0.50, 0.05, 0.01]), weights)  # 5% VaR (loss threshold)
+    return _result_dict(
+        scenario_key, n_sim,
+        mean_r=mean_r,
+        median_r=median_r,
+        std_r=std_r,
+        p_profit=min(1.0, max(0.0, p_profit)),
+        var_5pct=var_5pct,
+        worst_1pct=worst_1pct,
+        returns=portfolio_returns,
+        sampler="importance" if weights is not None else sampler, vrf=vrf, vrf_p_profit=vrf_p,
+        cvar_5pct=expected_shortfall(portfolio_returns, 0.05, weights),
+        cvar_1pct=expected_shortfall(portfolio_returns, 0.01, weights),
+        ess=effective_sample_size(weights, n_sim), weights=weights,
+    )
+
+
+def _summarize_stats(scenario_key: str, n_sim: int, stats: StreamingStats) -> dict:
+    """Risk metrics from a streaming accumulator (sketch quantiles + error bounds)."""
+    return _result_dict(
+        scenario_key, n_sim,
+        mean_r=stats.mean, median_r=stats.quantile(0.50), std_r=stats.std,
+        p_profit=stats.p_profit, var_5pct=stats.quantile(0.05),
+        worst_1pct=stats.quantile(0.01), returns=None, stats=stats,
+        quantile_err={q: stats.quantile_error(q) for q in (0.50, 0.05, 0.01)},
+        cvar_5pct=stats.expected_shortfall(0.05), cvar_1pct=stats.expected_shortfall(0.01),
+        ess=float(n_sim),
+    )
+
+
+# -- Process-pool workers (top-level so they pickle under spawn on Windows) --
+
+def _sample_portfolio(rng: np.random.Generator, m: int, L, mu_vec, sigma_vec, t,
+                      shock: ShockModel = ShockModel()) -> np.ndarray:
+    Z = rng.standard_normal((m, len(SECTORS)))
+    return _sector_returns(Z, L, mu_vec, sigma_vec, t, shock, rng) @ WEIGHTS
+
+
+def _stream_portfolio(rng: np.random.Generator, m: int, chunk_size, L, mu_vec, sigma_vec, t,
+                      shock: ShockModel = ShockModel()):
+    stats = _new_stats(mu_vec, sigma_vec, t, sketch_seed=int(rng.integers(2**32)))
+    for c in iter_chunks(m, chunk_size):
+        stats.update(_sample_portfolio(rng, c, L, mu_vec, sigma_vec, t, shock))
+    return [stats]
+
+
+def _run_parallel(seeds: dict, n_sim: int, chunk_size: int | None, workers: int,
+                  shock: ShockModel = ShockModel()) -> list[dict]:
+    """Run every scenario in `seeds` (name → seed) as shards of one process pool."""
+    jobs = {}
+    for name, seed in seeds.items():
+        _, mu_vec, sigma_vec, t = scenario_params(name)
+        L = build_cholesky(CORR_MATRIX, sigma_vec)
+        args = (L, mu_vec, sigma_vec, t, shock)
+        jobs[name] = (n_sim, seed, args if chunk_size is None else (chunk_size, *args))
+
+    if chunk_size is None:
+        paths = run_sharded_paths(_sample_portfolio, jobs, workers)
+        return [_summarize_returns(name, n_sim, paths[name]) for name in seeds]
+    accs = run_sharded_streams(_stream_portfolio, jobs, workers)
+    return [_summarize_stats(name, n_sim, accs[name][0]) for name in seeds]
+
+
+def _result_dict(scenario_key: str, n_sim: int, *, mean_r, median_r, std_r, p_profit,
+                 var_5pct, worst_1pct, returns, stats=None, quantile_err=None,
+                 sampler: str = "mc", vrf: float = 1.0, vrf_p_profit: float = 1.0,
+                 cvar_5pct: float = np.nan, cvar_1pct: float = np.nan, ess: float = np.nan,
+                 weights: np.ndarray | None = None) -> dict:
+    s = SCENARIOS[scenario_key]
+    err = quantile_err or {}
+    sharpe = mean_r / std_r if std_r > 0 else 0.0
     return {
         "scenario": scenario_key,
-        "scenario_key": key,
+        "scenario_key": s["key"],
         "probability": s["probability"],
         "duration_months": s["duration_months"],
         "description": s["description"],
+        "n_sim": n_sim,
         "mean": mean_r,
         "median": median_r,
         "std": std_r,
@@ -286,7 +1092,21 @@ def run_mc(scenario_key: str, n_sim: int = N_SIM) -> dict:
         "var_5pct": var_5pct,
         "worst_1pct": worst_1pct,
         "sharpe": sharpe,
-        "returns": portfolio_returns,
+        "median_err": err.get(0.50, 0.0),
+        "var_5pct_err": err.get(0.05, 0.0),
+        "worst_1pct_err": err.get(0.01, 0.0),
+        "sampler": sampler,
+        "vrf": vrf,
+        "vrf_p_profit": vrf_p_profit,
+        "cvar_5pct": cvar_5pct,
+        "cvar_1pct": cvar_1pct,
+        "ess": ess,
+        "returns": returns,
+        "weights": weights,
+        "stats": stats,
+        # Chart bars, so rendering never needs the paths
+        "hist": {b: binned_histogram(stats if returns is None else returns, b, weights)
+                 for b in (HIST_BINS, PANEL_BINS)},
     }
 
 
@@ -294,9 +1114,20 @@ def run_mc(scenario_key: str, n_sim: int = N_SIM) -> dict:
 # Visualization
 # ---------------------------------------------------------------------------
 
+def _chart_fields(result: dict) -> dict:
+    """Result without the path arrays / accumulator (what a chart task needs; cheap to pickle)."""
+    return {k: v for k, v in result.items() if k not in ("returns", "weights", "stats", "ci")}
+
+
+def _plot_hist(ax, result: dict, bins: int, **kwargs):
+    """ax.hist of the result's pre-binned histogram with `bins` bars."""
+    return plot_counts(ax, *result["hist"][bins], **kwargs)
+
+
 def generate_histogram(result: dict, save_path: Path):
     """Generate and save individual scenario histogram."""
-    returns = result["returns"]
+    import matplotlib.pyplot as plt
+
     key = result["scenario_key"]
     color = STYLE[key]["color"]
     label = STYLE[key]["label"]
@@ -304,7 +1135,7 @@ def generate_histogram(result: dict, save_path: Path):
     var_5pct = result["var_5pct"]
 
     fig, ax = plt.subplots(figsize=(10, 6))
-    ax.hist(returns, bins=80, color=color, alpha=0.75, edgecolor="white", linewidth=0.3)
+    _plot_hist(ax, result, HIST_BINS, color=color, alpha=0.75, edgecolor="white", linewidth=0.3)
 
     ax.axvline(median_r, color="black", linewidth=2, linestyle="--",
                label=f"Median: {median_r*100:.1f}%")
@@ -318,7 +1149,7 @@ def generate_histogram(result: dict, save_path: Path):
     ax.legend(fontsize=10)
 
     stats_text = (
-        f"n = {N_SIM:,} paths | t = {result['duration_months']} months\n"
+        f"n = {result['n_sim']:,} paths | t = {result['duration_months']} months\n"
         f"Mean: {result['mean']*100:.1f}%  |  σ: {result['std']*100:.1f}%\n"
         f"P(profit): {result['p_profit']*100:.0f}%  |  Sharpe: {result['sharpe']:.2f}\n"
         f"Worst 1%: {result['worst_1pct']*100:.1f}%"
@@ -332,23 +1163,24 @@ def generate_histogram(result: dict, save_path: Path):
     plt.tight_layout()
     fig.savefig(save_path, dpi=150, bbox_inches="tight")
     plt.close(fig)
-    print(f"  Saved → {save_path.name}")
+    return save_path
 
 
 def generate_three_panel(results: list[dict], save_path: Path):
     """3-panel overview histogram (matching Iran report style)."""
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
     fig.suptitle(
-        "Homeland Security Portfolio — Monte Carlo Simulation (10,000 Paths)",
+        f"Homeland Security Portfolio — Monte Carlo Simulation ({results[0]['n_sim']:,} Paths)",
         fontsize=14, fontweight="bold", y=1.02
     )
 
     for ax, result in zip(axes, results):
         key = result["scenario_key"]
         color = STYLE[key]["color"]
-        returns = result["returns"]
 
-        ax.hist(returns, bins=60, color=color, alpha=0.75, edgecolor="white", linewidth=0.2)
+        _plot_hist(ax, result, PANEL_BINS, color=color, alpha=0.75, edgecolor="white", linewidth=0.2)
         ax.axvline(result["median"], color="black", linewidth=1.8, linestyle="--",
                    label=f"Median: {result['median']*100:.1f}%")
         ax.axvline(result["var_5pct"], color="darkred", linewidth=1.2, linestyle=":",
@@ -371,18 +1203,21 @@ def generate_three_panel(results: list[dict], save_path: Path):
     plt.tight_layout()
     fig.savefig(save_path, dpi=150, bbox_inches="tight")
     plt.close(fig)
-    print(f"  Saved → {save_path.name}")
+    return save_path
 
 
-def generate_allocation_pie(save_path: Path):
+def generate_allocation_pie(save_path: Path, weights: np.ndarray = WEIGHTS,
+                            title: str = "Homeland Security Portfolio — Sector Allocation"):
     """Sector allocation pie chart."""
+    import matplotlib.pyplot as plt
+
     colors = ["#1565C0", "#283593", "#0288D1", "#0097A7"]
     labels = [SECTOR_LABELS[s] for s in SECTORS]
     explode = [0.02] * len(SECTORS)
 
     fig, ax = plt.subplots(figsize=(9, 7))
     wedges, texts, autotexts = ax.pie(
-        WEIGHTS, labels=labels, autopct="%1.0f%%",
+        weights, labels=labels, autopct="%1.0f%%",
         colors=colors, explode=explode, startangle=140,
         textprops={"fontsize": 10}, pctdistance=0.82,
     )
@@ -391,10 +1226,7 @@ def generate_allocation_pie(save_path: Path):
         at.set_fontweight("bold")
         at.set_fontsize(11)
 
-    ax.set_title(
-        "Homeland Security Portfolio — Sector Allocation",
-        fontsize=13, fontweight="bold", pad=20
-    )
+    ax.set_title(title, fontsize=13, fontweight="bold", pad=20)
 
     # Ticker legend
     ticker_note = (
@@ -410,29 +1242,79 @@ def generate_allocation_pie(save_path: Path):
     plt.tight_layout()
     fig.savefig(save_path, dpi=150, bbox_inches="tight")
     plt.close(fig)
-    print(f"  Saved → {save_path.name}")
+    return save_path
 
 
 # ---------------------------------------------------------------------------
 # Summary CSV
 # ---------------------------------------------------------------------------
 
-def save_summary_csv(results: list[dict], weighted_mean: float, save_path: Path):
+# Bootstrap metric (mc_engine.BOOTSTRAP_METRICS) → summary CSV column
+CI_COLUMNS = {
+    "mean":       "mean_return",
+    "median":     "median_return",
+    "std":        "std",
+    "p_profit":   "p_profit",
+    "var":        "var_5pct",
+    "worst_1pct": "worst_1pct",
+    "sharpe":     "sharpe",
+}
+
+
+def add_bootstrap_cis(results: list[dict], n_boot: int = DEFAULT_REPLICATES, seed: int = 42):
+    """
+    Attach r["ci"] = {metric: (lo, hi)} 95% Poisson-bootstrap intervals to
+    every full-path result (likelihood-weighted for importance sampling;
+    None for streamed runs, which keep no path array). Uses its own
+    generators, so the simulation stream is untouched.
+    """
+    for r, rng in zip(results, spawn_generators(seed, len(results))):
+        r["ci"] = (bootstrap_metrics(r["returns"], n_boot, weights=r["weights"], rng=rng)
+                   if r["returns"] is not None else None)
+
+
+def save_summary_csv(results: list[dict], weighted_mean: float | None, save_path: Path,
+                     shock: ShockModel = ShockModel()):
     rows = []
     for r in results:
-        rows.append({
+        row = {
             "scenario":          r["scenario"],
             "probability":       r["probability"],
             "duration_months":   r["duration_months"],
+            "n_paths":           r["n_sim"],
             "mean_return":       round(r["mean"], 4),
             "median_return":     round(r["median"], 4),
+            "median_err":        round(r["median_err"], 6),
             "std":               round(r["std"], 4),
             "p_profit":          round(r["p_profit"], 4),
             "var_5pct":          round(r["var_5pct"], 4),
+            "var_5pct_err":      round(r["var_5pct_err"], 6),
             "worst_1pct":        round(r["worst_1pct"], 4),
+            "worst_1pct_err":    round(r["worst_1pct_err"], 6),
+            "cvar_5pct":         round(r["cvar_5pct"], 4),
+            "cvar_1pct":         round(r["cvar_1pct"], 4),
             "sharpe":            round(r["sharpe"], 4),
-            "description":       r["description"],
-        })
+            "sampler":           r["sampler"],
+            "vrf_mean":          round(r["vrf"], 2),
+            "vrf_p_profit":      round(r["vrf_p_profit"], 2),
+            "ess":               round(r["ess"], 1),
+        }
+        if not shock.is_gaussian:
+            row["shocks"] = shock.kind
+            row["shock_cap"] = shock.cap
+        if "rebalance" in r:
+            row = {"scenario": r["scenario"], "rebalance": r["rebalance"], **row}
+            row["mean_rebalances"] = round(r["mean_rebalances"], 2)
+            row["mean_turnover"] = round(r["mean_turnover"], 4)
+            row["mean_costs"] = round(r["mean_costs"], 6)
+        if "ci" in r:
+            ci = r["ci"] or {}
+            for key, col in CI_COLUMNS.items():
+                lo, hi = ci.get(key, (np.nan, np.nan))
+                row[f"{col}_ci_lo"] = round(lo, 4)
+                row[f"{col}_ci_hi"] = round(hi, 4)
+        row["description"] = r["description"]
+        rows.append(row)
 
     df = pd.DataFrame(rows)
     df.to_csv(save_path, index=False)
@@ -444,17 +1326,50 @@ def save_summary_csv(results: list[dict], weighted_mean: float, save_path: Path)
 # Main
 # ---------------------------------------------------------------------------
 
-def run_all_scenarios() -> tuple[list[dict], float]:
-    print("\n[Simulation] Running 10,000-path Monte Carlo across 3 scenarios...")
+def run_all_scenarios(n_sim: int = N_SIM, chunk_size: int | None = None,
+                      workers: int = 1, seed: int = 42,
+                      sampler: str = "mc", importance: str = "",
+                      adaptive: Tolerances | None = None,
+                      max_paths: int = MAX_ADAPTIVE_PATHS,
+                      cache: PathCache | None = None,
+                      shock: ShockModel = ShockModel()) -> tuple[list[dict], float]:
+    """
+    importance: scenario keys (e.g. "C") to run with tail importance sampling.
+    adaptive: CI tolerances; when set each scenario runs run_mc_adaptive with
+    n_sim as the first batch and max_paths as the budget.
+    shock: shock model for every scenario (mc_engine.ShockModel).
+    """
+    print(f"\n[Simulation] Running {n_sim:,}-path Monte Carlo across 3 scenarios...")
+    if not shock.is_gaussian:
+        cap = "no clip" if shock.cap is None else f"clipped at ±{shock.cap:g}σ"
+        print(f"  Shocks: {shock.kind} (ν = {shock.df:g}, {cap})")
     scenario_order = ["A_minor_incident", "B_coordinated", "C_mass_casualty"]
-    results = []
-    for name in scenario_order:
-        key = SCENARIOS[name]["key"]
-        print(f"  Scenario {key}: {SCENARIOS[name]['description']}")
-        r = run_mc(name)
-        results.append(r)
+    if workers > 1:
+        # One pool for all scenarios; each scenario gets its own spawned seed stream
+        print(f"  [{workers} workers] scenarios and path shards run in parallel")
+        seeds = dict(zip(scenario_order, np.random.SeedSequence(seed).spawn(len(scenario_order))))
+        results = _run_parallel(seeds, n_sim, chunk_size, workers, shock)
+    elif adaptive is not None:
+        results = [run_mc_adaptive(name, adaptive, n_sim, max_paths, shock) for name in scenario_order]
+    else:
+        results = [run_mc(name, n_sim=n_sim, chunk_size=chunk_size, sampler=sampler,
+                          importance=SCENARIOS[name]["key"] in importance, cache=cache, shock=shock)
+                   for name in scenario_order]
+    for r in results:
+        print(f"  Scenario {r['scenario_key']}: {r['description']}")
         print(f"    Mean: {r['mean']*100:.1f}%  |  Median: {r['median']*100:.1f}%  "
               f"|  P(profit): {r['p_profit']*100:.0f}%  |  Sharpe: {r['sharpe']:.2f}")
+        if r["sampler"] == "importance":
+            print(f"    Importance-sampled tail  |  VaR 5%: {r['var_5pct']*100:.1f}%  "
+                  f"|  CVaR 1%: {r['cvar_1pct']*100:.1f}%  |  ESS: {r['ess']:,.0f} / {r['n_sim']:,}")
+        elif "converged" in r:
+            hw = r["ci_half_widths"]
+            print(f"    Adaptive: {r['n_sim']:,} paths ({'converged' if r['converged'] else 'budget hit'})  "
+                  f"|  ±mean {hw['mean']*100:.2f}%  |  ±VaR {hw['var']*100:.2f}%  "
+                  f"|  ±Sharpe {hw['sharpe']:.3f}")
+        elif r["sampler"] != "mc":
+            print(f"    Sampler: {r['sampler']}  |  Variance reduction — mean: {r['vrf']:.1f}x  "
+                  f"|  P(profit): {r['vrf_p_profit']:.1f}x")
 
     # Probability-weighted expected return
     weighted_mean = sum(r["probability"] * r["mean"] for r in results)
@@ -463,27 +1378,353 @@ def run_all_scenarios() -> tuple[list[dict], float]:
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paths", type=int, default=N_SIM)
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="stream paths in chunks of this size (bounded memory; for 100M+ paths)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="process-pool workers (>1: SeedSequence-spawned streams per shard)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="root seed of the base run (serial: global np.random stream; --workers > 1: "
+                             "SeedSequence shards) and of every add-on analysis (--bootstrap, --sweep, "
+                             "--optimize, --reweight, --corr-stress, --rebalance, --daily, --term-structure, "
+                             "--sensitivity, --jumps, --reverse-stress, --historical, --factor-model, --serve; "
+                             "per-scenario streams via spawn_generators)")
+    parser.add_argument("--sampler", choices=SAMPLERS, default="mc",
+                        help="variance-reduction sampling mode (full-path serial runs only)")
+    parser.add_argument("--shocks", choices=SHOCKS, default="gaussian",
+                        help="shock distribution: fat-tailed t / copula models keep each sector's σ")
+    parser.add_argument("--df", type=float, default=DEFAULT_DF,
+                        help="Student-t degrees of freedom for the fat-tailed --shocks (> 2)")
+    parser.add_argument("--clayton-theta", type=float, default=None,
+                        help="Clayton copula θ (default: matched to the mean pairwise correlation)")
+    parser.add_argument("--shock-cap", type=float, default=None, metavar="SIGMAS",
+                        help="clip standardized shocks at ±SIGMAS (default: no clip, except "
+                             f"±{DEFAULT_CAP:g} for t marginals, whose log-returns need a finite E[exp])")
+    parser.add_argument("--importance-sampling", nargs="?", const="C", default="", metavar="KEYS",
+                        help="tail importance sampling for these scenario keys (default when given: C)")
+    parser.add_argument("--sweep", type=int, default=0, metavar="N",
+                        help="also evaluate N random long-only allocations (plus WEIGHTS) "
+                             "→ reports/mc_weight_sweep_homesec.csv")
+    parser.add_argument("--optimize", action="store_true",
+                        help="CVaR-constrained allocation LP over the A/B/C paths "
+                             "→ mc_optimal_weights_homesec.csv + optimized pie")
+    parser.add_argument("--cvar-limit", type=float, default=None,
+                        help="max β-CVaR of loss for --optimize, e.g. 0.25 = 25%% loss "
+                             "(default: CVaR of the current WEIGHTS)")
+    parser.add_argument("--cvar-beta", type=float, default=0.95)
+    parser.add_argument("--var-limit", type=float, default=None,
+                        help="optional max β-VaR of loss for --optimize")
+    parser.add_argument("--min-weight", type=float, default=0.05)
+    parser.add_argument("--max-weight", type=float, default=0.50)
+    parser.add_argument("--daily", action="store_true",
+                        help="also simulate trading-day paths for drawdown / stop-loss metrics "
+                             "→ reports/mc_path_metrics_homesec.csv")
+    parser.add_argument("--stop-loss", type=float, default=DEFAULT_STOP_LOSS,
+                        help="portfolio stop-loss level for --daily, e.g. 0.20 = 20%% below start")
+    parser.add_argument("--daily-dtype", choices=("float32", "float64"), default="float32",
+                        help="path array precision for --daily (float32 halves memory)")
+    parser.add_argument("--rebalance", action="store_true",
+                        help="also simulate trading-day paths under buy-and-hold, monthly, quarterly and "
+                             "5%% drift-band rebalancing net of costs → reports/mc_summary_homesec_rebalanced.csv")
+    parser.add_argument("--cost-bps", type=float, default=DEFAULT_COST_BPS,
+                        help="proportional trading cost for --rebalance, basis points of traded value")
+    parser.add_argument("--fixed-cost", type=float, default=FIXED_COST,
+                        help="fixed cost per rebalance for --rebalance, fraction of the starting value")
+    parser.add_argument("--cash-weight", type=float, default=CASH_WEIGHT,
+                        help="share of the book held in cash for --rebalance")
+    parser.add_argument("--cash-rate", type=float, default=CASH_RATE,
+                        help="annual yield on the cash held for --rebalance")
+    parser.add_argument("--term-structure", action="store_true",
+                        help="risk metrics at 1/3/6/12/18/24 months from one monthly-step simulation "
+                             "per scenario → reports/mc_term_structure.csv")
+    parser.add_argument("--sensitivity", action="store_true",
+                        help="common-random-numbers bump-and-reprice tornado table for MU / SIGMA_BASE / "
+                             "CRISIS_VOL_SCALAR / CORR_MATRIX → reports/mc_sensitivity_homesec.csv")
+    parser.add_argument("--reweight", nargs="?", type=float, const=0.05, default=None, metavar="STEP",
+                        help="mixture metrics for every scenario-probability vector on a simplex grid "
+                             "(default step when given: 0.05) from the same paths "
+                             "→ reports/mc_scenario_reweighting_homesec.csv")
+    parser.add_argument("--corr-stress", type=int, default=0, metavar="N",
+                        help="price the portfolio under N stressed, nearest-PSD-repaired correlation "
+                             "matrices → reports/mc_corr_stress_homesec.csv")
+    parser.add_argument("--stress-shift", type=float, nargs=2, default=CRISIS_CORR_SHIFT, metavar=("LO", "HI"),
+                        help="uniform range of the common correlation shift for --corr-stress")
+    parser.add_argument("--stress-noise", type=float, default=0.05,
+                        help="std of the per-entry correlation noise for --corr-stress")
+    parser.add_argument("--bootstrap", type=int, default=DEFAULT_REPLICATES, metavar="N",
+                        help="Poisson-bootstrap replicates for the 95%% CI columns of the summary CSV "
+                             "(0 disables them)")
+    parser.add_argument("--jumps", action="store_true",
+                        help="jump diffusion with Poisson incident arrivals inside 6/12/24-month horizons "
+                             "→ reports/mc_jump_diffusion_homesec.csv")
+    parser.add_argument("--incident-rate", type=float, default=INCIDENT_RATE,
+                        help="incident arrivals per year for --jumps (split by scenario probability)")
+    parser.add_argument("--reverse-stress", nargs="?", type=float, const=-REVERSE_THRESHOLD, default=None,
+                        metavar="LOSS",
+                        help="most plausible MU / SIGMA_BASE / CORR_MATRIX shift per scenario that takes the "
+                             "portfolio metric to a loss of LOSS, a positive fraction (default when given: "
+                             "0.15 = a 15%% loss) "
+                             "→ reports/mc_reverse_stress_homesec.csv")
+    parser.add_argument("--reverse-metric", choices=("mean", "var", "cvar"), default="mean",
+                        help="portfolio metric driven to the --reverse-stress loss (var / cvar: 5%% tail)")
+    parser.add_argument("--historical", action="store_true",
+                        help="also run every scenario as a block bootstrap of daily SECTOR_TICKERS returns "
+                             "→ reports/mc_summary_homesec_historical.csv")
+    parser.add_argument("--price-store", type=Path, default=PRICE_DIR, metavar="DIR",
+                        help="price store for --historical (one <TICKER>.csv of date, close per ticker)")
+    parser.add_argument("--import-prices", type=Path, default=None, metavar="CSV",
+                        help="add a long-format price file (date, ticker, close) to the price store first")
+    parser.add_argument("--fetch-prices", action="store_true",
+                        help="download missing SECTOR_TICKERS closes into the price store (needs yfinance)")
+    parser.add_argument("--block-days", type=int, default=BOOTSTRAP_BLOCK_DAYS,
+                        help="trading days per resampled block for --historical")
+    parser.add_argument("--factor-model", type=Path, default=None, metavar="PRICES_CSV",
+                        help="per-ticker simulation from a PCA factor model calibrated on daily closes "
+                             "(CSV: date, ticker, close[, sector]) → reports/mc_factor_model_homesec.csv")
+    parser.add_argument("--factors", type=int, default=DEFAULT_FACTORS,
+                        help="number of statistical factors for --factor-model")
+    parser.add_argument("--serve", nargs="?", type=int, const=DEFAULT_PORT, default=None, metavar="PORT",
+                        help="run as a local risk daemon instead: keep --paths monthly-step paths per scenario "
+                             f"in memory and answer JSON what-if queries (default port when given: {DEFAULT_PORT})")
+    parser.add_argument("--host", default="127.0.0.1", help="interface for --serve")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="skip the PNG charts (matplotlib is then never imported)")
+    parser.add_argument("--plot-workers", type=int, default=None, metavar="N",
+                        help="processes rendering the charts (default: one per chart up to the CPU count; "
+                             "1 renders in this process)")
+    parser.add_argument("--cache", nargs="?", const=str(CACHE_DIR), default=None, metavar="DIR",
+                        help="reuse simulated sector returns from a content-addressed .npy cache "
+                             f"(default when given: {CACHE_DIR.name}/)")
+    parser.add_argument("--cache-max-mb", type=int, default=2048,
+                        help="cache size limit; least recently used entries are evicted")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="simulate in batches of --paths until CI half-widths meet the tolerances")
+    parser.add_argument("--tol-mean", type=float, default=Tolerances.mean)
+    parser.add_argument("--tol-var", type=float, default=Tolerances.var)
+    parser.add_argument("--tol-sharpe", type=float, default=Tolerances.sharpe)
+    parser.add_argument("--max-paths", type=int, default=MAX_ADAPTIVE_PATHS)
+    args = parser.parse_args()
+    if args.adaptive and (args.sampler != "mc" or args.workers > 1 or args.chunk_size is not None
+                          or args.importance_sampling):
+        parser.error("--adaptive cannot be combined with --sampler/--workers/--chunk-size/"
+                     "--importance-sampling")
+    if args.sampler != "mc" and (args.workers > 1 or args.chunk_size is not None):
+        parser.error("--sampler other than 'mc' requires --workers 1 and no --chunk-size")
+    if args.importance_sampling and (args.sampler != "mc" or args.workers > 1
+                                     or args.chunk_size is not None):
+        parser.error("--importance-sampling requires --sampler mc, --workers 1 and no --chunk-size")
+    if args.sampler == "control" and args.shocks != "gaussian":
+        parser.error("--sampler control requires --shocks gaussian")
+    if args.shock_cap is not None and args.shock_cap <= 0:
+        parser.error("--shock-cap must be positive")
+    if args.reverse_stress is not None and args.reverse_stress <= 0:
+        parser.error("--reverse-stress takes a positive loss fraction (e.g. 0.15 for a 15% loss)")
+    shock = ShockModel(args.shocks, args.df, args.clayton_theta, args.shock_cap)
+    if shock.cap is None and shock.needs_cap:
+        shock = dataclasses.replace(shock, cap=DEFAULT_CAP)
+    np.random.seed(args.seed)  # Reproducible
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    adaptive = Tolerances(args.tol_mean, args.tol_var, args.tol_sharpe) if args.adaptive else None
+    cache = PathCache(args.cache, args.cache_max_mb * 1024**2) if args.cache else None
+
+    if args.serve is not None:
+        service = RiskService(lambda: build_path_sets(args.paths, args.seed, cache, shock),
+                              lambda: calibration_fingerprint(args.paths, args.seed, shock))
+        service.paths()
+        server = serve(service, args.host, args.serve)
+        print(f"\n[Serve] {args.paths:,} paths × {SERVE_MONTHS} months per scenario built in "
+              f"{service.build_seconds:.1f}s | POST http://{args.host}:{args.serve}/metrics "
+              '{"weights": [...], "probabilities": [...], "horizon_months": h}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
     print("=" * 60)
     print("Phase 4: Monte Carlo Simulation — Homeland Security 2026")
     print("=" * 60)
 
-    results, weighted_mean = run_all_scenarios()
-
-    print("\n[Charts] Generating histograms and allocation chart...")
-    scenario_filenames = {
-        "A_minor_incident": "mc_histogram_a_minor.png",
-        "B_coordinated":    "mc_histogram_b_coordinated.png",
-        "C_mass_casualty":  "mc_histogram_c_mass_casualty.png",
-    }
-    for r in results:
-        fname = scenario_filenames[r["scenario"]]
-        generate_histogram(r, REPORTS_DIR / fname)
-
-    generate_three_panel(results, REPORTS_DIR / "mc_portfolio_histograms_homesec.png")
-    generate_allocation_pie(REPORTS_DIR / "mc_allocation_pie_homesec.png")
+    results, weighted_mean = run_all_scenarios(args.paths, args.chunk_size, args.workers, args.seed,
+                                               args.sampler, args.importance_sampling.upper(),
+                                               adaptive, args.max_paths, cache, shock)
+
+    if args.bootstrap:
+        print(f"\n[Bootstrap] {args.bootstrap:,} Poisson-bootstrap replicates per scenario (95% CIs)")
+        add_bootstrap_cis(results, args.bootstrap, args.seed)
+
+    if not args.no_plots:
+        print("\n[Charts] Generating histograms and allocation chart...")
+        scenario_filenames = {
+            "A_minor_incident": "mc_histogram_a_minor.png",
+            "B_coordinated":    "mc_histogram_b_coordinated.png",
+            "C_mass_casualty":  "mc_histogram_c_mass_casualty.png",
+        }
+        charts = [_chart_fields(r) for r in results]
+        tasks = [(generate_histogram, (c, REPORTS_DIR / scenario_filenames[c["scenario"]])) for c in charts]
+        tasks += [(generate_three_panel, (charts, REPORTS_DIR / "mc_portfolio_histograms_homesec.png")),
+                  (generate_allocation_pie, (REPORTS_DIR / "mc_allocation_pie_homesec.png",))]
+        for path in render_charts(tasks, args.plot_workers):
+            print(f"  Saved → {path.name}")
+
+    if args.sweep:
+        print(f"\n[Sweep] Evaluating {args.sweep:,} candidate allocations + current WEIGHTS...")
+        candidates = np.vstack([WEIGHTS, dirichlet_weights(args.sweep, len(SECTORS),
+                                                           np.random.default_rng(args.seed))])
+        sweep = sweep_weights(candidates, args.paths, args.seed, cache, shock)
+        sweep.to_csv(REPORTS_DIR / "mc_weight_sweep_homesec.csv", index=False)
+        print(f"  Saved → mc_weight_sweep_homesec.csv")
+        best = sweep[sweep["scenario"] == "C_mass_casualty"].nlargest(5, "weighted_mean")
+        print(best[["candidate", *SECTORS, "weighted_mean", "var_5pct"]].to_string(index=False))
+
+    if args.optimize:
+        print(f"\n[Optimize] Max probability-weighted return s.t. "
+              f"CVaR{args.cvar_beta:.0%} loss ≤ "
+              f"{'current' if args.cvar_limit is None else f'{args.cvar_limit:.0%}'} "
+              f"| weights in [{args.min_weight:.0%}, {args.max_weight:.0%}]")
+        opt = optimize_allocation(args.paths, args.cvar_limit, args.cvar_beta,
+                                  args.min_weight, args.max_weight, args.var_limit, args.seed,
+                                  cache, shock)
+        if opt.success:
+            save_optimal_weights_csv(opt, REPORTS_DIR / "mc_optimal_weights_homesec.csv")
+            if not args.no_plots:
+                path, = render_charts([(generate_allocation_pie, (
+                    REPORTS_DIR / "mc_allocation_pie_homesec_optimized.png", opt.weights,
+                    "Homeland Security Portfolio — CVaR-Optimized Allocation"))], 1)
+                print(f"  Saved → {path.name}")
+            print("  " + " | ".join(f"{s}={w:.1%}" for s, w in zip(SECTORS, opt.weights)))
+            print(f"  E[return]={opt.expected_return:.2%}  VaR={opt.var:.2%}  CVaR={opt.cvar:.2%}")
+        else:
+            print(f"  [WARN] Optimization infeasible: {opt.message}")
+
+    if args.reweight:
+        grid = simplex_grid(len(SCENARIOS), args.reweight)
+        print(f"\n[Reweight] {len(grid):,} scenario-probability vectors (step {args.reweight:g}) "
+              f"over one {args.paths:,}-path simulation per scenario")
+        rw = reweight_scenarios(grid, args.paths, args.seed, cache, shock)
+        rw.to_csv(REPORTS_DIR / "mc_scenario_reweighting_homesec.csv", index=False)
+        print(f"  Saved → mc_scenario_reweighting_homesec.csv")
+        cols = ["p_A", "p_B", "p_C", "weighted_mean", "p_profit", "var_5pct", "cvar_5pct"]
+        print(rw.loc[[0, rw["var_5pct"].iloc[1:].idxmin(), rw["var_5pct"].iloc[1:].idxmax()], cols]
+              .to_string(index=False))
+
+    if args.corr_stress:
+        print(f"\n[Correlation stress] {args.corr_stress:,} matrices per scenario | shift "
+              f"U({args.stress_shift[0]:g}, {args.stress_shift[1]:g}) + N(0, {args.stress_noise:g}²)")
+        stress = pd.concat([run_correlation_stress(name, args.corr_stress, args.paths, rng,
+                                                   tuple(args.stress_shift), args.stress_noise, shock)
+                            for name, rng in zip(SCENARIOS, spawn_generators(args.seed, len(SCENARIOS)))],
+                           ignore_index=True)
+        stress.to_csv(REPORTS_DIR / "mc_corr_stress_homesec.csv", index=False)
+        print(f"  Saved → mc_corr_stress_homesec.csv")
+        for name, g in stress.groupby("scenario", sort=False):
+            q5, q50, q95 = np.percentile(g["var_5pct"].iloc[1:], [5, 50, 95])
+            print(f"  {name}: VaR 5% base {g['var_5pct'].iloc[0]:.2%} | stressed p5/p50/p95 "
+                  f"{q5:.2%} / {q50:.2%} / {q95:.2%} | repaired {(g['min_eig_raw'] < 0).mean():.0%}")
+
+    if args.rebalance:
+        costs = CostModel(args.cost_bps / 1e4, args.fixed_cost)
+        print(f"\n[Rebalance] {args.paths:,} trading-day paths per scenario | {args.cost_bps:g} bps + "
+              f"{args.fixed_cost:g} per rebalance | {args.cash_weight:.0%} cash at {args.cash_rate:.1%}")
+        reb = [r for name, rng in zip(SCENARIOS, spawn_generators(args.seed, len(SCENARIOS)))
+               for r in run_rebalancing(name, args.paths, REBALANCE_RULES, costs, args.cash_weight,
+                                        args.cash_rate, rng, shock)]
+        df = save_summary_csv(reb, None, REPORTS_DIR / "mc_summary_homesec_rebalanced.csv", shock)
+        table = (df.pivot(index="rebalance", columns="scenario", values="mean_return")
+                 .reindex([rule.name for rule in REBALANCE_RULES]))
+        # Probability-weighted expected return of each rule across the scenarios
+        table["weighted"] = pd.Series({rule.name: sum(r["probability"] * r["mean"] for r in reb
+                                                      if r["rebalance"] == rule.name)
+                                       for rule in REBALANCE_RULES})
+        print(table.to_string(float_format=lambda x: f"{x:.2%}"))
+
+    if args.daily:
+        print(f"\n[Daily] {args.paths:,} trading-day paths per scenario | stop-loss {args.stop_loss:.0%}")
+        rows = [run_daily_paths(name, args.paths, args.stop_loss, rng, np.dtype(args.daily_dtype), shock)
+                for name, rng in zip(SCENARIOS, spawn_generators(args.seed, len(SCENARIOS)))]
+        daily = save_path_metrics_csv(rows, REPORTS_DIR / "mc_path_metrics_homesec.csv")
+        print(daily[["scenario", "n_days", "mean_max_drawdown", "p95_max_drawdown",
+                     "mean_time_under_water", "p_stop_breach"]].to_string(index=False))
+
+    if args.term_structure:
+        print(f"\n[Term structure] {args.paths:,} monthly-step paths per scenario "
+              f"→ {', '.join(map(str, DEFAULT_HORIZON_MONTHS))} months")
+        ts = run_term_structure(args.paths, seed=args.seed, shock=shock)
+        ts.round(4).to_csv(REPORTS_DIR / "mc_term_structure.csv", index=False)
+        print(f"  Saved → mc_term_structure.csv")
+        print(ts.pivot(index="horizon_months", columns="scenario", values="mean").to_string(
+            float_format=lambda x: f"{x:.2%}"))
+
+    if args.sensitivity:
+        print(f"\n[Sensitivity] Bump-and-reprice on {args.paths:,} common-random-number paths per scenario")
+        sens = pd.concat([run_sensitivity(name, args.paths, rng, shock=shock)
+                          for name, rng in zip(SCENARIOS, spawn_generators(args.seed, len(SCENARIOS)))],
+                         ignore_index=True)
+        sens.to_csv(REPORTS_DIR / "mc_sensitivity_homesec.csv", index=False)
+        print(f"  Saved → mc_sensitivity_homesec.csv")
+        top = sens[sens["scenario"] == "C_mass_casualty"].head(8)
+        print(top[["parameter", "base_value", "bump", "var_5pct_down", "var_5pct_up",
+                   "d_var_5pct", "d_sharpe"]].to_string(index=False))
+
+    if args.jumps:
+        print(f"\n[Jumps] {args.paths:,} paths per horizon | {args.incident_rate:.2f} incidents/yr "
+              f"(P(≥1 in 90d) = {1 - np.exp(-args.incident_rate / 4):.0%})")
+        jd = run_jump_diffusion(args.paths, seed=args.seed, rate=args.incident_rate, shock=shock)
+        jd.to_csv(REPORTS_DIR / "mc_jump_diffusion_homesec.csv", index=False)
+        print(f"  Saved → mc_jump_diffusion_homesec.csv")
+        print(jd.pivot(index="outcome", columns="horizon_months", values="mean")
+              .reindex(jd["outcome"].unique()).to_string(float_format=lambda x: f"{x:.2%}"))
+
+    if args.reverse_stress is not None:
+        print(f"\n[Reverse stress] portfolio {args.reverse_metric} → {-args.reverse_stress:.0%} | "
+              f"{args.paths:,} common-random-number paths per scenario")
+        rs = pd.DataFrame([run_reverse_stress(name, -args.reverse_stress, args.reverse_metric, args.paths, rng,
+                                              shock)
+                           for name, rng in zip(SCENARIOS, spawn_generators(args.seed, len(SCENARIOS)))])
+        rs.to_csv(REPORTS_DIR / "mc_reverse_stress_homesec.csv", index=False)
+        print(f"  Saved → mc_reverse_stress_homesec.csv")
+        cols = ["scenario", "base_metric", "metric_check", "distance", *[f"return_{sec}" for sec in SECTORS],
+                "corr_shift"]
+        print(rs[cols].to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+
+    if args.historical:
+        store = PriceStore(args.price_store)
+        if args.import_prices:
+            print(f"\n[Prices] Imported {len(store.import_csv(args.import_prices))} tickers into {store.root}")
+        if args.fetch_prices:
+            missing = [tk for tks in SECTOR_TICKERS.values() for tk in tks if tk not in store.tickers]
+            if missing:
+                print(f"\n[Prices] Fetched {len(store.fetch(missing))} tickers into {store.root}")
+        try:
+            returns, groups = historical_returns(store)
+        except FileNotFoundError as exc:
+            parser.error(f"--historical: {exc}; load them with --import-prices CSV or --fetch-prices")
+        print(f"\n[Historical] Block bootstrap of {len(returns):,} days × {returns.shape[1]} tickers | "
+              f"{args.block_days}-day blocks | {args.paths:,} paths per scenario")
+        hist = [run_historical(name, returns, groups, args.paths, rng, args.block_days)
+                for name, rng in zip(SCENARIOS, spawn_generators(args.seed, len(SCENARIOS)))]
+        hist_mean = sum(r["probability"] * r["mean"] for r in hist)
+        save_summary_csv(hist, hist_mean, REPORTS_DIR / "mc_summary_homesec_historical.csv")
+        for p, h in zip(results, hist):
+            print(f"  {h['scenario']}: mean {p['mean']:.2%} → {h['mean']:.2%} | VaR 5% {p['var_5pct']:.2%} "
+                  f"→ {h['var_5pct']:.2%} | worst 1% {p['worst_1pct']:.2%} → {h['worst_1pct']:.2%}")
+
+    if args.factor_model:
+        prices = pd.read_csv(args.factor_model)
+        print(f"\n[Factor model] {prices['ticker'].nunique()} tickers from {args.factor_model.name} | "
+              f"{args.factors} factors | {args.paths:,} paths per scenario")
+        fm = run_factor_model(prices, args.factors, args.paths, args.seed)
+        fm.to_csv(REPORTS_DIR / "mc_factor_model_homesec.csv", index=False)
+        print(f"  Saved → mc_factor_model_homesec.csv")
+        print(fm[fm["level"] != "ticker"].pivot(index="name", columns="scenario", values="var_5pct")
+              .reindex([*SECTORS, "portfolio"]).to_string(float_format=lambda x: f"{x:.2%}"))
 
     print("\n[CSV] Saving summary statistics...")
-    df = save_summary_csv(results, weighted_mean, REPORTS_DIR / "mc_summary_homesec.csv")
+    df = save_summary_csv(results, weighted_mean, REPORTS_DIR / "mc_summary_homesec.csv", shock)
 
     print("\n" + "=" * 60)
     print("SUMMARY")
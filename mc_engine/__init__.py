@@ -0,0 +1,202 @@
+"""
+Shared Monte Carlo engine components for the research simulators.
+
+Used by:
+  geopolitical-investment-research-2026/code/monte_carlo_simulator.py
+  homeland-security-research-2026/code/monte_carlo_homesec.py
+Both scripts put the repository root on sys.path before importing this package.
+
+Submodules load on first use of one of their names (PEP 562 __getattr__):
+`from mc_engine import X` imports only the submodule defining X (and what it
+imports), so process-pool workers, tests and notebooks skip the rest. scipy
+is imported inside the code paths that need it, never at import time.
+"""
+
+import importlib
+
+# Public name → defining submodule
+_SUBMODULES = {
+    "adaptive": ("Tolerances", "ci_half_widths", "run_adaptive"),
+    "bootstrap": ("BOOTSTRAP_METRICS", "DEFAULT_REPLICATES", "bootstrap_metrics"),
+    "cache": ("DEFAULT_MAX_BYTES", "PathCache"),
+    "charts": ("ChartTask", "binned_histogram", "plot_counts", "render_charts"),
+    "factor": (
+        "DEFAULT_FACTORS",
+        "FactorModel",
+        "factor_log_returns",
+        "fit_factor_model",
+        "group_means",
+        "price_log_returns",
+    ),
+    "historical": ("BOOTSTRAP_BLOCK_DAYS", "block_bootstrap"),
+    "jumps": ("JumpClass", "compound_poisson", "expected_jump_growth"),
+    "mixture": ("draw_regimes", "mixture_moments", "mixture_returns", "sample_mixture"),
+    "optimize": ("OptimizationResult", "optimize_cvar", "portfolio_risk"),
+    "parallel": (
+        "default_workers",
+        "run_sharded_paths",
+        "run_sharded_streams",
+        "spawn_generators",
+        "split_paths",
+    ),
+    "paths": (
+        "DEFAULT_HORIZON_MONTHS",
+        "DEFAULT_STOP_LOSS",
+        "MONTHS_PER_YEAR",
+        "TRADING_DAYS",
+        "cumulative_values",
+        "daily_increments",
+        "path_metrics",
+        "summarize_path_metrics",
+        "term_structure",
+        "trading_days",
+    ),
+    "prices": ("PriceStore",),
+    "rebalance": (
+        "DEFAULT_COST_BPS",
+        "CostModel",
+        "RebalanceRule",
+        "rebalanced_values",
+        "summarize_rebalancing",
+    ),
+    "reverse": ("ReverseStressResult", "reverse_stress"),
+    "reweight": ("ScenarioReweighter",),
+    "samplers": ("SAMPLERS", "draw_normals", "mean_estimate"),
+    "sensitivity": ("Bump", "bumped_params", "portfolio_metrics", "sensitivity_table"),
+    "service": ("DEFAULT_PORT", "PathSets", "RiskService", "serve"),
+    "shocks": ("DEFAULT_CAP", "DEFAULT_DF", "SHOCKS", "ShockModel", "clayton_theta"),
+    "sketch": ("KLLSketch",),
+    "streaming": (
+        "DEFAULT_CHUNK_SIZE",
+        "DEFAULT_HIST_BINS",
+        "StreamingStats",
+        "gaussian_bounds",
+        "iter_chunks",
+    ),
+    "stress": (
+        "DEFAULT_EIG_FLOOR",
+        "check_correlation",
+        "correlated_shocks",
+        "correlation_sweep",
+        "nearest_correlation",
+        "stress_correlations",
+    ),
+    "sweep": ("dirichlet_weights", "evaluate_weights", "simplex_grid"),
+    "tail": (
+        "effective_sample_size",
+        "expected_shortfall",
+        "shift_weights",
+        "shifted_normals",
+        "weighted_moments",
+        "weighted_quantile",
+    ),
+}
+_LAZY = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value   # cache: later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+__all__ = [
+    "BOOTSTRAP_BLOCK_DAYS",
+    "BOOTSTRAP_METRICS",
+    "Bump",
+    "ChartTask",
+    "CostModel",
+    "DEFAULT_CAP",
+    "DEFAULT_CHUNK_SIZE",
+    "DEFAULT_COST_BPS",
+    "DEFAULT_DF",
+    "DEFAULT_EIG_FLOOR",
+    "DEFAULT_FACTORS",
+    "DEFAULT_HIST_BINS",
+    "DEFAULT_HORIZON_MONTHS",
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_PORT",
+    "DEFAULT_REPLICATES",
+    "DEFAULT_STOP_LOSS",
+    "FactorModel",
+    "JumpClass",
+    "KLLSketch",
+    "MONTHS_PER_YEAR",
+    "OptimizationResult",
+    "PathCache",
+    "PathSets",
+    "PriceStore",
+    "RebalanceRule",
+    "ReverseStressResult",
+    "RiskService",
+    "SAMPLERS",
+    "SHOCKS",
+    "ScenarioReweighter",
+    "ShockModel",
+    "StreamingStats",
+    "TRADING_DAYS",
+    "Tolerances",
+    "binned_histogram",
+    "block_bootstrap",
+    "bootstrap_metrics",
+    "bumped_params",
+    "check_correlation",
+    "ci_half_widths",
+    "clayton_theta",
+    "compound_poisson",
+    "correlated_shocks",
+    "correlation_sweep",
+    "cumulative_values",
+    "daily_increments",
+    "default_workers",
+    "dirichlet_weights",
+    "draw_normals",
+    "draw_regimes",
+    "effective_sample_size",
+    "evaluate_weights",
+    "expected_jump_growth",
+    "expected_shortfall",
+    "factor_log_returns",
+    "fit_factor_model",
+    "gaussian_bounds",
+    "group_means",
+    "iter_chunks",
+    "mean_estimate",
+    "mixture_moments",
+    "mixture_returns",
+    "nearest_correlation",
+    "optimize_cvar",
+    "path_metrics",
+    "plot_counts",
+    "portfolio_metrics",
+    "portfolio_risk",
+    "price_log_returns",
+    "rebalanced_values",
+    "render_charts",
+    "reverse_stress",
+    "run_adaptive",
+    "run_sharded_paths",
+    "run_sharded_streams",
+    "sample_mixture",
+    "sensitivity_table",
+    "serve",
+    "shift_weights",
+    "shifted_normals",
+    "simplex_grid",
+    "spawn_generators",
+    "split_paths",
+    "stress_correlations",
+    "summarize_path_metrics",
+    "summarize_rebalancing",
+    "term_structure",
+    "trading_days",
+    "weighted_moments",
+    "weighted_quantile",
+]
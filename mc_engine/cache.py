@@ -0,0 +1,146 @@
+"""
+Content-addressed on-disk cache for simulated path arrays.
+
+An entry's key is the SHA-256 of everything that determines the draws: the
+model parameters (μ, σ, correlation, horizon), the path count, the sampler
+and the RNG state *before* drawing. Entries are plain ``<key>.npy`` files
+(loaded memory-mapped, so a hit costs milliseconds regardless of size) plus
+a ``<key>.json`` sidecar holding the RNG state *after* drawing. A hit
+restores that state, so everything downstream of the cached draw sees the
+same stream as an uncached run and outputs stay bit-identical.
+
+The cache is bounded by total size; when a store pushes it over max_bytes the
+least recently used entries (by file mtime, refreshed on every hit) are
+evicted first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+RngLike = np.random.Generator | None   # None → legacy global np.random stream
+
+
+def rng_state(rng: RngLike) -> dict:
+    """JSON-serializable state of a Generator (or of the global stream when None)."""
+    if rng is not None:
+        return rng.bit_generator.state
+    state = np.random.get_state(legacy=False)
+    return {**state, "state": {"key": state["state"]["key"].tolist(), "pos": state["state"]["pos"]}}
+
+
+def set_rng_state(rng: RngLike, state: dict) -> None:
+    if rng is not None:
+        rng.bit_generator.state = state
+        return
+    inner = {"key": np.asarray(state["state"]["key"], dtype=np.uint32), "pos": state["state"]["pos"]}
+    np.random.set_state({**state, "state": inner})
+
+
+class PathCache:
+    """Directory of content-addressed .npy entries with LRU size-based eviction."""
+
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(*parts) -> str:
+        """SHA-256 over arrays (dtype, shape, bytes) and JSON-able scalars/dicts."""
+        h = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                arr = np.ascontiguousarray(part)
+                h.update(f"nd:{arr.dtype.str}:{arr.shape}".encode())
+                h.update(arr.tobytes())
+            else:
+                h.update(json.dumps(part, sort_keys=True, default=_json_default).encode())
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    def load(self, key: str) -> tuple[np.ndarray, dict] | None:
+        """(memory-mapped array, metadata) for key, or None on a miss."""
+        data, meta = self._paths(key)
+        try:
+            arr = np.load(data, mmap_mode="r")
+            info = json.loads(meta.read_text())
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        for p in (data, meta):
+            os.utime(p)   # mark as recently used
+        return arr, info
+
+    def store(self, key: str, arr: np.ndarray, meta: dict | None = None) -> np.ndarray:
+        """Write arr (atomically) under key, then evict down to max_bytes."""
+        data, meta_path = self._paths(key)
+        tmp = data.with_name(f"{data.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, arr)
+        os.replace(tmp, data)
+        meta_path.write_text(json.dumps(meta or {}, default=_json_default))
+        self.evict(keep=key)
+        return arr
+
+    def get_or_simulate(self, parts: tuple, simulate: Callable[[], np.ndarray],
+                        rng: RngLike = None) -> np.ndarray:
+        """
+        Cached simulate() keyed by parts + the current state of rng. On a hit
+        rng is advanced to where simulate() would have left it.
+        """
+        key = self.key(*parts, rng_state(rng))
+        hit = self.load(key)
+        if hit is not None:
+            arr, meta = hit
+            set_rng_state(rng, meta["rng_state"])
+            return arr
+        return self.store(key, simulate(), {"rng_state": rng_state(rng)})
+
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self._files())
+
+    def evict(self, keep: str | None = None) -> int:
+        """Drop least recently used entries until total size ≤ max_bytes; returns count."""
+        entries = {}
+        for p in self._files():
+            st = p.stat()
+            size, last = entries.get(p.stem, (0, 0.0))
+            entries[p.stem] = (size + st.st_size, max(last, st.st_mtime))
+        total = sum(size for size, _ in entries.values())
+        evicted = 0
+        for key, (size, _) in sorted(entries.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            for p in self._paths(key):
+                p.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        for p in self._files():
+            p.unlink(missing_ok=True)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.root / f"{key}.npy", self.root / f"{key}.json"
+
+    def _files(self) -> list[Path]:
+        return [p for p in self.root.iterdir()
+                if p.suffix in (".npy", ".json") and ".tmp" not in p.suffixes]
+
+
+def _json_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"cannot hash {type(obj).__name__} into a cache key")
@@ -0,0 +1,60 @@
+"""
+Chart rendering from pre-binned histograms, one process per chart.
+
+Charts never see the raw paths. Engines hand over (counts, edges) pairs:
+np.histogram of in-memory returns (the bars ax.hist would draw from them)
+or StreamingStats.histogram, whose fine fixed-bin counts are updated chunk
+by chunk. Every PNG is then a task fn(*args) that draws those counts; tasks
+run in a process pool on the Agg backend, so all charts of a run render in
+parallel and only a few kB of counts are pickled per chart.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+import numpy as np
+
+from mc_engine.parallel import default_workers
+from mc_engine.streaming import StreamingStats
+
+# (render function, its positional args)
+ChartTask = tuple[Callable, tuple]
+
+
+def binned_histogram(source: np.ndarray | StreamingStats, bins: int,
+                     weights: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """(counts, edges) with `bins` bars: np.histogram of returns, or a coarsened StreamingStats histogram."""
+    if isinstance(source, StreamingStats):
+        return source.histogram(bins)
+    return np.histogram(source, bins=bins, weights=weights)
+
+
+def plot_counts(ax, counts: np.ndarray, edges: np.ndarray, scale: float = 1.0, **kwargs):
+    """ax.hist of pre-binned counts (edges multiplied by scale, e.g. 100 for %)."""
+    return ax.hist(edges[:-1] * scale, bins=edges * scale, weights=counts, **kwargs)
+
+
+def _use_agg() -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render(fn: Callable, args: tuple):
+    _use_agg()
+    return fn(*args)
+
+
+def render_charts(tasks: list[ChartTask], workers: int | None = None) -> list:
+    """
+    fn(*args) for every task on the Agg backend, results in task order.
+    workers=None uses one process per task (up to the CPU count); with one
+    worker or one task everything renders in this process.
+    """
+    workers = min(len(tasks), workers or default_workers())
+    if workers <= 1:
+        return [_render(fn, args) for fn, args in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_use_agg) as pool:
+        futures = [pool.submit(fn, *args) for fn, args in tasks]
+        return [f.result() for f in futures]
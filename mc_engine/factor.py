@@ -0,0 +1,96 @@
+"""
+Low-rank factor model for per-ticker simulation of large universes.
+
+Annualized log-returns of n tickers have covariance
+
+    Σ = B Bᵀ + diag(idio_var)      B: (n, k) factor loadings, k ≪ n
+
+fit_factor_model takes B from the top k principal components of the
+demeaned return history: a thin SVD of the (T, n) matrix, so Σ is never
+formed. idio_var is the variance the factors leave unexplained per ticker.
+factor_log_returns draws k factor and n idiosyncratic normals per path:
+
+    x = √t · (f Bᵀ + e · √idio_var)     f ~ N(0, I_k), e ~ N(0, I_n)
+
+That is O(n_paths · n · k) work instead of the O(n³) Cholesky and
+O(n_paths · n²) product of a dense covariance. group_means aggregates
+ticker returns to sectors (equal weight within each group).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from mc_engine.paths import TRADING_DAYS
+
+DEFAULT_FACTORS = 3
+
+# Idiosyncratic variance floor (annualized) for names fully explained by the factors
+_IDIO_FLOOR = 1e-8
+
+
+@dataclass(frozen=True)
+class FactorModel:
+    """Annualized log-return covariance B Bᵀ + diag(idio_var) over tickers."""
+    tickers: tuple
+    loadings: np.ndarray   # (n, k)
+    idio_var: np.ndarray   # (n,)
+
+    @property
+    def vols(self) -> np.ndarray:
+        """Total annualized volatility per ticker."""
+        return np.sqrt((self.loadings**2).sum(axis=1) + self.idio_var)
+
+    def covariance(self) -> np.ndarray:
+        """Dense (n, n) covariance (for checks on small universes)."""
+        return self.loadings @ self.loadings.T + np.diag(self.idio_var)
+
+    def scaled(self, vol_scalar: float) -> "FactorModel":
+        """Same correlation structure with every volatility multiplied by vol_scalar."""
+        return FactorModel(self.tickers, self.loadings * vol_scalar, self.idio_var * vol_scalar**2)
+
+
+def price_log_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    (T, n) daily log-returns, one column per ticker, from long-format prices
+    (date, ticker, close). Only dates with a close for every ticker are kept.
+    """
+    wide = prices.pivot_table(index="date", columns="ticker", values="close").sort_index()
+    return np.log(wide).diff().dropna(how="any")
+
+
+def fit_factor_model(log_returns: pd.DataFrame, n_factors: int = DEFAULT_FACTORS,
+                     periods_per_year: int = TRADING_DAYS) -> FactorModel:
+    """Statistical (PCA) factor model of per-period log-returns (T, n), annualized."""
+    X = np.asarray(log_returns, dtype=np.float64)
+    T, n = X.shape
+    if not 0 < n_factors < min(T, n):
+        raise ValueError(f"n_factors must be in [1, {min(T, n) - 1}] for {T} periods × {n} tickers, "
+                         f"got {n_factors}")
+    X = (X - X.mean(axis=0)) * np.sqrt(periods_per_year / (T - 1))
+    _, s, Vt = np.linalg.svd(X, full_matrices=False)
+    B = Vt[:n_factors].T * s[:n_factors]
+    idio = np.maximum((X**2).sum(axis=0) - (B**2).sum(axis=1), _IDIO_FLOOR)
+    return FactorModel(tuple(log_returns.columns), B, idio)
+
+
+def factor_log_returns(model: FactorModel, n_paths: int, t: float,
+                       rng: np.random.Generator | None = None) -> np.ndarray:
+    """(n_paths, n) zero-mean log-return diffusion over horizon t (rng=None → global stream)."""
+    n, k = model.loadings.shape
+    normals = rng.standard_normal if rng is not None else np.random.standard_normal
+    F = normals((n_paths, k))
+    E = normals((n_paths, n))
+    E *= np.sqrt(model.idio_var)
+    E += F @ model.loadings.T
+    E *= np.sqrt(t)
+    return E
+
+
+def group_means(x: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """(n_paths, n_groups) equal-weight mean of the columns of x (n_paths, n) in each group."""
+    onehot = np.asarray(groups)[:, None] == np.arange(n_groups)
+    return x @ (onehot / onehot.sum(axis=0))
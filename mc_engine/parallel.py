@@ -0,0 +1,137 @@
+"""
+Process-pool execution of Monte Carlo jobs split into path shards.
+
+Every job (typically one scenario) is split into `workers` shards. Each shard
+gets its own numpy Generator from ``SeedSequence(seed).spawn(workers)``, so a
+run is bit-reproducible for a given (seed, workers) pair regardless of
+scheduling. All shards of all jobs go into one pool, so scenarios and paths
+are spread over the cores together.
+
+Two modes:
+  run_sharded_paths   — shards write their draws straight into a
+                        shared-memory buffer per job (no pickling of paths)
+  run_sharded_streams — shards fold their draws into mergeable accumulators
+                        (StreamingStats) which are merged in the parent
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Hashable
+
+import numpy as np
+
+SeedLike = int | np.random.SeedSequence
+
+# job key → (n_paths, seed, extra args passed to the sample / stream function)
+Jobs = dict[Hashable, tuple[int, SeedLike, tuple]]
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def spawn_generators(seed: SeedLike, n: int) -> list[np.random.Generator]:
+    """n independent Generator streams derived from one seed."""
+    return [np.random.default_rng(s) for s in _seed_sequence(seed).spawn(n)]
+
+
+def split_paths(n_paths: int, n_shards: int) -> list[tuple[int, int]]:
+    """(offset, count) for each shard; counts differ by at most one."""
+    base, extra = divmod(int(n_paths), n_shards)
+    out, offset = [], 0
+    for i in range(n_shards):
+        count = base + (1 if i < extra else 0)
+        out.append((offset, count))
+        offset += count
+    return out
+
+
+def _seed_sequence(seed: SeedLike) -> np.random.SeedSequence:
+    return seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+
+def _shards(jobs: Jobs, workers: int):
+    for key, (n_paths, seed, args) in jobs.items():
+        seqs = _seed_sequence(seed).spawn(workers)
+        for (offset, count), seq in zip(split_paths(n_paths, workers), seqs):
+            if count:
+                yield key, offset, count, seq, args
+
+
+# ---------------------------------------------------------------------------
+# Shared-memory path buffers
+# ---------------------------------------------------------------------------
+
+def _fill_shard(sample_fn, shm_name, shape, offset, count, seq, args):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        out[offset:offset + count] = sample_fn(np.random.default_rng(seq), count, *args)
+    finally:
+        shm.close()
+
+
+def run_sharded_paths(sample_fn: Callable, jobs: Jobs, workers: int,
+                      width: int | dict[Hashable, int] | None = None) -> dict[Hashable, np.ndarray]:
+    """
+    Run sample_fn(rng, count, *args) → array of shape (count,) or (count, width)
+    for every shard and return the assembled per-job arrays. width may be a
+    per-job mapping when jobs produce different column counts.
+    """
+    buffers, shapes = {}, {}
+    try:
+        for key, (n_paths, _, _) in jobs.items():
+            w = width.get(key) if isinstance(width, dict) else width
+            shapes[key] = (n_paths,) if w is None else (n_paths, w)
+            nbytes = max(8, int(np.prod(shapes[key])) * 8)
+            buffers[key] = shared_memory.SharedMemory(create=True, size=nbytes)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_fill_shard, sample_fn, buffers[key].name, shapes[key],
+                            offset, count, seq, args)
+                for key, offset, count, seq, args in _shards(jobs, workers)
+            ]
+            for f in futures:
+                f.result()
+
+        return {
+            key: np.ndarray(shapes[key], dtype=np.float64, buffer=buffers[key].buf).copy()
+            for key in jobs
+        }
+    finally:
+        for shm in buffers.values():
+            shm.close()
+            shm.unlink()
+
+
+# ---------------------------------------------------------------------------
+# Mergeable accumulators
+# ---------------------------------------------------------------------------
+
+def _stream_shard(stream_fn, count, seq, args):
+    return stream_fn(np.random.default_rng(seq), count, *args)
+
+
+def run_sharded_streams(stream_fn: Callable, jobs: Jobs, workers: int) -> dict[Hashable, list]:
+    """
+    Run stream_fn(rng, count, *args) → list of accumulators for every shard
+    and merge shard results element-wise (in shard order) per job.
+    """
+    merged: dict[Hashable, list] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            (key, pool.submit(_stream_shard, stream_fn, count, seq, args))
+            for key, _, count, seq, args in _shards(jobs, workers)
+        ]
+        for key, f in futures:
+            accs = f.result()
+            if key not in merged:
+                merged[key] = accs
+            else:
+                for acc, other in zip(merged[key], accs):
+                    acc.merge(other)
+    return merged
@@ -0,0 +1,151 @@
+"""
+Multi-step (trading-day) path simulation and path-dependent risk metrics.
+
+Arrays are time-major: increments are (n_days, n_paths, n_sectors) and
+value paths (n_days + 1, n_paths), so every per-day operation (cumulative
+sum, running maximum, drawdown) is a contiguous reduction along axis 0. The
+default dtype is float32. 10k paths × 504 days × 4 sectors is then ~80 MB of
+increments, and the normals are drawn in day blocks so no float64 copy of the
+full array is ever held.
+
+term_structure reads every horizon off one set of value paths (e.g. monthly
+steps to 24 months), so horizons share their shocks and are directly
+comparable instead of each coming from its own independent simulation.
+
+Metrics per path (values relative to the starting value 1):
+  max_drawdown        max_t (1 − V_t / max_{s≤t} V_s)
+  time_under_water    fraction of days strictly below the running peak
+  longest_underwater  longest run of consecutive underwater days
+  breach              min_t V_t ≤ 1 − stop_loss (stop-loss hit at any close)
+  days_to_breach      first breach day (−1 when never breached)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from mc_engine.shocks import ShockModel
+
+TRADING_DAYS = 252
+DEFAULT_BLOCK_DAYS = 32
+DEFAULT_STOP_LOSS = 0.20
+MONTHS_PER_YEAR = 12
+DEFAULT_HORIZON_MONTHS = (1, 3, 6, 12, 18, 24)
+
+# Drawdowns below this count as back at the peak (float32 round-off)
+_UNDERWATER_TOL = 1e-6
+
+
+def trading_days(t_years: float) -> int:
+    return max(1, int(round(t_years * TRADING_DAYS)))
+
+
+def daily_increments(n_paths: int, n_days: int, drifts, chols, labels: np.ndarray | None = None,
+                     shock: ShockModel = ShockModel(), rng: np.random.Generator | None = None,
+                     dtype=np.float32, block_days: int = DEFAULT_BLOCK_DAYS) -> np.ndarray:
+    """
+    (n_days, n_paths, d) per-day increments drifts[k] + shock.correlate(z, chols[k])
+    for each path's regime k. A single (d,) drift / (d, d) factor means one
+    regime; labels (n_paths,) assigns regimes otherwise. rng=None → global stream.
+    """
+    drifts = np.atleast_2d(np.asarray(drifts, dtype=np.float64))
+    chols = np.asarray(chols, dtype=np.float64)
+    chols = chols[None] if chols.ndim == 2 else chols
+    d = drifts.shape[1]
+    groups = ([np.arange(n_paths)] if labels is None
+              else [np.flatnonzero(labels == k) for k in range(len(drifts))])
+
+    out = np.empty((n_days, n_paths, d), dtype=dtype)
+    for start in range(0, n_days, block_days):
+        b = min(block_days, n_days - start)
+        Z = rng.standard_normal((b, n_paths, d)) if rng is not None else \
+            np.random.standard_normal((b, n_paths, d))
+        for k, idx in enumerate(groups):
+            if idx.size:
+                z = Z[:, idx].reshape(-1, d)
+                step = drifts[k] + shock.correlate(z, chols[k], rng)
+                out[start:start + b, idx] = step.reshape(b, idx.size, d)
+    return out
+
+
+def cumulative_values(increments: np.ndarray, weights: np.ndarray, log: bool = True) -> np.ndarray:
+    """
+    (n_days + 1, n_paths) buy-and-hold portfolio values starting at 1.
+
+    log=True treats increments as log-returns (V = Σ_i w_i exp(Σ_t x_it));
+    log=False as simple-return increments of an arithmetic model
+    (V = 1 + Σ_i w_i Σ_t x_it). increments is overwritten in place.
+    """
+    np.cumsum(increments, axis=0, out=increments)
+    if log:
+        np.exp(increments, out=increments)
+        values = increments @ weights.astype(increments.dtype)
+    else:
+        values = 1 + increments @ weights.astype(increments.dtype)
+    return np.concatenate([np.ones((1, values.shape[1]), dtype=values.dtype), values])
+
+
+def path_metrics(values: np.ndarray, stop_loss: float | None = None) -> dict[str, np.ndarray]:
+    """Per-path drawdown / underwater / stop-loss metrics of time-major values (T + 1, n)."""
+    peak = np.maximum.accumulate(values, axis=0)
+    drawdown = 1 - values / peak
+    underwater = drawdown > _UNDERWATER_TOL
+    t = np.arange(values.shape[0], dtype=np.int32)[:, None]
+    # Last at-peak day up to t; the gap to t is the current underwater run length
+    last_peak = np.maximum.accumulate(np.where(underwater, np.int32(0), t), axis=0)
+    out = {
+        "max_drawdown": drawdown.max(axis=0),
+        "time_under_water": underwater[1:].mean(axis=0),
+        "longest_underwater": (t - last_peak).max(axis=0),
+    }
+    if stop_loss is not None:
+        hit = values <= 1 - stop_loss
+        out["breach"] = hit.any(axis=0)
+        out["days_to_breach"] = np.where(out["breach"], hit.argmax(axis=0), -1)
+    return out
+
+
+def summarize_path_metrics(metrics: dict[str, np.ndarray]) -> dict[str, float]:
+    """Scalar summary of path_metrics output across paths."""
+    mdd = metrics["max_drawdown"]
+    out = {
+        "mean_max_drawdown": float(mdd.mean()),
+        "median_max_drawdown": float(np.median(mdd)),
+        "p95_max_drawdown": float(np.percentile(mdd, 95)),
+        "mean_time_under_water": float(metrics["time_under_water"].mean()),
+        "mean_longest_underwater_days": float(metrics["longest_underwater"].mean()),
+    }
+    if "breach" in metrics:
+        breach = metrics["breach"]
+        out["p_stop_breach"] = float(breach.mean())
+        out["median_days_to_breach"] = (float(np.median(metrics["days_to_breach"][breach]))
+                                        if breach.any() else float("nan"))
+    return out
+
+
+def term_structure(values: np.ndarray, steps, var_q: float = 0.05) -> list[dict[str, float]]:
+    """
+    Risk metrics of the return V_h − 1 at each step count h in steps, all
+    from the same time-major value paths (T + 1, n): mean, median, std,
+    p_profit, var (the var_q quantile), cvar (mean below it), worst_1pct and
+    the mean / p95 max drawdown up to h.
+    """
+    peak = np.maximum.accumulate(values, axis=0)
+    mdd_to_date = np.maximum.accumulate(1 - values / peak, axis=0)
+    rows = []
+    for h in steps:
+        r = values[h].astype(np.float64) - 1
+        median, var, worst = np.quantile(r, [0.5, var_q, 0.01])
+        rows.append({
+            "step": int(h),
+            "mean": float(r.mean()),
+            "median": float(median),
+            "std": float(r.std()),
+            "p_profit": float((r > 0).mean()),
+            "var": float(var),
+            "cvar": float(r[r <= var].mean()),
+            "worst_1pct": float(worst),
+            "mean_max_drawdown": float(mdd_to_date[h].mean()),
+            "p95_max_drawdown": float(np.percentile(mdd_to_date[h], 95)),
+        })
+    return rows
@@ -0,0 +1,75 @@
+"""
+Local store of daily closing prices for the historical simulators.
+
+One ``<TICKER>.csv`` (date, close) per ticker in a directory, so the store
+is diffable and can be filled by hand, from the repo's long-format price
+files (date, ticker, close), or from Yahoo Finance via yfinance (optional,
+imported only by fetch). log_returns aligns the requested tickers on their
+common dates and returns the daily log-returns as one C-contiguous float32
+(T, n) matrix, the layout the block bootstrap gathers from.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class PriceStore:
+    """Directory of daily closes, one <TICKER>.csv (date, close) per ticker."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    @property
+    def tickers(self) -> list[str]:
+        return sorted(p.stem for p in self.root.glob("*.csv"))
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker}.csv"
+
+    def write(self, closes: pd.DataFrame) -> None:
+        """Merge wide closes (index date, one column per ticker) into the store; new dates win."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        for ticker in closes.columns:
+            new = closes[ticker].dropna()
+            new.index = pd.to_datetime(new.index)
+            path = self._path(ticker)
+            if path.exists():
+                old = pd.read_csv(path, index_col="date", parse_dates=True)["close"]
+                new = pd.concat([old[~old.index.isin(new.index)], new])
+            new.sort_index().rename("close").rename_axis("date").to_csv(path, date_format="%Y-%m-%d")
+
+    def read(self, tickers: list[str]) -> pd.DataFrame:
+        """Wide closes of tickers on the dates where all of them have a close."""
+        missing = [t for t in tickers if not self._path(t).exists()]
+        if missing:
+            raise FileNotFoundError(f"no prices for {missing} in {self.root} "
+                                    "(add them with PriceStore.import_csv or PriceStore.fetch)")
+        cols = {t: pd.read_csv(self._path(t), index_col="date", parse_dates=True)["close"] for t in tickers}
+        return pd.DataFrame(cols).dropna(how="any").sort_index()
+
+    def import_csv(self, csv_path: str | Path) -> list[str]:
+        """Add a long-format price file (date, ticker, close); returns the tickers written."""
+        prices = pd.read_csv(csv_path)
+        wide = prices.pivot_table(index="date", columns="ticker", values="close")
+        self.write(wide)
+        return list(wide.columns)
+
+    def fetch(self, tickers: list[str], start: str = "2015-01-01") -> list[str]:
+        """Download daily closes from Yahoo Finance (needs yfinance); returns the tickers written."""
+        import yfinance as yf
+
+        data = yf.download(list(tickers), start=start, auto_adjust=True, progress=False)["Close"]
+        closes = data.to_frame(tickers[0]) if isinstance(data, pd.Series) else data
+        closes = closes.dropna(axis=1, how="all")
+        self.write(closes)
+        return list(closes.columns)
+
+    def log_returns(self, tickers: list[str]) -> tuple[pd.DatetimeIndex, np.ndarray]:
+        """(dates, (T, n) C-contiguous float32 daily log-returns) over the common dates of tickers."""
+        closes = self.read(tickers)
+        returns = np.diff(np.log(closes.to_numpy(dtype=np.float64)), axis=0)
+        return closes.index[1:], np.ascontiguousarray(returns, dtype=np.float32)
@@ -0,0 +1,110 @@
+"""
+Scenario-probability reweighting of already simulated path sets.
+
+With per-scenario portfolio returns x_s (n_s paths each) the mixture under
+probabilities p puts weight p_s / n_s on every path of scenario s, so any
+probability vector is evaluated from the same paths without resimulating:
+
+  mean, std, P(profit)   closed form from per-scenario moments
+  quantiles              weighted quantiles over the pooled, once-sorted paths
+  CVaR                   weighted tail mean from per-scenario cumulative sums
+
+Quantiles follow mc_engine.weighted_quantile (midpoint cumulative weights,
+linear interpolation). Because the pooled paths are sorted once and their
+per-scenario cumulative counts stored, the cumulative weight at any index is
+a dot product with p_s / n_s; each quantile is then a bisection over the
+index run for all probability vectors together (~log2 N steps of O(G·S)),
+and a whole simplex grid costs about as much as one sort. Paths of
+zero-probability scenarios are dropped (vectors are grouped by support), so
+the edges of the simplex are exact.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+class ScenarioReweighter:
+    """Mixture risk metrics of fixed per-scenario path sets for any scenario probabilities."""
+
+    def __init__(self, scenario_returns: list[np.ndarray], labels: list[str] | None = None):
+        self._arrays = [np.asarray(r, dtype=np.float64).ravel() for r in scenario_returns]
+        self.labels = list(labels) if labels is not None else [f"s{i}" for i in range(len(self._arrays))]
+        self.sizes = np.array([a.size for a in self._arrays])
+        self._mean = np.array([a.mean() for a in self._arrays])
+        self._second = np.array([np.mean(a**2) for a in self._arrays])
+        self._p_profit = np.array([(a > 0).mean() for a in self._arrays])
+        self._pooled_cache = {}
+
+    def evaluate(self, probabilities, var_q: float = 0.05) -> pd.DataFrame:
+        """
+        One row per probability vector (rows of probabilities, renormalized):
+        the probabilities, then mean, std, p_profit, median, var (var_q
+        quantile), worst_1pct and cvar (mean at or below var).
+        """
+        P = np.atleast_2d(np.asarray(probabilities, dtype=np.float64))
+        if P.shape[1] != len(self.sizes):
+            raise ValueError(f"probabilities have {P.shape[1]} columns, expected {len(self.sizes)}")
+        if (P < 0).any() or not (P.sum(axis=1) > 0).all():
+            raise ValueError("probabilities must be non-negative with a positive sum per row")
+        P = P / P.sum(axis=1, keepdims=True)
+
+        mean = P @ self._mean
+        quantiles = np.empty((len(P), 3))
+        cvar = np.empty(len(P))
+        supports = P > 0
+        for support in np.unique(supports, axis=0):
+            rows = np.flatnonzero((supports == support).all(axis=1))
+            cols = np.flatnonzero(support)
+            pw = P[np.ix_(rows, cols)] / self.sizes[cols]   # per-path weight of each scenario
+            x, sid, counts, sums = self._pooled(tuple(cols))
+            for j, q in enumerate((0.50, var_q, 0.01)):
+                quantiles[rows, j] = _bisect_quantile(q, x, sid, counts, pw)
+            k = np.searchsorted(x, quantiles[rows, 1], side="right")
+            tail_w = np.einsum("gs,gs->g", counts[k - 1], pw)
+            tail_x = np.einsum("gs,gs->g", sums[k - 1], pw)
+            cvar[rows] = np.where(k > 0, tail_x / np.where(k > 0, tail_w, 1.0), quantiles[rows, 1])
+
+        df = pd.DataFrame(P, columns=self.labels)
+        df["mean"] = mean
+        df["std"] = np.sqrt(np.maximum(P @ self._second - mean**2, 0.0))
+        df["p_profit"] = P @ self._p_profit
+        df["median"], df["var"], df["worst_1pct"] = quantiles.T
+        df["cvar"] = cvar
+        return df
+
+    def _pooled(self, cols: tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Sorted pooled returns of scenarios cols, their scenario index, per-scenario cumulative counts and sums."""
+        if cols not in self._pooled_cache:
+            x = np.concatenate([self._arrays[c] for c in cols])
+            sid = np.repeat(np.arange(len(cols)), self.sizes[list(cols)])
+            order = np.argsort(x, kind="stable")
+            x, sid = x[order], sid[order]
+            onehot = sid[:, None] == np.arange(len(cols))
+            self._pooled_cache[cols] = (x, sid, np.cumsum(onehot, axis=0, dtype=np.int32),
+                                        np.cumsum(onehot * x[:, None], axis=0))
+        return self._pooled_cache[cols]
+
+
+def _bisect_quantile(q: float, x: np.ndarray, sid: np.ndarray, counts: np.ndarray,
+                     pw: np.ndarray) -> np.ndarray:
+    """q-quantile for every weight row of pw, by bisection on the midpoint cumulative weight."""
+    g = np.arange(len(pw))
+    n = len(x)
+
+    def midpoint_cdf(i):
+        return np.einsum("gs,gs->g", counts[i], pw) - 0.5 * pw[g, sid[i]]
+
+    lo = np.full(len(pw), -1)   # last index with midpoint cdf ≤ q (−1: none)
+    hi = np.full(len(pw), n)
+    while (hi - lo > 1).any():
+        active = hi - lo > 1
+        mid = (lo + hi) // 2
+        below = midpoint_cdf(np.clip(mid, 0, n - 1)) <= q
+        lo = np.where(active & below, mid, lo)
+        hi = np.where(active & ~below, mid, hi)
+    left, right = np.clip(lo, 0, n - 1), np.clip(lo + 1, 0, n - 1)
+    c_left, c_right = midpoint_cdf(left), midpoint_cdf(right)
+    frac = np.divide(q - c_left, c_right - c_left, out=np.zeros(len(pw)), where=c_right > c_left)
+    return np.where(lo < 0, x[0], np.where(lo >= n - 1, x[-1], x[left] + np.clip(frac, 0, 1) * (x[right] - x[left])))
@@ -0,0 +1,89 @@
+"""
+Bump-and-reprice sensitivities with common random numbers (CRN).
+
+Every bumped parameter set is priced against the *same* standard-normal
+draws, so the finite difference (m(θ + h) − m(θ − h)) / 2h measures the
+parameter's effect instead of the Monte Carlo noise between two independent
+runs — the noise largely cancels and even 10k paths give stable signs and
+rankings.
+
+The base set and the down/up pair of every bump are stacked along a leading
+axis (1 + 2B parameter sets) so the caller reprices them in one batched pass
+and portfolio_metrics reduces all (1 + 2B, n_paths) returns at once.
+sensitivity_table turns the result into a tornado table: one row per bump,
+sorted by the swing of the chosen metric.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Bump:
+    """Central-difference bump of one element of a parameter array by ±size."""
+    name: str
+    key: str
+    index: tuple
+    size: float
+    symmetric: bool = False   # also bump the transposed element (correlation matrices)
+
+
+def bumped_params(base: dict[str, np.ndarray], bumps: list[Bump]) -> dict[str, np.ndarray]:
+    """
+    Stacked parameter sets (1 + 2B, *shape) per key: row 0 is base, rows
+    1 + 2b and 2 + 2b are bump b down and up.
+    """
+    n = 1 + 2 * len(bumps)
+    out = {k: np.repeat(np.asarray(v, dtype=np.float64)[None], n, axis=0) for k, v in base.items()}
+    for b, bump in enumerate(bumps):
+        arr = out[bump.key]
+        for row, sign in ((1 + 2 * b, -1.0), (2 + 2 * b, 1.0)):
+            arr[(row, *bump.index)] += sign * bump.size
+            if bump.symmetric:
+                arr[(row, *bump.index[::-1])] += sign * bump.size
+    return out
+
+
+def portfolio_metrics(port: np.ndarray, var_q: float = 0.05,
+                      sharpe_scale: float = 1.0) -> dict[str, np.ndarray]:
+    """Row-wise mean, std, p_profit, var (var_q quantile), cvar and sharpe of (P, n) returns."""
+    mean = port.mean(axis=1)
+    std = port.std(axis=1)
+    var = np.quantile(port, var_q, axis=1)
+    tail = port <= var[:, None]
+    return {
+        "mean": mean,
+        "std": std,
+        "p_profit": (port > 0).mean(axis=1),
+        "var": var,
+        "cvar": (port * tail).sum(axis=1) / tail.sum(axis=1),
+        "sharpe": np.divide(mean, std, out=np.zeros_like(std), where=std > 0) * sharpe_scale,
+    }
+
+
+def sensitivity_table(metrics: dict[str, np.ndarray], bumps: list[Bump], base: dict[str, np.ndarray],
+                      sort_by: str = "var") -> pd.DataFrame:
+    """
+    Tornado table from metrics over the bumped_params rows: per bump the
+    parameter's base value and size, then for every metric its base, down, up
+    values and the central-difference derivative d_<metric> = (up − down) / 2h.
+    Rows are sorted by |swing| (up − down) of sort_by, largest first.
+    """
+    rows = []
+    for b, bump in enumerate(bumps):
+        row = {"parameter": bump.name, "base_value": float(np.asarray(base[bump.key])[bump.index]),
+               "bump": bump.size}
+        for k, v in metrics.items():
+            down, up = v[1 + 2 * b], v[2 + 2 * b]
+            row[f"{k}_base"] = float(v[0])
+            row[f"{k}_down"] = float(down)
+            row[f"{k}_up"] = float(up)
+            row[f"d_{k}"] = float((up - down) / (2 * bump.size))
+        row["swing"] = row[f"{sort_by}_up"] - row[f"{sort_by}_down"]
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    return df.reindex(df["swing"].abs().sort_values(ascending=False).index).reset_index(drop=True)
@@ -0,0 +1,225 @@
+"""
+In-memory risk service: what-if portfolio metrics from resident path sets.
+
+A full simulator run pays for calibration, simulation and charts on every
+question. RiskService instead holds one PathSets per calibration: for every
+scenario the cumulative gross sector returns at each monthly step, a
+(n_steps, n_paths, d) float32 array built once. A query (weights, scenario
+probabilities, horizon) is then a (n_paths, d) @ (d,) product per scenario,
+portfolio_metrics for the per-scenario rows and weighted moments /
+quantiles over the pooled paths (weight p_s / n_s, as ScenarioReweighter)
+for the probability mixture: milliseconds at 10k-100k paths.
+
+The service is keyed by a fingerprint of the calibration inputs (e.g. the
+μ file's size and mtime, the vol / correlation parameters and the path
+count). fingerprint() is checked on every query and the path sets are
+rebuilt, under a lock, only when it changes.
+
+serve() exposes the service as a small JSON API on the standard library's
+ThreadingHTTPServer; all request threads share the one in-process copy of
+the path sets:
+
+  GET  /health     fingerprint, path count, build time
+  GET  /scenarios  scenario names, probabilities, default horizons, sectors
+  GET  /metrics    metrics for the default weights / probabilities
+  POST /metrics    {"weights": [...] | {sector: w}, "probabilities": [...] |
+                    {scenario: p}, "horizon_months": h}, every field optional
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import numpy as np
+
+from mc_engine.sensitivity import portfolio_metrics
+from mc_engine.tail import weighted_moments, weighted_quantile
+
+DEFAULT_PORT = 8765
+_QUERY_FIELDS = ("weights", "probabilities", "horizon_months")
+
+
+@dataclass(frozen=True)
+class PathSets:
+    """Cumulative gross sector returns (n_steps, n_paths, d) per scenario at monthly steps 1..n_steps."""
+    scenarios: tuple
+    probabilities: np.ndarray   # (S,)
+    horizons: np.ndarray        # (S,) default horizon of each scenario, in steps
+    sectors: tuple
+    weights: np.ndarray         # (d,) default portfolio weights
+    growth: tuple               # S arrays (n_steps, n_paths, d)
+
+    @property
+    def n_steps(self) -> int:
+        return self.growth[0].shape[0]
+
+    @property
+    def n_paths(self) -> int:
+        return self.growth[0].shape[1]
+
+
+def _vector(value, names: tuple, default: np.ndarray, what: str) -> np.ndarray:
+    """JSON list or {name: value} mapping → float vector in names order (None → default)."""
+    if value is None:
+        return default
+    if isinstance(value, dict):
+        unknown = set(value) - set(names)
+        if unknown:
+            raise ValueError(f"unknown {what}: {sorted(unknown)} (expected {list(names)})")
+        value = [value.get(name, 0.0) for name in names]
+    message = f"{what} must be {len(names)} finite numbers ({list(names)})"
+    try:
+        v = np.asarray(value, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(message) from None
+    if v.shape != (len(names),) or not np.isfinite(v).all():
+        raise ValueError(message)
+    return v
+
+
+def _mixture_metrics(port: np.ndarray, probabilities: np.ndarray, var_q: float) -> dict[str, float]:
+    """Risk metrics of the scenario mixture of port (S, n_paths) under probabilities (S,)."""
+    keep = probabilities > 0
+    x = port[keep].ravel()
+    w = np.repeat(probabilities[keep] / port.shape[1], port.shape[1])
+    mean, std = weighted_moments(x, w)
+    median, var, worst = weighted_quantile(x, np.array([0.50, var_q, 0.01]), w)
+    tail = x <= var
+    return {
+        "mean": mean,
+        "std": std,
+        "p_profit": float(w @ (x > 0) / w.sum()),
+        "median": float(median),
+        "var": float(var),
+        "worst_1pct": float(worst),
+        "cvar": float(w[tail] @ x[tail] / w[tail].sum()) if tail.any() else float(var),
+    }
+
+
+class RiskService:
+    """Resident path sets rebuilt by build() whenever fingerprint() changes."""
+
+    def __init__(self, build: Callable[[], PathSets], fingerprint: Callable[[], str]):
+        self._build = build
+        self._fingerprint = fingerprint
+        self._lock = threading.Lock()
+        self._key = None
+        self._paths = None
+        self.built_at = None
+        self.build_seconds = None
+
+    def paths(self) -> PathSets:
+        """Current path sets, (re)built first if the calibration inputs changed."""
+        key = self._fingerprint()
+        if key != self._key:
+            with self._lock:
+                if key != self._key:
+                    start = time.perf_counter()
+                    self._paths = self._build()
+                    self._key = key
+                    self.built_at = time.time()
+                    self.build_seconds = time.perf_counter() - start
+        return self._paths
+
+    def health(self) -> dict:
+        paths = self.paths()
+        return {"status": "ok", "fingerprint": self._key, "n_paths": paths.n_paths,
+                "n_steps": paths.n_steps, "built_at": self.built_at, "build_seconds": self.build_seconds}
+
+    def scenarios(self) -> dict:
+        paths = self.paths()
+        return {"scenarios": list(paths.scenarios), "probabilities": paths.probabilities.tolist(),
+                "horizon_months": paths.horizons.tolist(), "sectors": list(paths.sectors),
+                "weights": paths.weights.tolist(), "max_horizon_months": paths.n_steps}
+
+    def query(self, weights=None, probabilities=None, horizon_months=None, var_q: float = 0.05) -> dict:
+        """
+        Portfolio metrics per scenario and for the probability mixture.
+        weights are normalized to sum to 1; horizon_months=None evaluates
+        every scenario at its own default horizon.
+        """
+        start = time.perf_counter()
+        paths = self.paths()
+        w = _vector(weights, paths.sectors, paths.weights, "weights")
+        if (w < 0).any() or w.sum() <= 0:
+            raise ValueError("weights must be non-negative with a positive sum")
+        w = w / w.sum()
+        p = _vector(probabilities, paths.scenarios, paths.probabilities, "probabilities")
+        if (p < 0).any() or p.sum() <= 0:
+            raise ValueError("probabilities must be non-negative with a positive sum")
+        p = p / p.sum()
+        if horizon_months is None:
+            steps = paths.horizons
+        else:
+            h = int(horizon_months) if isinstance(horizon_months, (int, float)) else 0
+            if h != horizon_months or not 1 <= h <= paths.n_steps:
+                raise ValueError(f"horizon_months must be an integer in [1, {paths.n_steps}]")
+            steps = np.full(len(paths.scenarios), h)
+
+        port = np.stack([g[h - 1] @ w - 1 for g, h in zip(paths.growth, steps)])
+        m = portfolio_metrics(port, var_q)
+        return {
+            "weights": dict(zip(paths.sectors, w.tolist())),
+            "probabilities": dict(zip(paths.scenarios, p.tolist())),
+            "horizon_months": dict(zip(paths.scenarios, steps.tolist())),
+            "scenarios": {name: {k: float(v[i]) for k, v in m.items()}
+                          for i, name in enumerate(paths.scenarios)},
+            "mixture": _mixture_metrics(port, p, var_q),
+            "n_paths": paths.n_paths,
+            "elapsed_ms": (time.perf_counter() - start) * 1e3,
+        }
+
+
+def _handler(service: RiskService) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, body: dict) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _route(self, request: dict | None) -> None:
+            routes = {"/health": service.health, "/scenarios": service.scenarios}
+            try:
+                if self.path == "/metrics":
+                    unknown = set(request or {}) - set(_QUERY_FIELDS)
+                    if unknown:
+                        raise ValueError(f"unknown fields {sorted(unknown)} (expected {list(_QUERY_FIELDS)})")
+                    self._reply(200, service.query(**(request or {})))
+                elif self.path in routes and request is None:
+                    self._reply(200, routes[self.path]())
+                else:
+                    self._reply(404, {"error": f"no route {self.command} {self.path}"})
+            except (TypeError, ValueError) as exc:
+                self._reply(400, {"error": str(exc)})
+
+        def do_GET(self):
+            self._route(None)
+
+        def do_POST(self):
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            except json.JSONDecodeError as exc:
+                self._reply(400, {"error": f"invalid JSON: {exc}"})
+                return
+            if not isinstance(body, dict):
+                self._reply(400, {"error": "request body must be a JSON object"})
+                return
+            self._route(body)
+
+        def log_message(self, format, *args):
+            pass   # one line per query would drown the console
+
+    return Handler
+
+
+def serve(service: RiskService, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """HTTP server for service (not started: call serve_forever(), or run it in a thread)."""
+    return ThreadingHTTPServer((host, port), _handler(service))
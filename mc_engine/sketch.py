@@ -0,0 +1,126 @@
+"""
+KLL quantile sketch (Karnin–Lang–Liberty) for streaming / distributed MC runs.
+
+Items live in a stack of compactors; an item at level h stands for 2**h paths.
+When a level exceeds its capacity it is sorted and every other item (random
+offset) is promoted one level up. Each compaction shifts any rank by at most
+2**h with a zero-mean random sign, so the total rank error is bounded by
+Hoeffding's inequality — the sketch tracks that bound exactly as it goes.
+
+Updates take whole numpy chunks and every operation is vectorized per level;
+sketches built on different workers merge by concatenating levels.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+DEFAULT_K = 8192
+CONFIDENCE = 0.99
+_CAPACITY_DECAY = 2.0 / 3.0
+
+
+class KLLSketch:
+    """Mergeable quantile sketch with a tracked rank-error bound."""
+
+    def __init__(self, k: int = DEFAULT_K, seed: int = 0):
+        if k < 8:
+            raise ValueError(f"k must be at least 8, got {k}")
+        self.k = int(k)
+        self.n = 0
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._err_sq = 0.0  # Σ (2**h)**2 over all compactions
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - 1 - h
+        return max(2, int(np.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def update(self, x: np.ndarray) -> None:
+        """Add one chunk of values."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        if x.size == 0:
+            return
+        self.n += x.size
+        self.levels[0] = np.concatenate([self.levels[0], x])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold another sketch (any k, any n) into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._err_sq += other._err_sq
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if items.size > self._capacity(h):
+                items = np.sort(items)
+                keep = items[-1:] if items.size % 2 else items[:0]
+                pairs = items[: items.size - keep.size]
+                promoted = pairs[int(self._rng.integers(2))::2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self._err_sq += 4.0 ** h
+            h += 1
+
+    # -- queries -------------------------------------------------------------
+
+    def _sorted_view(self) -> tuple[np.ndarray, np.ndarray]:
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(lv.size, 2.0 ** h) for h, lv in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def quantile(self, q: float | np.ndarray) -> float | np.ndarray:
+        """
+        Approximate q-quantile(s), using the np.percentile order-statistic
+        position q·(n−1) (+0.5 to centre each item's weight).
+        """
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        values, cum = self._sorted_view()
+        target = np.asarray(q, dtype=np.float64) * (self.n - 1) + 0.5
+        idx = np.minimum(np.searchsorted(cum, target, side="left"), values.size - 1)
+        out = values[idx]
+        return out if np.ndim(q) else float(out)
+
+    def tail_mean(self, q: float) -> float:
+        """Weighted mean of retained items at or below quantile(q) (sketch CVaR)."""
+        if self.n == 0:
+            return float("nan")
+        values, cum = self._sorted_view()
+        cut = self.quantile(q)
+        tail = values <= cut
+        weights = np.diff(cum, prepend=0.0)
+        return float((values[tail] * weights[tail]).sum() / weights[tail].sum())
+
+    @property
+    def rank_error(self) -> float:
+        """Absolute rank error bound (in paths) holding with probability CONFIDENCE."""
+        return float(np.sqrt(2.0 * self._err_sq * np.log(2.0 / (1.0 - CONFIDENCE))))
+
+    @property
+    def normalized_rank_error(self) -> float:
+        return self.rank_error / self.n if self.n else 0.0
+
+    def quantile_error(self, q: float) -> float:
+        """Value-space error bound: half-width of [Q(q − ε), Q(q + ε)]."""
+        eps = self.normalized_rank_error
+        if eps == 0.0:
+            return 0.0
+        lo, hi = self.quantile(np.array([max(0.0, q - eps), min(1.0, q + eps)]))
+        return float(hi - lo) / 2.0
+
+    @property
+    def size(self) -> int:
+        """Number of retained items (memory footprint)."""
+        return int(sum(lv.size for lv in self.levels))
@@ -0,0 +1,165 @@
+"""
+Streaming accumulators for chunked Monte Carlo runs.
+
+Paths are generated in fixed-size chunks and folded into running statistics,
+so peak memory depends on the chunk size rather than the total path count.
+Moments merge exactly (Chan et al. pairwise update); quantiles come from a
+mergeable KLL sketch (mc_engine.sketch) with a tracked error bound.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import numpy as np
+
+from mc_engine.sketch import KLLSketch
+
+DEFAULT_CHUNK_SIZE = 250_000
+DEFAULT_HIST_BINS = 4_096
+
+
+def iter_chunks(n_total: int, chunk_size: int) -> Iterator[int]:
+    """Yield chunk sizes that sum to n_total (last chunk may be short)."""
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    remaining = int(n_total)
+    while remaining > 0:
+        m = min(chunk_size, remaining)
+        yield m
+        remaining -= m
+
+
+def gaussian_bounds(mean: float, std: float, k: float = 10.0) -> tuple[float, float]:
+    """Histogram range covering mean ± k·std (wide enough that tails never clip)."""
+    half = k * max(float(std), 1e-12)
+    return float(mean) - half, float(mean) + half
+
+
+class StreamingStats:
+    """
+    Running mean / std / P(profit) / quantile sketch / fixed-bin histogram
+    over a stream of returns.
+
+    Quantiles come from the KLL sketch (``quantile_error`` gives the bound);
+    the histogram is kept for charts. Values outside [lo, hi) are counted in
+    under/overflow and never dropped.
+    """
+
+    def __init__(self, lo: float, hi: float, bins: int = DEFAULT_HIST_BINS, sketch_seed: int = 0):
+        if not hi > lo:
+            raise ValueError(f"histogram range must satisfy hi > lo, got [{lo}, {hi})")
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.bins = int(bins)
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.n_positive = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = KLLSketch(seed=sketch_seed)
+
+    # -- updates -------------------------------------------------------------
+
+    def update(self, x: np.ndarray) -> None:
+        """Fold one chunk of returns into the accumulators."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        m = x.size
+        if m == 0:
+            return
+        chunk_mean = float(x.mean())
+        chunk_m2 = float(((x - chunk_mean) ** 2).sum())
+        self._combine(m, chunk_mean, chunk_m2)
+        self.n_positive += int(np.count_nonzero(x > 0))
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+        self.sketch.update(x)
+
+        idx = np.floor((x - self.lo) / self.bin_width).astype(np.int64)
+        self.underflow += int(np.count_nonzero(idx < 0))
+        self.overflow += int(np.count_nonzero(idx >= self.bins))
+        inside = idx[(idx >= 0) & (idx < self.bins)]
+        self.counts += np.bincount(inside, minlength=self.bins)
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """Merge another accumulator with identical histogram edges into this one."""
+        if (other.lo, other.hi, other.bins) != (self.lo, self.hi, self.bins):
+            raise ValueError("cannot merge StreamingStats with different histogram edges")
+        if other.n:
+            self._combine(other.n, other._mean, other._m2)
+            self.n_positive += other.n_positive
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.counts += other.counts
+            self.underflow += other.underflow
+            self.overflow += other.overflow
+            self.sketch.merge(other.sketch)
+        return self
+
+    def _combine(self, n_b: int, mean_b: float, m2_b: float) -> None:
+        n_a = self.n
+        n = n_a + n_b
+        delta = mean_b - self._mean
+        self._mean += delta * n_b / n
+        self._m2 += m2_b + delta * delta * n_a * n_b / n
+        self.n = n
+
+    # -- results -------------------------------------------------------------
+
+    @property
+    def bin_width(self) -> float:
+        return (self.hi - self.lo) / self.bins
+
+    @property
+    def edges(self) -> np.ndarray:
+        return np.linspace(self.lo, self.hi, self.bins + 1)
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def std(self) -> float:
+        """Population std (ddof=0), matching np.std."""
+        return float(np.sqrt(self._m2 / self.n)) if self.n else 0.0
+
+    @property
+    def p_profit(self) -> float:
+        return self.n_positive / self.n if self.n else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 ≤ q ≤ 1), np.percentile convention."""
+        return self.sketch.quantile(q)
+
+    def expected_shortfall(self, q: float) -> float:
+        """CVaR: mean return at or below the q-quantile (from the sketch)."""
+        return self.sketch.tail_mean(q)
+
+    def quantile_error(self, q: float) -> float:
+        """Error bound (value units, 99% confidence) on ``quantile(q)``."""
+        return self.sketch.quantile_error(q)
+
+    def histogram(self, bins: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Coarsen the fine histogram to roughly `bins` bars over the occupied range.
+
+        Returns (counts, edges) suitable for ``ax.hist(edges[:-1], edges, weights=counts)``.
+        """
+        nz = np.flatnonzero(self.counts)
+        if nz.size == 0:
+            return np.zeros(bins, dtype=np.int64), np.linspace(self.lo, self.hi, bins + 1)
+        first, last = int(nz[0]), int(nz[-1]) + 1
+        group = max(1, int(np.ceil((last - first) / bins)))
+        fine = self.counts[first:last]
+        pad = (-fine.size) % group
+        if pad:
+            fine = np.concatenate([fine, np.zeros(pad, dtype=fine.dtype)])
+        counts = fine.reshape(-1, group).sum(axis=1)
+        counts[0] += self.underflow
+        counts[-1] += self.overflow
+        edges = self.lo + self.bin_width * (first + group * np.arange(counts.size + 1))
+        return counts, edges
@@ -0,0 +1,67 @@
+"""
+Vectorized portfolio-weight sweeps over one simulated sector-return matrix.
+
+The (n_paths × n_sectors) matrix is simulated once; candidate allocations are
+evaluated as a single (n_paths × n_sectors) @ (n_sectors × n_portfolios)
+product, processed in column blocks so the intermediate stays bounded.
+"""
+
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Max cells of the (n_paths × block) portfolio-return intermediate per block
+DEFAULT_BLOCK_CELLS = 20_000_000
+
+
+def dirichlet_weights(n: int, n_sectors: int, rng: np.random.Generator | None = None,
+                      concentration: float = 1.0) -> np.ndarray:
+    """(n, n_sectors) long-only weights drawn uniformly (α = 1) from the simplex."""
+    rng = rng or np.random.default_rng()
+    return rng.dirichlet(np.full(n_sectors, concentration), size=n)
+
+
+def simplex_grid(n_sectors: int, step: float = 0.05) -> np.ndarray:
+    """All long-only weight vectors on a regular grid of the simplex."""
+    k = int(round(1 / step))
+    rows = [c for c in itertools.product(range(k + 1), repeat=n_sectors - 1) if sum(c) <= k]
+    grid = np.array([(*c, k - sum(c)) for c in rows], dtype=np.float64)
+    return grid / k
+
+
+def evaluate_weights(sector_returns: np.ndarray, weights: np.ndarray, var_q: float = 0.05,
+                     sharpe_scale: float = 1.0, labels: list[str] | None = None,
+                     block_cells: int = DEFAULT_BLOCK_CELLS) -> pd.DataFrame:
+    """
+    Risk metrics for every candidate row of `weights` (n_portfolios × n_sectors).
+
+    Returns one row per candidate with the weights plus mean, median, std,
+    p_profit, var (the var_q quantile) and sharpe (mean / std · sharpe_scale).
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    n_paths, n_sectors = sector_returns.shape
+    if weights.shape[1] != n_sectors:
+        raise ValueError(f"weights have {weights.shape[1]} columns, expected {n_sectors}")
+    block = max(1, block_cells // max(n_paths, 1))
+
+    metrics = {k: [] for k in ("mean", "median", "std", "p_profit", "var")}
+    for start in range(0, weights.shape[0], block):
+        port = sector_returns @ weights[start:start + block].T   # (n_paths, block)
+        metrics["mean"].append(port.mean(axis=0))
+        metrics["std"].append(port.std(axis=0))
+        metrics["p_profit"].append((port > 0).mean(axis=0))
+        median, var = np.quantile(port, [0.5, var_q], axis=0)
+        metrics["median"].append(median)
+        metrics["var"].append(var)
+
+    out = {k: np.concatenate(v) for k, v in metrics.items()}
+    std = out["std"]
+    out["sharpe"] = np.divide(out["mean"], std, out=np.zeros_like(std), where=std > 0) * sharpe_scale
+    labels = labels or [f"w{i}" for i in range(n_sectors)]
+    df = pd.DataFrame(weights, columns=labels)
+    for k in ("mean", "median", "std", "p_profit", "var", "sharpe"):
+        df[k] = out[k]
+    return df
@@ -0,0 +1,75 @@
+"""PathCache hits against uncached draws, key sensitivity and LRU size-bounded eviction."""
+
+import os
+
+import numpy as np
+import pytest
+
+from mc_engine import PathCache
+
+
+def _draw(rng):
+    return (rng or np.random).standard_normal((50, 40))
+
+
+@pytest.mark.parametrize("use_generator", [True, False])
+def test_hit_is_identical_and_restores_rng_state(tmp_path, use_generator):
+    def fresh():
+        if use_generator:
+            return np.random.default_rng(42)
+        np.random.seed(42)
+        return None
+
+    cache = PathCache(tmp_path)
+    rng = fresh()
+    miss = cache.get_or_simulate(("paths", 0.05), lambda: _draw(rng), rng)
+    after_miss = _draw(rng)
+
+    rng = fresh()
+    hit = cache.get_or_simulate(("paths", 0.05), lambda: pytest.fail("simulated on a hit"), rng)
+    assert isinstance(hit, np.memmap)
+    assert hit.dtype == miss.dtype and hit.tobytes() == miss.tobytes()
+    np.testing.assert_array_equal(_draw(rng), after_miss)
+
+
+def test_different_key_misses(tmp_path):
+    cache = PathCache(tmp_path)
+    calls = []
+
+    def simulate():
+        calls.append(None)
+        return np.arange(10.0)
+
+    rng = np.random.default_rng(0)
+    cache.get_or_simulate(("paths", np.eye(2)), simulate, rng)
+    cache.get_or_simulate(("paths", np.eye(2) * 2), simulate, np.random.default_rng(0))
+    cache.get_or_simulate(("paths", np.eye(2)), simulate, np.random.default_rng(1))
+    cache.get_or_simulate(("paths", np.eye(2).astype(np.float32)), simulate, np.random.default_rng(0))
+    assert len(calls) == 4
+    cache.get_or_simulate(("paths", np.eye(2)), simulate, np.random.default_rng(0))
+    assert len(calls) == 4
+    assert cache.load("0" * 64) is None
+
+
+def test_evicts_least_recently_used_under_max_bytes(tmp_path):
+    arr = np.zeros(1000)
+    entry = PathCache(tmp_path / "probe")
+    entry.store("probe", arr)
+    one = entry.size()
+
+    cache = PathCache(tmp_path / "lru", max_bytes=int(2.5 * one))
+    cache.store("a", arr)
+    cache.store("b", arr)
+    for t, key in ((1000, "a"), (2000, "b")):
+        for p in cache._paths(key):
+            os.utime(p, (t, t))
+    assert cache.load("a") is not None   # refreshes a; b is now least recently used
+
+    cache.store("c", arr)
+    assert cache.load("b") is None
+    assert cache.load("a") is not None and cache.load("c") is not None
+    assert cache.size() <= cache.max_bytes
+
+    cache.max_bytes = 0
+    assert cache.evict(keep="c") == 1
+    assert cache.load("c") is not None and cache.load("a") is None
@@ -0,0 +1,63 @@
+"""Cutting-plane optimize_cvar against the full Rockafellar–Uryasev LP."""
+
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from mc_engine import optimize_cvar
+from mc_engine.optimize import portfolio_risk
+
+
+def _scenarios(seed: int) -> tuple[list[np.ndarray], np.ndarray]:
+    rng = np.random.default_rng(seed)
+    mu = [np.array([0.08, 0.12, 0.03, 0.15]), np.array([-0.05, 0.20, 0.04, -0.10])]
+    vol = np.array([0.15, 0.30, 0.05, 0.35])
+    returns = [m + vol * rng.standard_normal((n, 4)) for m, n in zip(mu, (150, 90))]
+    return returns, np.array([0.7, 0.3])
+
+
+def _full_lp(R: np.ndarray, pi: np.ndarray, cvar_limit: float, beta: float, lower: float, upper: float):
+    """Variables [w (k), ζ, u (n)]: max π·Rw s.t. ζ + π·u / (1−β) ≤ limit, u ≥ −Rw − ζ, u ≥ 0, Σw = 1."""
+    n, k = R.shape
+    c = np.concatenate([-(pi @ R), [0.0], np.zeros(n)])
+    A_ub = np.vstack([np.concatenate([np.zeros(k), [1.0], pi / (1 - beta)]),
+                      np.hstack([-R, -np.ones((n, 1)), -np.eye(n)])])
+    b_ub = np.concatenate([[cvar_limit], np.zeros(n)])
+    A_eq = np.concatenate([np.ones(k), [0.0], np.zeros(n)])[None]
+    bounds = [(lower, upper)] * k + [(None, None)] + [(0, None)] * n
+    res = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=[1.0], bounds=bounds, method="highs")
+    assert res.status == 0, res.message
+    return res.x[:k], -res.fun
+
+
+@pytest.mark.parametrize("seed, cvar_limit, beta, upper", [
+    (0, 0.10, 0.95, 1.0),
+    (1, 0.15, 0.95, 0.6),
+    (2, 0.08, 0.90, 0.5),
+])
+def test_matches_full_lp(seed, cvar_limit, beta, upper):
+    returns, probs = _scenarios(seed)
+    R = np.vstack(returns)
+    pi = np.concatenate([np.full(len(r), p / len(r)) for r, p in zip(returns, probs)])
+    w_lp, ret_lp = _full_lp(R, pi, cvar_limit, beta, 0.0, upper)
+
+    res = optimize_cvar(returns, probs, cvar_limit, beta, 0.0, upper)
+    assert res.success, res.message
+    assert res.expected_return == pytest.approx(ret_lp, abs=1e-6)
+    assert res.cvar <= cvar_limit + 1e-6
+    assert res.cvar == pytest.approx(portfolio_risk(R, pi, res.weights, beta)[1])
+    assert res.weights.sum() == pytest.approx(1.0)
+    assert np.all((res.weights >= -1e-9) & (res.weights <= upper + 1e-9))
+    np.testing.assert_allclose(res.weights, w_lp, atol=1e-4)
+
+
+def test_benchmark_limit_never_worse_than_benchmark():
+    returns, probs = _scenarios(3)
+    benchmark = np.full(4, 0.25)
+    res = optimize_cvar(returns, probs, None, benchmark=benchmark)
+    R = np.vstack(returns)
+    pi = np.concatenate([np.full(len(r), p / len(r)) for r, p in zip(returns, probs)])
+    _, bench_cvar = portfolio_risk(R, pi, benchmark, 0.95)
+    assert res.success
+    assert res.cvar <= bench_cvar + 1e-6
+    assert res.expected_return >= float(pi @ R @ benchmark) - 1e-9
@@ -0,0 +1,59 @@
+"""rebalanced_values against buy-and-hold, rule trigger steps and a hand-computed cost path."""
+
+import numpy as np
+import pytest
+
+from mc_engine import CostModel, RebalanceRule, cumulative_values, rebalanced_values
+
+FLAT = CostModel(proportional=0.0, fixed=0.0)
+
+
+def test_hold_without_costs_matches_cumulative_values():
+    rng = np.random.default_rng(0)
+    x = rng.normal(0.0003, 0.015, (60, 257, 3))
+    w = np.array([0.5, 0.3, 0.2])
+    values, stats = rebalanced_values(x, w, RebalanceRule("hold"), costs=FLAT)
+    np.testing.assert_allclose(values, cumulative_values(x.copy(), w), rtol=1e-12)
+    assert not stats["rebalances"].any() and not stats["turnover"].any() and not stats["costs"].any()
+
+
+def test_calendar_rebalances_every_n_steps_but_not_the_last():
+    # Flat paths never drift, so each rebalance shows up only as its fixed cost
+    fee = 1e-3
+    values, stats = rebalanced_values(np.zeros((10, 4, 2)), [0.5, 0.5], RebalanceRule("quarterly", every=3),
+                                      costs=CostModel(proportional=0.0, fixed=fee))
+    paid = np.cumsum(np.isin(np.arange(11), [3, 6, 9])) * fee
+    np.testing.assert_allclose(values, np.broadcast_to((1 - paid)[:, None], values.shape), rtol=1e-12)
+    assert (stats["rebalances"] == 3).all()
+    np.testing.assert_allclose(stats["costs"], 3 * fee)
+
+
+def test_band_rebalances_only_drifted_paths():
+    # Path 0: sector 0 gains 10% (log) a step, so its weight drifts 0.525, 0.550 (> 0.5 + band), reset, ...
+    # Path 1 never moves and never trades.
+    x = np.zeros((7, 2, 2))
+    x[:, 0, 0] = 0.1
+    rule = RebalanceRule("band", band=0.04)
+    target = np.array([0.5, 0.5])
+    for step, weight in ((1, 0.525), (2, 0.550)):
+        assert rule.due(step, np.array([[weight, 1 - weight]]), target)[0] == (step == 2)
+
+    values, stats = rebalanced_values(x, target, rule, costs=FLAT)
+    assert stats["rebalances"].tolist() == [3, 0]   # steps 2, 4, 6
+    g1, g2 = (0.5 * np.exp(0.1) + 0.5), (0.5 * np.exp(0.2) + 0.5)
+    expected = [1, g1, g2, g2 * g1, g2**2, g2**2 * g1, g2**3, g2**3 * g1]
+    np.testing.assert_allclose(values[:, 0], expected, rtol=1e-12)
+    np.testing.assert_array_equal(values[:, 1], 1.0)
+
+
+def test_two_step_costs_and_turnover():
+    # Step 1: holdings [0.66, 0.38], value 1.04, target [0.624, 0.416]: trades 0.036 + 0.036,
+    # pays 10 bps · 0.072 + 2e-4 = 2.72e-4. Step 2 is marked, not traded.
+    x = np.array([[[0.10, -0.05]], [[0.0, 0.10]]])
+    costs = CostModel(proportional=1e-3, fixed=2e-4)
+    values, stats = rebalanced_values(x, [0.6, 0.4], RebalanceRule("daily", every=1), costs=costs, log=False)
+    v1 = 1.04 - 2.72e-4
+    np.testing.assert_allclose(values[:, 0], [1.0, v1, v1 * (0.6 + 0.4 * 1.1)], rtol=1e-12)
+    assert stats["rebalances"][0] == 1
+    assert stats["turnover"][0] == pytest.approx(0.072 / 1.04)
+    assert stats["costs"][0] == pytest.approx(2.72e-4)
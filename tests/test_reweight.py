@@ -0,0 +1,52 @@
+"""ScenarioReweighter against weighted_quantile / weighted_moments on the pooled paths."""
+
+import numpy as np
+import pytest
+
+from mc_engine import ScenarioReweighter, simplex_grid, weighted_moments, weighted_quantile
+
+
+def _scenarios() -> list[np.ndarray]:
+    # Prime path counts: with round counts the VaR can land exactly on a path (midpoint
+    # cumulative weight = var_q), where x ≤ VaR flips on the last bit of the interpolation
+    rng = np.random.default_rng(11)
+    return [rng.normal(0.03, 0.10, 3989), rng.normal(0.15, 0.20, 2477), rng.standard_t(3, 1511) * 0.2 - 0.1]
+
+
+def _reference(returns: list[np.ndarray], p: np.ndarray, var_q: float) -> dict:
+    x = np.concatenate(returns)
+    w = np.concatenate([np.full(len(r), pk / len(r)) for r, pk in zip(returns, p / p.sum())])
+    x, w = x[w > 0], w[w > 0]
+    mean, std = weighted_moments(x, w)
+    median, var, worst = weighted_quantile(x, np.array([0.50, var_q, 0.01]), w)
+    tail = x <= var
+    return {"mean": mean, "std": std, "p_profit": w @ (x > 0) / w.sum(), "median": median,
+            "var": var, "worst_1pct": worst, "cvar": w[tail] @ x[tail] / w[tail].sum()}
+
+
+@pytest.mark.parametrize("var_q", [0.05, 0.10])
+def test_matches_pooled_weighted_metrics(var_q):
+    returns = _scenarios()
+    grid = np.vstack([simplex_grid(3, 0.1), [[0.2, 0.3, 0.5]], [[2.0, 1.0, 1.0]]])
+    df = ScenarioReweighter(returns).evaluate(grid, var_q)
+    assert len(df) == len(grid)
+    for row, p in zip(df.itertuples(), grid):
+        ref = _reference(returns, p, var_q)
+        for key, value in ref.items():
+            assert getattr(row, key) == pytest.approx(value, abs=1e-10), (p, key)
+
+
+def test_single_scenario_uses_only_its_paths():
+    returns = _scenarios()
+    df = ScenarioReweighter(returns, ["A", "B", "C"]).evaluate([0.0, 1.0, 0.0])
+    q = weighted_quantile(returns[1], np.array([0.50, 0.05, 0.01]), np.ones(len(returns[1])))
+    np.testing.assert_allclose(df[["median", "var", "worst_1pct"]].to_numpy()[0], q, atol=1e-12)
+    assert list(df.columns[:3]) == ["A", "B", "C"]
+
+
+def test_rejects_bad_probabilities():
+    rw = ScenarioReweighter(_scenarios())
+    with pytest.raises(ValueError):
+        rw.evaluate([0.5, 0.5])
+    with pytest.raises(ValueError):
+        rw.evaluate([0.5, -0.1, 0.6])
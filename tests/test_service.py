@@ -0,0 +1,132 @@
+"""RiskService queries against portfolio_metrics / ScenarioReweighter, rebuilds and the JSON API."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from mc_engine import PathSets, RiskService, ScenarioReweighter, portfolio_metrics, serve
+
+N_PATHS = 1013   # prime, so no VaR lands exactly on a pooled path (see test_reweight)
+
+
+def _path_sets(seed: int = 0) -> PathSets:
+    rng = np.random.default_rng(seed)
+    growth = tuple(np.exp(np.cumsum(rng.normal(mu, 0.05, (6, N_PATHS, 3)), axis=0)).astype(np.float32)
+                   for mu in (0.01, -0.005, 0.02))
+    return PathSets(scenarios=("A", "B", "C"), probabilities=np.array([0.5, 0.3, 0.2]),
+                    horizons=np.array([6, 3, 4]), sectors=("x", "y", "z"),
+                    weights=np.array([0.5, 0.3, 0.2]), growth=growth)
+
+
+class _Source:
+    """build / fingerprint callables that count builds and switch calibration on demand."""
+
+    def __init__(self):
+        self.key, self.builds = "v1", 0
+
+    def build(self) -> PathSets:
+        self.builds += 1
+        return _path_sets(self.builds)
+
+    def fingerprint(self) -> str:
+        return self.key
+
+
+@pytest.fixture
+def service():
+    source = _Source()
+    return RiskService(source.build, source.fingerprint)
+
+
+def _ports(paths: PathSets, w: np.ndarray, steps) -> np.ndarray:
+    return np.stack([g[h - 1] @ w - 1 for g, h in zip(paths.growth, steps)])
+
+
+def test_scenario_metrics_match_portfolio_metrics(service):
+    w = np.array([0.2, 0.2, 0.6])
+    out = service.query(weights=list(w * 5), horizon_months=2)
+    expected = portfolio_metrics(_ports(service.paths(), w, [2, 2, 2]))
+    for i, name in enumerate(("A", "B", "C")):
+        for key, values in expected.items():
+            assert out["scenarios"][name][key] == pytest.approx(values[i])
+    assert out["weights"] == pytest.approx({"x": 0.2, "y": 0.2, "z": 0.6})
+    assert out["horizon_months"] == {"A": 2, "B": 2, "C": 2}
+
+
+@pytest.mark.parametrize("probabilities", [None, [0.2, 0.2, 0.6], {"A": 1.0, "C": 3.0}, [0.0, 1.0, 0.0]])
+def test_mixture_matches_reweighter(service, probabilities):
+    paths = service.paths()
+    out = service.query(probabilities=probabilities)
+    p = np.array(list(out["probabilities"].values()))
+    port = _ports(paths, paths.weights, paths.horizons)
+    expected = ScenarioReweighter(list(port)).evaluate(p).iloc[0]
+    for key, value in out["mixture"].items():
+        assert value == pytest.approx(expected[key], abs=1e-9), key
+
+
+def test_rebuilds_only_when_fingerprint_changes():
+    source = _Source()
+    service = RiskService(source.build, source.fingerprint)
+    first = service.paths()
+    service.query()
+    assert source.builds == 1 and service.paths() is first
+    source.key = "v2"
+    second = service.paths()
+    assert source.builds == 2 and second is not first
+    assert service.health()["fingerprint"] == "v2"
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"weights": [1.0, 2.0]},
+    {"weights": {"x": 1.0, "bogus": 1.0}},
+    {"weights": [-1.0, 1.0, 1.0]},
+    {"probabilities": [0.0, 0.0, 0.0]},
+    {"horizon_months": 7},
+    {"horizon_months": 1.5},
+])
+def test_query_rejects_bad_input(service, kwargs):
+    with pytest.raises(ValueError):
+        service.query(**kwargs)
+
+
+@pytest.fixture
+def server(service):
+    httpd = serve(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _request(url: str, body: bytes | None = None) -> tuple[int, dict]:
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body)) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_http_api(server):
+    status, body = _request(f"{server}/health")
+    assert status == 200 and body["n_paths"] == N_PATHS
+    status, body = _request(f"{server}/metrics", json.dumps({"horizon_months": 3}).encode())
+    assert status == 200 and body["horizon_months"] == {"A": 3, "B": 3, "C": 3}
+    assert _request(f"{server}/nowhere")[0] == 404
+
+
+@pytest.mark.parametrize("body, message", [
+    (b"{not json", "invalid JSON"),
+    (b"[1, 2]", "JSON object"),
+    (json.dumps({"foo": 1}).encode(), "unknown fields ['foo']"),
+    (json.dumps({"weights": "abc"}).encode(), "weights"),
+    (json.dumps({"horizon_months": [1]}).encode(), "horizon_months must be an integer"),
+])
+def test_http_bad_requests_return_400(server, body, message):
+    status, reply = _request(f"{server}/metrics", body)
+    assert status == 400
+    assert message in reply["error"]
@@ -0,0 +1,51 @@
+"""ShockModel marginal variances and the log_mgf drift correction against Monte Carlo."""
+
+import numpy as np
+import pytest
+
+from mc_engine import SHOCKS, ShockModel
+from mc_engine.shocks import DEFAULT_CAP
+
+N = 400_000
+CORR = np.array([
+    [1.00, 0.45, 0.30, 0.20],
+    [0.45, 1.00, 0.55, 0.35],
+    [0.30, 0.55, 1.00, 0.25],
+    [0.20, 0.35, 0.25, 1.00],
+])
+VOLS = np.array([0.5, 1.0, 2.0, 3.0])
+
+
+def _shocks(model: ShockModel, L: np.ndarray, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return model.correlate(rng.standard_normal((N, len(L))), L, rng)
+
+
+@pytest.mark.parametrize("kind", SHOCKS)
+def test_unclipped_marginals_keep_unit_variance(kind):
+    L = np.linalg.cholesky(CORR) * VOLS[:, None]
+    X = _shocks(ShockModel(kind, df=8.0), L, 0)
+    # t_8 has kurtosis 4.5, so the sample variance has relative s.e. √(3.5 / N) ≈ 0.3%
+    np.testing.assert_allclose(X.var(axis=0) / VOLS**2, 1.0, atol=0.02)
+    np.testing.assert_allclose(X.mean(axis=0) / VOLS, 0.0, atol=0.01)
+
+
+@pytest.mark.parametrize("kind", ["student_t", "gauss_copula_t", "clayton"])
+def test_drift_correction_keeps_expected_growth(kind):
+    model = ShockModel(kind, cap=DEFAULT_CAP)
+    mu, sigma, t = np.array([0.08, -0.02, 0.15, 0.05]), np.array([0.20, 0.35, 0.50, 0.30]), 1.0
+    X = _shocks(model, np.linalg.cholesky(CORR), 1)
+    growth = np.exp(mu * t - model.log_mgf(sigma * np.sqrt(t)) + sigma * np.sqrt(t) * X)
+    se = growth.std(axis=0) / np.sqrt(N)
+    assert np.all(np.abs(growth.mean(axis=0) - np.exp(mu * t)) < 4 * se)
+    # the Gaussian Itô drift μt − σ²t/2 is visibly biased at σ = 0.5 under the same draws
+    ito = np.exp(mu * t - 0.5 * sigma**2 * t + sigma * np.sqrt(t) * X)
+    assert abs(ito[:, 2].mean() - np.exp(mu[2] * t)) > 4 * se[2]
+
+
+def test_log_mgf_requires_cap_for_t_marginals():
+    assert ShockModel("gaussian").log_mgf(0.3) == pytest.approx(0.045)
+    for kind in ("student_t", "gauss_copula_t", "clayton"):
+        assert ShockModel(kind).needs_cap
+        with pytest.raises(ValueError):
+            ShockModel(kind).log_mgf(0.3)
@@ -0,0 +1,49 @@
+"""KLLSketch quantiles against exact np.quantile on the full sample."""
+
+import numpy as np
+import pytest
+
+from mc_engine import KLLSketch
+
+QUANTILES = np.array([0.01, 0.05, 0.25, 0.50, 0.75, 0.95, 0.99])
+
+
+def _assert_within_rank_error(sketch: KLLSketch, x: np.ndarray) -> None:
+    eps = sketch.normalized_rank_error
+    assert 0 < eps < 0.05
+    lo = np.quantile(x, np.clip(QUANTILES - eps, 0, 1))
+    hi = np.quantile(x, np.clip(QUANTILES + eps, 0, 1))
+    est = sketch.quantile(QUANTILES)
+    assert np.all((lo <= est) & (est <= hi))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_quantiles_within_reported_rank_error(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.standard_t(4, 200_000)
+    sketch = KLLSketch(k=256, seed=seed)
+    for chunk in np.array_split(x, 37):
+        sketch.update(chunk)
+    assert sketch.n == x.size
+    assert sketch.size < x.size // 50
+    _assert_within_rank_error(sketch, x)
+
+
+def test_merged_sketches_within_reported_rank_error():
+    rng = np.random.default_rng(7)
+    parts = [rng.lognormal(0.0, 0.5, n) - 1 for n in (50_000, 80_000, 20_000)]
+    sketches = []
+    for i, part in enumerate(parts):
+        sketches.append(KLLSketch(k=256, seed=i))
+        sketches[-1].update(part)
+    merged = sketches[0].merge(sketches[1]).merge(sketches[2])
+    _assert_within_rank_error(merged, np.concatenate(parts))
+
+
+def test_exact_before_first_compaction():
+    x = np.random.default_rng(0).normal(size=1000)
+    sketch = KLLSketch(k=4096)
+    sketch.update(x)
+    assert sketch.rank_error == 0.0
+    assert sketch.quantile_error(0.05) == 0.0
+    np.testing.assert_array_equal(np.sort(x)[[0, 499, 999]], sketch.quantile(np.array([0.0, 0.4995, 1.0])))
@@ -0,0 +1,54 @@
+"""nearest_correlation repair and correlated_shocks common random numbers."""
+
+import numpy as np
+import pytest
+
+from mc_engine import (
+    ShockModel, check_correlation, correlated_shocks, nearest_correlation, stress_correlations,
+)
+from mc_engine.stress import DEFAULT_EIG_FLOOR
+
+BASE = np.array([
+    [1.00, 0.45, 0.30, 0.20],
+    [0.45, 1.00, 0.55, 0.35],
+    [0.30, 0.55, 1.00, 0.25],
+    [0.20, 0.35, 0.25, 1.00],
+])
+
+
+def test_repaired_stack_is_pd_with_unit_diagonal():
+    raw = stress_correlations(BASE, 500, np.random.default_rng(0), shift=(0.1, 0.2), noise=0.4)
+    assert (np.linalg.eigvalsh(raw)[:, 0] < 0).any()
+    fixed = nearest_correlation(raw)
+    assert fixed.shape == raw.shape
+    np.testing.assert_allclose(fixed, fixed.transpose(0, 2, 1), atol=1e-12)
+    np.testing.assert_allclose(np.diagonal(fixed, axis1=1, axis2=2), 1.0, atol=1e-12)
+    assert (np.linalg.eigvalsh(fixed)[:, 0] > 0).all()
+    np.linalg.cholesky(fixed)
+    for C in fixed[:20]:
+        check_correlation(C)
+
+
+def test_valid_matrices_are_returned_unchanged():
+    raw = stress_correlations(BASE, 200, np.random.default_rng(1), noise=0.3)
+    valid = np.linalg.eigvalsh(raw)[:, 0] >= DEFAULT_EIG_FLOOR
+    assert valid.any() and not valid.all()
+    fixed = nearest_correlation(raw)
+    np.testing.assert_array_equal(fixed[valid], raw[valid])
+    np.testing.assert_array_equal(nearest_correlation(BASE), BASE)
+
+
+def test_matches_higham_example():
+    # Higham (2002), section 4: nearest correlation matrix to a unit-diagonal indefinite 3 × 3
+    A = np.array([[1.0, 1.0, 0.0], [1.0, 1.0, 1.0], [0.0, 1.0, 1.0]])
+    expected = np.array([[1.0, 0.7607, 0.1573], [0.7607, 1.0, 0.7607], [0.1573, 0.7607, 1.0]])
+    np.testing.assert_allclose(nearest_correlation(A), expected, atol=1e-4)
+
+
+@pytest.mark.parametrize("kind", ["student_t", "clayton"])
+def test_correlated_shocks_share_draws_without_rng(kind):
+    Z = np.random.default_rng(2).standard_normal((5000, 4))
+    chols = np.linalg.cholesky(np.stack([BASE, BASE, nearest_correlation(BASE + 0.1 - 0.1 * np.eye(4))]))
+    X = correlated_shocks(Z, chols, ShockModel(kind))
+    np.testing.assert_array_equal(X[0], X[1])
+    assert not np.array_equal(X[0], X[2])